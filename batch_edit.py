@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Transactional batch edits for the site data files.
+
+run_batch() applies an edit function to a set of files, optionally across a
+process pool, validates every result, and only then writes: all new
+contents are staged in a temp directory next to the files and swapped in
+with renames. If anything fails - an edit, a validation, a rename - no file
+is left changed. With dry_run nothing is written and print_report() can
+show unified diffs and per-file timings instead.
+
+An edit function takes (path, text) and returns (new_text, detail):
+new_text is None when the file needs no change, and detail is anything
+picklable the caller wants back (counts, a change list). It must be a
+module-level function (or a functools.partial of one) to run in the pool.
+
+    result = batch_edit.run_batch(paths, my_edit, dry_run=args.dry_run)
+    batch_edit.print_report(result, root, diff=args.dry_run)
+"""
+
+import difflib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_THRESHOLD = 50
+STAGING_PREFIX = ".batch-edit-"
+
+
+class BatchEditError(Exception):
+    """The batch was rolled back; nothing was written."""
+
+
+@dataclass
+class FileEdit:
+    path: Path
+    original: str = ""
+    updated: Optional[str] = None
+    detail: Any = None
+    seconds: float = 0.0
+    mtime_ns: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self):
+        return self.updated is not None and self.updated != self.original
+
+
+@dataclass
+class BatchResult:
+    edits: List[FileEdit]
+    dry_run: bool
+    committed: bool = False
+    seconds: float = 0.0
+
+    @property
+    def changed(self):
+        return [edit for edit in self.edits if edit.changed]
+
+    @property
+    def failed(self):
+        return [edit for edit in self.edits if edit.errors]
+
+
+def is_staging_path(path):
+    """True for files inside a staging directory left behind by a killed run."""
+    return any(part.startswith(STAGING_PREFIX) for part in Path(path).parts)
+
+
+def json_errors(path, text):
+    """Default validation: .json results must still parse."""
+    if Path(path).suffix != ".json":
+        return []
+    try:
+        json.loads(text)
+    except ValueError as e:
+        return [f"invalid JSON: {e}"]
+    return []
+
+
+def read_text(path):
+    # newline="" keeps the file's own line endings through the round trip
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def run_edit(path, edit, validate):
+    """Process-pool task: read, edit, time and validate one file."""
+    result = FileEdit(Path(path))
+    start = time.perf_counter()
+    try:
+        result.mtime_ns = os.stat(path).st_mtime_ns
+        result.original = read_text(path)
+        result.updated, result.detail = edit(result.path, result.original)
+        if result.changed:
+            result.errors = list(validate(result.path, result.updated))
+    except Exception as e:
+        result.errors = [f"{type(e).__name__}: {e}"]
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def commit(edits):
+    """Swap the changed files in via renames, restoring all of them on failure."""
+    if not edits:
+        return
+    root = Path(os.path.commonpath([str(edit.path.parent) for edit in edits]))
+    staging = Path(tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=root))
+    swapped = []
+    try:
+        staged = []
+        for number, edit in enumerate(edits):
+            if os.stat(edit.path).st_mtime_ns != edit.mtime_ns:
+                raise BatchEditError(f"{edit.path} changed on disk during the batch")
+            new_path = staging / f"{number}.new"
+            with open(new_path, "w", encoding="utf-8", newline="") as f:
+                f.write(edit.updated)
+            shutil.copymode(edit.path, new_path)
+            staged.append((edit.path, new_path, staging / f"{number}.orig"))
+        for path, new_path, backup in staged:
+            try:
+                os.link(path, backup)
+            except OSError:
+                shutil.copy2(path, backup)
+            os.replace(new_path, path)
+            swapped.append((path, backup))
+    except BaseException:
+        for path, backup in reversed(swapped):
+            os.replace(backup, path)
+        raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def run_batch(paths, edit, validate=json_errors, workers=None, dry_run=False):
+    """Edit every file in `paths` as one transaction; returns a BatchResult.
+
+    `validate(path, new_text)` returns a list of problems for a result.
+    Pool use follows `workers` (> 1 pool, 1 inline, None automatic). Raises
+    BatchEditError, with nothing written, if any file fails.
+    """
+    paths = [Path(path) for path in paths]
+    start = time.perf_counter()
+    use_pool = workers > 1 if workers else len(paths) >= PARALLEL_THRESHOLD
+    if use_pool:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+            edits = list(pool.map(run_edit, paths, [edit] * len(paths), [validate] * len(paths), chunksize=chunksize))
+    else:
+        edits = [run_edit(path, edit, validate) for path in paths]
+    result = BatchResult(edits, dry_run)
+
+    failed = result.failed
+    if failed:
+        result.seconds = time.perf_counter() - start
+        problems = "; ".join(f"{edit.path.name}: {', '.join(edit.errors)}" for edit in failed[:5])
+        more = f" (and {len(failed) - 5} more)" if len(failed) > 5 else ""
+        raise BatchEditError(f"{len(failed)} file(s) failed, nothing written: {problems}{more}")
+
+    if not dry_run:
+        try:
+            commit(result.changed)
+        except OSError as e:
+            raise BatchEditError(f"commit failed and was rolled back: {e}") from e
+        result.committed = True
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def unified_diff(edit, root):
+    name = edit.path.relative_to(root) if root else edit.path
+    return "".join(difflib.unified_diff(
+        edit.original.splitlines(keepends=True),
+        edit.updated.splitlines(keepends=True),
+        fromfile=f"a/{name}",
+        tofile=f"b/{name}",
+    ))
+
+
+def print_report(result, root=None, diff=False, timings=False, out=None):
+    """Print diffs and/or per-file timings for a batch, then a one-line summary."""
+    out = out or sys.stdout
+    if diff:
+        for edit in result.changed:
+            out.write(unified_diff(edit, root))
+    if timings:
+        out.write("\nPer-file timing:\n")
+        for edit in sorted(result.edits, key=lambda e: e.seconds, reverse=True):
+            name = edit.path.relative_to(root) if root else edit.path
+            flag = "changed" if edit.changed else ""
+            out.write(f"  {edit.seconds * 1000:8.2f} ms  {name} {flag}\n")
+    action = "would change" if result.dry_run else "changed"
+    out.write(f"\n{len(result.edits)} files checked, {len(result.changed)} {action} in {result.seconds:.2f}s\n")
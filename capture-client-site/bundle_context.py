@@ -1,8 +1,44 @@
+import argparse
+import hashlib
+import json
 import os
+import re
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # --- CONFIGURATION ---
 output_file = 'project_context.txt'
 
+# Sidecar manifest used by --incremental (path -> mtime, size, hash, byte offset)
+manifest_file = 'project_context.manifest.json'
+MANIFEST_VERSION = 1
+
+# Read stage: worker threads prefetch the head of each file in walk order while
+# the writer streams the rest in chunks, so no whole file has to sit in memory.
+read_workers = min(8, (os.cpu_count() or 1) + 4)
+prefetch_chars = 64 * 1024
+copy_chunk_chars = 64 * 1024
+
+# Budget mode (--max-bytes / --max-tokens)
+chars_per_token = 4              # rough average for code and English prose
+min_truncated_bytes = 2 * 1024   # don't bother keeping a smaller tail than this
+report_depth = 3                 # directory depth used for the size report
+source_extensions = ('.ts', '.tsx', '.js', '.jsx', '.css', '.scss', '.py')
+TRUNCATION_MARKER = "\n... [truncated by bundle budget: kept {kept:,} of {total:,} bytes]"
+
+# JSON family mode (--dedupe-json): sibling .json files sharing one chunk table
+min_family_size = 5       # siblings needed before a shared table pays for itself
+min_family_saving = 0.10  # below this, verbatim files are easier to read
+min_chunk_chars = 8       # shorter repeats are cheaper inline than as a {@ref}
+max_var_chars = 40        # identity strings (city, state, slug) worth a {name}
+CHUNK_BOUNDARY = re.compile(r'(?<=\n)|(?<=[.!?] )')
+TEMPLATE_TOKEN = re.compile(r'\{\{|\}\}|\{@(\d+)(?:-(\d+))?\}|\{(\w+)\}')
+FAMILY_HELP = (
+    "Sibling JSON files stored as a shared chunk table plus one template per file.\n"
+    "To rebuild a file: replace {@N} with chunk N (or {@N-M} with chunks N..M in order),\n"
+    "then {name} with the value from the file's <vars>, then {{ and }} with { and }.\n"
+)
+
 # File types to include (Code & Config)
 extensions_to_include = {
     '.ts', '.tsx', '.js', '.jsx',      # Javascript/Typescript
@@ -14,13 +50,13 @@ extensions_to_include = {
 
 # Directories to STRICTLY ignore (Noise)
 dirs_to_ignore = {
-    'node_modules', 
-    '.next', 
-    '.git', 
-    '.vscode', 
-    'dist', 
-    'build', 
-    'coverage', 
+    'node_modules',
+    '.next',
+    '.git',
+    '.vscode',
+    'dist',
+    'build',
+    'coverage',
     '.playwright-mcp',  # Ignore playwright artifacts
     '__pycache__',
     '.claude'           # Optional: Ignore existing agents if you want purely code
@@ -28,59 +64,837 @@ dirs_to_ignore = {
 
 # Specific files to ignore
 files_to_ignore = {
-    'package-lock.json', 
-    'yarn.lock', 
+    'package-lock.json',
+    'yarn.lock',
     'pnpm-lock.yaml',
     'bundle_context.py', # Don't bundle the bundler itself
+    manifest_file,       # ...or its incremental manifest
     '.DS_Store'
 }
 
+# Ignore files compiled into the path filter (gitignore syntax). Every
+# .gitignore from the repository root down is honoured; .bundleignore holds
+# bundler-only rules for committed files that are noise in a context dump.
+ignore_file_names = ('.gitignore', '.bundleignore')
+
+HEADER = (
+    "# PROJECT CONTEXT DUMP\n"
+    "# This file contains the concatenated codebase for 'Capture Client'.\n"
+    "# Use this to understand the architecture, components, and styling.\n"
+    "==================================================================\n\n"
+)
+
 def is_text_file(filename):
-    return any(filename.endswith(ext) for ext in extensions_to_include)
+    return filename.endswith(tuple(extensions_to_include))
+
+def glob_to_regex(pattern):
+    """Translate one gitignore glob (already stripped of !, / anchors) to regex."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif char == '*':
+            out.append('[^/]*')
+            i += 1
+        elif char == '?':
+            out.append('[^/]')
+            i += 1
+        elif char == '[':
+            close = pattern.find(']', i + 2 if pattern.startswith('[!', i) or pattern.startswith('[^', i) else i + 1)
+            if close == -1:
+                out.append(re.escape(char))
+                i += 1
+                continue
+            body = pattern[i + 1:close]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = close + 1
+        elif char == '\\' and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(char))
+            i += 1
+    return ''.join(out)
+
+class IgnoreRules:
+    """One gitignore-style file, compiled to a single regex per entry kind.
+
+    The alternatives are laid out last rule first, so the group that matches
+    is the rule git would apply (the last one that matches) and its index
+    says whether it was a negation. Directory-only rules (trailing /) only
+    go into the directory regex.
+    """
+
+    def __init__(self, lines, prefix='', strip=0):
+        # Paths handed to match() are relative to the walk root. For a file
+        # above the walk root, `prefix` is the walk root relative to it; for
+        # one below, `strip` cuts its own directory off the front.
+        self.prefix = prefix
+        self.strip = strip
+        rules = []
+        for line in lines:
+            line = line.rstrip('\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            if not line.endswith('\\ '):
+                line = line.rstrip(' ')
+            negated = line.startswith('!')
+            if negated or line.startswith('\\!') or line.startswith('\\#'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            anchored = '/' in line
+            regex = glob_to_regex(line.lstrip('/'))
+            if not anchored:
+                regex = '(?:.*/)?' + regex
+            rules.append((regex, negated, dir_only))
+
+        self.dirs = self._compile([(regex, negated) for regex, negated, _ in rules])
+        self.files = self._compile([(regex, negated) for regex, negated, dir_only in rules if not dir_only])
+
+    @staticmethod
+    def _compile(rules):
+        if not rules:
+            return None, ()
+        ordered = rules[::-1]
+        regex = re.compile('|'.join(f'({regex})' for regex, _ in ordered), re.DOTALL)
+        # Group numbers of each top-level alternative, in order
+        groups = []
+        group = 1
+        for rule_regex, negated in ordered:
+            groups.append((group, negated))
+            group += 1 + re.compile(rule_regex).groups
+        return regex, groups
+
+    def match(self, rel_path, is_dir):
+        """True = ignored, False = re-included by a ! rule, None = no opinion."""
+        regex, groups = self.dirs if is_dir else self.files
+        if regex is None:
+            return None
+        found = regex.fullmatch(self.prefix + rel_path[self.strip:])
+        if found is None:
+            return None
+        for group, negated in groups:
+            if found.group(group) is not None:
+                return not negated
+        return None
+
+    @classmethod
+    def load(cls, path, prefix='', strip=0):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(f.readlines(), prefix, strip)
+        except OSError:
+            return None
+
+def find_repo_root(start):
+    path = os.path.abspath(start)
+    while True:
+        if os.path.exists(os.path.join(path, '.git')):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+class PathFilter:
+    """Every skip rule (config sets, extensions, ignore files) in one place.
+
+    Directory and file name lookups are frozensets, the extension check is a
+    single str.endswith over a tuple, and ignore files are compiled once per
+    directory they appear in. Ignored directories are pruned before they are
+    ever listed.
+    """
+
+    def __init__(self, root='.', use_gitignore=True):
+        self.dir_names = frozenset(dirs_to_ignore)
+        self.file_names = frozenset(files_to_ignore)
+        self.suffixes = tuple(extensions_to_include)
+        self.use_gitignore = use_gitignore
+        self.root_rules = []
+        if not use_gitignore:
+            return
+
+        # .gitignore files in the directories above the walk root, up to the repo root
+        root = os.path.abspath(root)
+        repo_root = find_repo_root(root)
+        if repo_root is not None and repo_root != root:
+            parents = []
+            path = os.path.dirname(root)
+            while True:
+                parents.append(path)
+                if path == repo_root:
+                    break
+                path = os.path.dirname(path)
+            for parent in reversed(parents):
+                prefix = os.path.relpath(root, parent).replace(os.sep, '/') + '/'
+                rules = IgnoreRules.load(os.path.join(parent, '.gitignore'), prefix)
+                if rules is not None:
+                    self.root_rules.append(rules)
+        self.root_rules.extend(self.rules_in('.', ''))
+
+    def rules_in(self, dir_path, rel_dir):
+        """Compile the ignore files that live directly in `dir_path`."""
+        if not self.use_gitignore:
+            return []
+        strip = len(rel_dir) + 1 if rel_dir else 0
+        found = []
+        for name in ignore_file_names:
+            rules = IgnoreRules.load(os.path.join(dir_path, name), strip=strip)
+            if rules is not None:
+                found.append(rules)
+        return found
+
+    def ignored(self, rules, rel_path, is_dir):
+        # Deeper ignore files win; within one file the last matching rule wins
+        for rule_set in reversed(rules):
+            verdict = rule_set.match(rel_path, is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+
+    def walk(self, dir_path='.', rel_dir='', rules=None):
+        """Yield (path, stat) for every file to bundle, in os.walk order.
+
+        Uses os.scandir, so file/directory type comes from the DirEntry and
+        the only stat call is the one for a file that is actually kept.
+        """
+        if rules is None:
+            rules = self.root_rules
+        elif rel_dir:
+            nested = self.rules_in(dir_path, rel_dir)
+            if nested:
+                rules = rules + nested
+
+        subdirs = []
+        try:
+            with os.scandir(dir_path) as entries:
+                entries = list(entries)
+        except OSError as e:
+            print(f"⚠️ Could not list {dir_path}: {e}")
+            return
+
+        for entry in entries:
+            name = entry.name
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if name in self.dir_names or self.ignored(rules, rel_path, True):
+                    continue
+                if not entry.is_symlink():  # os.walk doesn't follow links either
+                    subdirs.append((entry.path, rel_path))
+            elif (name not in self.file_names and name.endswith(self.suffixes)
+                    and not self.ignored(rules, rel_path, False)):
+                try:
+                    yield entry.path, entry.stat()
+                except OSError as e:
+                    print(f"⚠️ Could not read {entry.path}: {e}")
+
+        for sub_path, sub_rel in subdirs:
+            yield from self.walk(sub_path, sub_rel, rules)
 
-def main():
+def collect_files(use_gitignore=True):
+    """Yield (path, stat) for bundle candidates in walk order."""
+    return PathFilter('.', use_gitignore).walk('.')
+
+class Prefetched:
+    """A file picked up by the read stage.
+
+    Either `entry` is set (unchanged since the manifest, copy the cached
+    segment) or `head` holds the first chunk of decoded text and `infile`, if
+    not None, is left open at the point where the writer should carry on.
+    """
+    __slots__ = ('path', 'stat', 'entry', 'head', 'infile')
+
+    def __init__(self, path, stat, entry=None, head='', infile=None):
+        self.path = path
+        self.stat = stat
+        self.entry = entry
+        self.head = head
+        self.infile = infile
+
+    def close(self):
+        if self.infile is not None:
+            self.infile.close()
+            self.infile = None
+
+def prefetch(file_path, stat, entry):
+    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return Prefetched(file_path, stat, entry=entry)
+
+    # Text mode gives the same UTF-8 decoding and universal newlines as the old
+    # whole-file read, so undecodable files still raise and get skipped.
+    infile = open(file_path, 'r', encoding='utf-8')
     try:
-        with open(output_file, 'w', encoding='utf-8') as outfile:
-            # 1. Write a Header for the AI
-            outfile.write(f"# PROJECT CONTEXT DUMP\n")
-            outfile.write(f"# This file contains the concatenated codebase for 'Capture Client'.\n")
-            outfile.write(f"# Use this to understand the architecture, components, and styling.\n")
-            outfile.write(f"==================================================================\n\n")
+        head = infile.read(prefetch_chars)
+    except Exception:
+        infile.close()
+        raise
+    if len(head) < prefetch_chars:
+        infile.close()
+        infile = None
+    return Prefetched(file_path, stat, head=head, infile=infile)
+
+def read_ahead(planned, workers=None):
+    """Yield (planned file, future) pairs in order, at most a window ahead."""
+    workers = workers or read_workers
+    window = workers * 4   # files in flight; bounds memory and open handles
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for planned_file in planned:
+                if planned_file.family is not None:
+                    future = Future()   # already packed, nothing to read
+                    future.set_result(None)
+                else:
+                    future = pool.submit(prefetch, planned_file.path, planned_file.stat, planned_file.entry)
+                pending.append((planned_file, future))
+                if len(pending) >= window:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            # Only reached with work left over if the writer bailed out early
+            for _, future in pending:
+                if not future.cancel() and future.exception() is None and future.result() is not None:
+                    future.result().close()
+
+def cut_utf8(data, size):
+    """Trim encoded text to at most `size` bytes, preferably at a line end."""
+    data = data[:size]
+    newline = data.rfind(b'\n')
+    if newline > 0:
+        return data[:newline + 1]
+    return data.decode('utf-8', 'ignore').encode('utf-8')
+
+def stream_segment(outfile, item, limit=None):
+    """Stream one file into its <file> envelope.
+
+    Returns (content hash, truncated). With `limit`, at most that many bytes of
+    content are written, followed by a truncation marker.
+
+    On a read/decode error part-way through, the output is rewound to where
+    the segment started so the bundle never contains half a file.
+    """
+    start = outfile.tell()
+    hasher = hashlib.sha256()
+    written = 0
+
+    def emit(text):
+        nonlocal written
+        data = text.encode('utf-8')
+        if limit is not None and written + len(data) > limit:
+            data = cut_utf8(data, limit - written)
+            hasher.update(data)
+            outfile.write(data)
+            written += len(data)
+            return False
+        hasher.update(data)
+        outfile.write(data)
+        written += len(data)
+        return True
+
+    try:
+        # Write the File Content with XML Tags
+        # This helps Claude distinguish between different files easily
+        outfile.write(f"<file path=\"{item.path}\">\n".encode('utf-8'))
+        complete = emit(item.head)
+        while complete and item.infile is not None:
+            chunk = item.infile.read(copy_chunk_chars)
+            if not chunk:
+                break
+            complete = emit(chunk)
+        if not complete:
+            marker = TRUNCATION_MARKER.format(kept=written, total=item.stat.st_size)
+            outfile.write(marker.encode('utf-8'))
+        outfile.write(b"\n</file>\n\n")
+    except Exception:
+        outfile.seek(start)
+        outfile.truncate()
+        raise
+    finally:
+        item.close()
+    return hasher.hexdigest(), not complete
+
+class PlannedFile:
+    """A file selected for the bundle; `limit` caps its content bytes.
+
+    With `family` set this stands for a whole packed JSON family: `family` is
+    its rendered bytes and `members` the files it covers.
+    """
+    __slots__ = ('path', 'stat', 'priority', 'limit', 'entry', 'family', 'members')
+
+    def __init__(self, path, stat, priority=0, limit=None, entry=None):
+        self.path = path
+        self.stat = stat
+        self.priority = priority
+        self.limit = limit
+        self.entry = entry
+        self.family = None
+        self.members = ()
+
+    @property
+    def cost(self):
+        """Upper bound on the bytes this contributes to the bundle."""
+        if self.family is not None:
+            return len(self.family)
+        return envelope_size(self.path) + self.stat.st_size
+
+def file_priority(file_path):
+    """0 = source under src/, 1 = config and scripts, 2 = .md/.json data.
+
+    JSON at the project root (package.json, tsconfig.json, ...) counts as config.
+    """
+    parts = file_path.split(os.sep)
+    if file_path.endswith('.md'):
+        return 2
+    if file_path.endswith('.json'):
+        return 1 if len(parts) == 2 else 2
+    if len(parts) > 2 and parts[1] == 'src' and file_path.endswith(source_extensions):
+        return 0
+    return 1
+
+def envelope_size(file_path):
+    return len(f"<file path=\"{file_path}\">\n".encode('utf-8')) + len("\n</file>\n\n")
+
+def template_vars(data, text):
+    """Pick the identity strings (city, state, slug, ...) that recur in a file.
+
+    Candidates are short string values in the top two levels of the object,
+    plus their lowercase forms, named after their key.
+    """
+    variables = {}
+
+    def consider(name, value):
+        if (3 <= len(value) <= max_var_chars and '{' not in value and '}' not in value
+                and value not in variables.values() and text.count(value) >= 3):
+            unique = name
+            suffix = 2
+            while unique in variables:
+                unique = f"{name}{suffix}"
+                suffix += 1
+            variables[unique] = value
 
-            file_count = 0
+    def walk(node, depth):
+        for key, value in node.items():
+            if isinstance(value, str):
+                consider(key, value)
+                consider(f"{key}_lower", value.lower())
+            elif isinstance(value, dict) and depth < 1:
+                walk(value, depth + 1)
+
+    if isinstance(data, dict):
+        walk(data, 0)
+    return variables
+
+def templatize(text, variables):
+    """Escape braces and swap variable values for {name} in a single pass."""
+    text = text.replace('{', '{{').replace('}', '}}')
+    if not variables:
+        return text
+    by_value = {value: name for name, value in variables.items()}
+    pattern = re.compile('|'.join(re.escape(value) for value in sorted(by_value, key=len, reverse=True)))
+    return pattern.sub(lambda match: '{' + by_value[match.group(0)] + '}', text)
+
+def expand_template(body, chunks, variables):
+    """Inverse of the family encoding: rebuild a file's exact text."""
+    def inline_chunks(match):
+        if match.group(1) is None:
+            return match.group(0)
+        first = int(match.group(1))
+        last = int(match.group(2) or first)
+        return ''.join(chunks[first:last + 1])
+
+    def substitute(match):
+        token = match.group(0)
+        if token == '{{':
+            return '{'
+        if token == '}}':
+            return '}'
+        return variables[match.group(3)]
+
+    return TEMPLATE_TOKEN.sub(substitute, TEMPLATE_TOKEN.sub(inline_chunks, body))
+
+def encode_chunks(pieces, table):
+    """Replace shared chunks with {@N}, collapsing consecutive ids into {@N-M}."""
+    out = []
+    run = None
+    for piece in pieces:
+        chunk_id = table.get(piece)
+        if chunk_id is not None and run is not None and chunk_id == run[1] + 1:
+            run[1] = chunk_id
+            continue
+        if run is not None:
+            out.append(f"{{@{run[0]}}}" if run[0] == run[1] else f"{{@{run[0]}-{run[1]}}}")
+            run = None
+        if chunk_id is None:
+            out.append(piece)
+        else:
+            run = [chunk_id, chunk_id]
+    if run is not None:
+        out.append(f"{{@{run[0]}}}" if run[0] == run[1] else f"{{@{run[0]}-{run[1]}}}")
+    return ''.join(out)
+
+def pack_json_family(directory, members):
+    """Pack sibling JSON files into one block, or return None if it doesn't pay.
+
+    Each file is templated on its own identity strings, cut into
+    content-defined chunks (line ends and sentence ends, so repeats line up
+    wherever they sit), and chunks seen in more than one file go into a shared
+    table. Every file is checked to expand back to its exact text; one that
+    doesn't, or isn't valid JSON, is left out and bundled normally.
+
+    Returns (PlannedFile for the block, members left out).
+    """
+    docs = []
+    left_out = []
+    for planned_file in members:
+        try:
+            with open(planned_file.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            variables = template_vars(json.loads(text), text)
+        except (OSError, ValueError):
+            left_out.append(planned_file)
+            continue
+        pieces = [piece for piece in CHUNK_BOUNDARY.split(templatize(text, variables)) if piece]
+        docs.append((planned_file, text, variables, pieces))
+
+    counts = Counter(piece for doc in docs for piece in set(doc[3]))
+    table = {}
+    for _, _, _, pieces in docs:
+        for piece in pieces:
+            if counts[piece] > 1 and len(piece) >= min_chunk_chars and piece not in table:
+                table[piece] = len(table)
+    chunks = list(table)
+
+    packed = []
+    for planned_file, text, variables, pieces in docs:
+        body = encode_chunks(pieces, table)
+        if expand_template(body, chunks, variables) != text:
+            left_out.append(planned_file)
+            continue
+        packed.append((planned_file, text, variables, body))
+
+    if len(packed) < min_family_size:
+        return None, members
+
+    raw_size = sum(len(text.encode('utf-8')) for _, text, _, _ in packed)
+    parts = [f"<json-family dir=\"{directory}\" files=\"{len(packed)}\" bytes=\"{raw_size}\">\n", FAMILY_HELP, "<chunks>\n"]
+    parts.extend(f"<chunk id=\"{chunk_id}\">{chunk}</chunk>\n" for chunk_id, chunk in enumerate(chunks))
+    parts.append("</chunks>\n</json-family>\n\n")
+    for planned_file, _, variables, body in packed:
+        parts.append(f"<file path=\"{planned_file.path}\" format=\"json-template\">\n")
+        parts.append(f"<vars>{json.dumps(variables, ensure_ascii=False)}</vars>\n")
+        parts.append(f"{body}\n</file>\n\n")
+    data = ''.join(parts).encode('utf-8')
+
+    verbatim_size = sum(envelope_size(planned_file.path) + len(text.encode('utf-8')) for planned_file, text, _, _ in packed)
+    if len(data) > verbatim_size * (1 - min_family_saving):
+        return None, members
+
+    block = PlannedFile(packed[0][0].path, packed[0][0].stat, file_priority(packed[0][0].path))
+    block.family = data
+    block.members = [planned_file for planned_file, _, _, _ in packed]
+    return block, left_out
+
+def collapse_json_families(planned):
+    """Swap each directory of sibling .json files for a packed family block.
+
+    The block takes the place of the family's first member in walk order.
+    """
+    siblings = {}
+    for planned_file in planned:
+        if planned_file.path.endswith('.json'):
+            siblings.setdefault(os.path.dirname(planned_file.path), []).append(planned_file)
+
+    replacements = {}
+    for directory, members in siblings.items():
+        if len(members) < min_family_size:
+            continue
+        block, left_out = pack_json_family(directory, members)
+        if block is None:
+            continue
+        for planned_file in block.members:
+            replacements[planned_file.path] = None
+        replacements[block.members[0].path] = block
+        print(f"Packed JSON family: {directory} ({len(block.members)} files, "
+              f"{sum(member.stat.st_size for member in block.members):,} -> {len(block.family):,} bytes)")
+
+    collapsed = []
+    for planned_file in planned:
+        if planned_file.path not in replacements:
+            collapsed.append(planned_file)
+        elif replacements[planned_file.path] is not None:
+            collapsed.append(replacements[planned_file.path])
+    return collapsed
+
+def plan_bundle(file_paths, max_bytes=None, dedupe_json=False):
+    """Decide what goes into the bundle, given (path, stat) pairs.
+
+    Without a budget this is the walk order, unchanged. With one, files are
+    ranked by priority (walk order within a tier) and taken while they fit;
+    the first one that doesn't is truncated to the space left, if that's
+    worth keeping, and everything after it is dropped.
+
+    On-disk size is an upper bound on the bytes a file contributes (newline
+    normalisation only ever shrinks it), so the budget is never exceeded.
+    Packed JSON families are taken or dropped whole.
+    """
+    planned = [
+        PlannedFile(file_path, stat, file_priority(file_path))
+        for file_path, stat in file_paths
+    ]
+
+    if dedupe_json:
+        planned = collapse_json_families(planned)
+
+    if max_bytes is None:
+        return planned, []
+
+    planned.sort(key=lambda planned_file: planned_file.priority)
+    marker_size = len(TRUNCATION_MARKER.format(kept=10 ** 12, total=10 ** 12).encode('utf-8'))
+    remaining = max_bytes - len(HEADER.encode('utf-8'))
+    selected = []
+    dropped = []
+
+    for planned_file in planned:
+        if remaining is None:
+            dropped.append(planned_file)
+            continue
+        if planned_file.cost <= remaining:
+            selected.append(planned_file)
+            remaining -= planned_file.cost
+            continue
+        room = remaining - envelope_size(planned_file.path) - marker_size
+        if planned_file.family is None and room >= min_truncated_bytes:
+            planned_file.limit = room
+            selected.append(planned_file)
+        else:
+            dropped.append(planned_file)
+        remaining = None
+
+    return selected, dropped
+
+def directory_key(file_path):
+    return os.sep.join(os.path.dirname(file_path).split(os.sep)[:report_depth + 1])
+
+def print_size_report(included, dropped):
+    """Per-directory bytes and approximate tokens, biggest consumers first."""
+    totals = {}
+    for file_path, size, count in included:
+        row = totals.setdefault(directory_key(file_path), [0, 0, 0, 0])
+        row[0] += size
+        row[1] += count
+    for file_path, size in dropped:
+        row = totals.setdefault(directory_key(file_path), [0, 0, 0, 0])
+        row[2] += size
+        row[3] += 1
+
+    total_included = sum(size for _, size, _ in included)
+    included_count = sum(count for _, _, count in included)
+    total_dropped = sum(size for _, size in dropped)
+    width = max([len(key) for key in totals] + [len('Directory')])
+
+    print(f"\n📊 Bundle size by directory (~{chars_per_token} bytes/token)")
+    print(f"   {'Directory':<{width}}  {'Bytes':>11}  {'~Tokens':>9}  {'Files':>5}  {'Dropped':>11}  {'Files':>5}")
+    for key, (size, count, dropped_size, dropped_count) in sorted(totals.items(), key=lambda item: -(item[1][0] + item[1][2])):
+        print(f"   {key:<{width}}  {size:>11,}  {size // chars_per_token:>9,}  {count:>5}  {dropped_size:>11,}  {dropped_count:>5}")
+    print(f"   {'TOTAL':<{width}}  {total_included:>11,}  {total_included // chars_per_token:>9,}  {included_count:>5}  {total_dropped:>11,}  {len(dropped):>5}")
+
+def load_manifest():
+    """Return the previous run's manifest, or None if it can't be trusted.
+
+    Cached segments are addressed by byte offset into the previous output, so
+    the manifest is only usable while that output is exactly as we left it.
+    """
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        stat = os.stat(output_file)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    if manifest.get('output_size') != stat.st_size or manifest.get('output_mtime_ns') != stat.st_mtime_ns:
+        return None
+    return manifest
+
+def write_manifest(entries):
+    stat = os.stat(output_file)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'output_size': stat.st_size,
+        'output_mtime_ns': stat.st_mtime_ns,
+        'files': entries,
+    }
+    tmp_path = manifest_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, manifest_file)
+
+def build_bundle(incremental=False, workers=None, max_bytes=None, report=False, dedupe_json=False,
+                 use_gitignore=True):
+    """Write the bundle, reusing unchanged segments of the previous output.
+
+    A file whose mtime and size match the manifest is copied straight out of the
+    old bundle without being opened; everything else is streamed in from the
+    read stage. Truncated segments and packed JSON families are never reused.
+    """
+    manifest = load_manifest() if incremental else None
+    previous_entries = manifest['files'] if manifest else {}
+    if incremental and manifest is None:
+        print("ℹ️ No usable manifest found, doing a full rebuild.")
+
+    planned, dropped = plan_bundle(collect_files(use_gitignore), max_bytes, dedupe_json)
+    for planned_file in planned:
+        entry = previous_entries.get(planned_file.path)
+        if (entry and planned_file.limit is None and planned_file.family is None
+                and not entry.get('truncated') and not entry.get('family')):
+            planned_file.entry = entry
+
+    entries = {}
+    included = []
+    file_count = 0
+    reused_count = 0
+    truncated_count = 0
+    tmp_path = output_file + '.tmp'
+
+    previous = open(output_file, 'rb') if manifest else None
+    try:
+        with open(tmp_path, 'wb') as outfile:
+            # 1. Write a Header for the AI
+            outfile.write(HEADER.encode('utf-8'))
 
             # 2. Walk through the directory tree
-            for root, dirs, files in os.walk('.'):
-                # Filter out ignored directories in-place
-                dirs[:] = [d for d in dirs if d not in dirs_to_ignore]
-                
-                for file in files:
-                    if file in files_to_ignore:
-                        continue
-                    
-                    if is_text_file(file):
-                        file_path = os.path.join(root, file)
-                        
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as infile:
-                                content = infile.read()
-                                
-                                # 3. Write the File Content with XML Tags
-                                # This helps Claude distinguish between different files easily
-                                outfile.write(f"<file path=\"{file_path}\">\n")
-                                outfile.write(content)
-                                outfile.write(f"\n</file>\n\n")
-                                
-                                print(f"Bundled: {file_path}")
-                                file_count += 1
-                        except Exception as e:
-                            print(f"⚠️ Could not read {file_path}: {e}")
+            for planned_file, future in read_ahead(planned, workers):
+                file_path = planned_file.path
+                if planned_file.family is not None:
+                    offset = outfile.tell()
+                    outfile.write(planned_file.family)
+                    for member in planned_file.members:
+                        entries[member.path] = {
+                            'mtime_ns': member.stat.st_mtime_ns,
+                            'size': member.stat.st_size,
+                            'sha256': None,
+                            'offset': offset,
+                            'length': len(planned_file.family),
+                            'family': os.path.dirname(file_path),
+                        }
+                    included.append((file_path, len(planned_file.family), len(planned_file.members)))
+                    file_count += len(planned_file.members)
+                    continue
+                try:
+                    item = future.result()
+                    offset = outfile.tell()
+                    truncated = False
+
+                    if item.entry is not None:
+                        previous.seek(item.entry['offset'])
+                        outfile.write(previous.read(item.entry['length']))
+                        digest = item.entry['sha256']
+                        reused_count += 1
+                    else:
+                        digest, truncated = stream_segment(outfile, item, planned_file.limit)
+                        if truncated:
+                            truncated_count += 1
+                            print(f"Bundled (truncated): {file_path}")
+                        else:
+                            print(f"Bundled: {file_path}")
+
+                    entries[file_path] = {
+                        'mtime_ns': item.stat.st_mtime_ns,
+                        'size': item.stat.st_size,
+                        'sha256': digest,
+                        'offset': offset,
+                        'length': outfile.tell() - offset,
+                        'truncated': truncated,
+                    }
+                    included.append((file_path, outfile.tell() - offset, 1))
+                    file_count += 1
+                except Exception as e:
+                    print(f"⚠️ Could not read {file_path}: {e}")
+    finally:
+        if previous is not None:
+            previous.close()
+
+    os.replace(tmp_path, output_file)
+    write_manifest(entries)
+
+    if dropped:
+        print(f"\n✂️ Dropped {len(dropped)} lower-priority files to stay within {max_bytes:,} bytes")
+    if report or max_bytes is not None:
+        print_size_report(included, [(planned_file.path, planned_file.cost) for planned_file in dropped])
+    return file_count, reused_count
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle the codebase into a single context file.")
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help=f"reuse unchanged file segments recorded in '{manifest_file}'",
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=None,
+        help=f"reader threads for the prefetch stage (default: {read_workers})",
+    )
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument(
+        '--max-bytes', type=int, default=None,
+        help="cap the bundle size; src/ code first, then config, then .md/.json data",
+    )
+    budget.add_argument(
+        '--max-tokens', type=int, default=None,
+        help=f"like --max-bytes, assuming ~{chars_per_token} bytes per token",
+    )
+    parser.add_argument(
+        '--dedupe-json', action='store_true',
+        help="pack directories of sibling .json files as a shared chunk table plus per-file templates",
+    )
+    parser.add_argument(
+        '--no-gitignore', dest='use_gitignore', action='store_false',
+        help="only apply the built-in ignore sets, not .gitignore/.bundleignore",
+    )
+    parser.add_argument(
+        '--report', action='store_true',
+        help="print per-directory byte/token totals (always on with a budget)",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    max_bytes = args.max_bytes
+    if args.max_tokens is not None:
+        max_bytes = args.max_tokens * chars_per_token
+    try:
+        file_count, reused_count = build_bundle(
+            incremental=args.incremental,
+            workers=args.jobs,
+            max_bytes=max_bytes,
+            report=args.report,
+            dedupe_json=args.dedupe_json,
+            use_gitignore=args.use_gitignore,
+        )
 
         print(f"\n✅ SUCCESS! Bundled {file_count} files into '{output_file}'")
+        if args.incremental:
+            print(f"   ({file_count - reused_count} re-read, {reused_count} reused from cache)")
         print(f"👉 Upload '{output_file}' to Claude now.")
 
     except Exception as e:
         print(f"❌ Error creating bundle: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,15 +3,32 @@
 Integration Logo Downloader Script
 Downloads logos from URLs in integration_logos.json and saves them locally.
 Updates the JSON file with local paths.
+
+Downloads run concurrently through logo_fetch.LogoFetcher: one pooled
+keep-alive session, a per-host concurrency cap, a global rate limit and
+retries with jittered backoff. Logos already on disk are revalidated with
+their ETag/Last-Modified and only rewritten when they changed.
+
+Progress lives in the logo_jobs SQLite queue: an interrupted run resumes
+where it stopped and a rerun after a finished one revalidates every logo,
+dead URLs (404/410) are not retried until --retry-dead, other failures
+back off between runs, and --processes N drains the queue from several
+processes. --fresh requeues everything, even mid-run.
 """
 
+import argparse
 import json
-import os
-import requests
+import multiprocessing
 import time
+from collections import Counter
+from functools import partial
 from pathlib import Path
 from urllib.parse import urlparse
-import mimetypes
+
+from logo_fetch import (CACHE_FILE, COPIED, DEFAULT_PER_HOST, DEFAULT_RATE, DEFAULT_WORKERS, DOWNLOADED, HEADERS,
+                        NOT_MODIFIED, UNCHANGED, LogoCache, LogoFetcher)
+from logo_jobs import (DONE, FAILED, PENDING, RUNNING, JobQueue, add_queue_arguments, open_queue,
+                       print_queue_summary)
 
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
@@ -19,14 +36,10 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 INPUT_FILE = PROJECT_ROOT / "src" / "data" / "integration_logos.json"
 OUTPUT_DIR = PROJECT_ROOT / "public" / "images" / "integrations"
 OUTPUT_JSON = PROJECT_ROOT / "src" / "data" / "integration_logos_local.json"
+QUEUE_NAME = "integration-logos"
 
 # Headers to mimic browser request
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-    'Accept-Language': 'en-US,en;q=0.9',
-    'Referer': 'https://www.google.com/',
-}
+HEADERS = {**HEADERS, 'Referer': 'https://www.google.com/'}
 
 
 def get_extension_from_url(url: str, content_type: str = None) -> str:
@@ -74,8 +87,19 @@ def sanitize_filename(name: str) -> str:
     return safe.strip('-')
 
 
-def download_logo(integration: dict, output_dir: Path) -> dict:
-    """Download a single logo and return updated integration data."""
+def failed_record(integration: dict, error: Exception) -> dict:
+    return {
+        **integration,
+        'localPath': None,
+        'originalUrl': integration.get('logoUrl', ''),
+        'downloadedAt': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'error': str(error),
+        'status': 'failed'
+    }
+
+
+def fetch_logo(fetcher: LogoFetcher, integration: dict, output_dir: Path) -> dict:
+    """Download a single logo and return updated integration data; raises on failure."""
     name = integration.get('name', 'unknown')
     logo_url = integration.get('logoUrl', '')
     integration_id = integration.get('id', sanitize_filename(name))
@@ -84,109 +108,141 @@ def download_logo(integration: dict, output_dir: Path) -> dict:
         print(f"  [SKIP] {name}: No logo URL provided")
         return integration
 
+    # File extension from the URL or content-type; unchanged logos are not rewritten
+    result = fetcher.fetch_to_file(
+        logo_url,
+        lambda content_type, _: output_dir / f"{integration_id}{get_extension_from_url(logo_url, content_type)}")
+    filename = result.path.name
+
+    # Update integration with local path
+    local_path = f"/images/integrations/{filename}"
+
+    print(f"  [SUCCESS] {name} -> {filename} ({result.size:,} bytes, {result.status})")
+
+    return {
+        **integration,
+        'localPath': local_path,
+        'originalUrl': logo_url,
+        'downloadedAt': result.fetched_at,
+        'fileSize': result.size,
+        'status': 'success'
+    }
+
+
+def job_key(integration: dict) -> str:
+    return integration.get('id') or sanitize_filename(integration.get('name', 'unknown'))
+
+
+def drain_queue(args) -> dict:
+    """Worker (in-process or one of --processes): run queued jobs until none are eligible.
+
+    Each worker claims up to --workers jobs at a time and downloads them
+    concurrently; the request rate and per-host limits are split between
+    the worker processes. Returns the fetcher's request counters.
+    """
+    processes = max(1, args.processes)
+    queue = JobQueue(args.queue_file)
+    cache = None if args.no_cache else LogoCache(args.cache)
+    fetcher = LogoFetcher(workers=args.workers, per_host=max(1, args.per_host // processes),
+                          rate=args.rate / processes, headers=HEADERS, cache=cache)
+    fetch = partial(fetch_logo, output_dir=args.output_dir)
     try:
-        print(f"  [DOWNLOADING] {name} from {logo_url[:60]}...")
-
-        response = requests.get(logo_url, headers=HEADERS, timeout=30, allow_redirects=True)
-        response.raise_for_status()
-
-        # Determine file extension
-        content_type = response.headers.get('Content-Type', '')
-        ext = get_extension_from_url(logo_url, content_type)
-
-        # Create filename
-        filename = f"{integration_id}{ext}"
-        filepath = output_dir / filename
-
-        # Write file
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-
-        # Calculate file size
-        file_size = len(response.content)
-
-        # Update integration with local path
-        local_path = f"/images/integrations/{filename}"
-
-        print(f"  [SUCCESS] {name} -> {filename} ({file_size:,} bytes)")
-
-        return {
-            **integration,
-            'localPath': local_path,
-            'originalUrl': logo_url,
-            'downloadedAt': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'fileSize': file_size,
-            'status': 'success'
-        }
-
-    except requests.exceptions.RequestException as e:
-        print(f"  [ERROR] {name}: {str(e)[:80]}")
-        return {
-            **integration,
-            'localPath': None,
-            'originalUrl': logo_url,
-            'downloadedAt': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'error': str(e),
-            'status': 'failed'
-        }
-    except Exception as e:
-        print(f"  [ERROR] {name}: Unexpected error - {str(e)[:80]}")
-        return {
-            **integration,
-            'localPath': None,
-            'originalUrl': logo_url,
-            'error': str(e),
-            'status': 'failed'
-        }
-
-
-def main():
+        while True:
+            jobs = queue.claim(QUEUE_NAME, args.workers)
+            if not jobs:
+                break
+            finished = []
+            try:
+                for i, outcome in fetcher.map(lambda fetcher, job: fetch(fetcher, job.payload), jobs):
+                    job = jobs[i]
+                    if isinstance(outcome, Exception):
+                        print(f"  [ERROR] {job.payload.get('name', job.key)}: {str(outcome)[:80]}")
+                        queue.fail(job, outcome, failed_record(job.payload, outcome))
+                    else:
+                        queue.complete(job, outcome)
+                    finished.append(job)
+            finally:
+                # Interrupted: hand the rest back so the next run picks them up at once
+                queue.release([job for job in jobs if job not in finished])
+    finally:
+        fetcher.close()
+        queue.close()
+    return fetcher.stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Download integration logos and record their local paths.")
+    parser.add_argument('--input', type=Path, default=INPUT_FILE, help="integrations JSON (default: %(default)s)")
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR, help="logo directory (default: %(default)s)")
+    parser.add_argument('--output-json', type=Path, default=OUTPUT_JSON, help="results JSON (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="concurrent downloads")
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST, help="concurrent downloads per host")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help="max requests per second overall (0 = unlimited)")
+    parser.add_argument('--cache', type=Path, default=CACHE_FILE, help="HTTP cache file (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', help="download everything in full")
+    parser.add_argument('--processes', type=int, default=1, help="worker processes draining the job queue")
+    add_queue_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main execution function."""
+    args = parse_args(argv)
     print("=" * 60)
     print("INTEGRATION LOGO DOWNLOADER")
     print("=" * 60)
 
     # Ensure output directory exists
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    print(f"\nOutput directory: {OUTPUT_DIR}")
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"\nOutput directory: {args.output_dir}")
 
     # Check if input file exists
-    if not INPUT_FILE.exists():
-        print(f"\nERROR: Input file not found: {INPUT_FILE}")
+    if not args.input.exists():
+        print(f"\nERROR: Input file not found: {args.input}")
         print("Please create integration_logos.json first.")
         return
 
     # Load integration data
-    print(f"Loading logos from: {INPUT_FILE}")
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+    print(f"Loading logos from: {args.input}")
+    with open(args.input, 'r', encoding='utf-8') as f:
         integrations = json.load(f)
 
-    print(f"Found {len(integrations)} integrations to process\n")
-
-    # Download each logo
-    results = []
-    success_count = 0
-    fail_count = 0
-    skip_count = 0
-
-    for i, integration in enumerate(integrations, 1):
-        print(f"[{i}/{len(integrations)}] Processing {integration.get('name', 'Unknown')}...")
-        result = download_logo(integration, OUTPUT_DIR)
-        results.append(result)
-
-        if result.get('status') == 'success':
-            success_count += 1
-        elif result.get('status') == 'failed':
-            fail_count += 1
+    # Queue every integration; an unfinished run resumes, a finished one is revalidated in full
+    queue = open_queue(QUEUE_NAME, args)
+    added = queue.enqueue(QUEUE_NAME, [(job_key(integration), integration.get('logoUrl', ''), integration)
+                                       for integration in integrations], prune=True)
+    counts = queue.counts(QUEUE_NAME)
+    print(f"Found {len(integrations)} integrations ({added} new); "
+          f"{counts[PENDING] + counts[RUNNING] + counts[FAILED]} queued, {counts[DONE]} already done "
+          f"({args.processes} x {args.workers} workers, {args.per_host} per host, {args.rate:g} req/s)\n")
+
+    # Download concurrently from one or more worker processes
+    start = time.perf_counter()
+    try:
+        if args.processes > 1:
+            with multiprocessing.Pool(args.processes) as pool:
+                worker_stats = pool.map(drain_queue, [args] * args.processes)
         else:
-            skip_count += 1
+            worker_stats = [drain_queue(args)]
+    except KeyboardInterrupt:
+        print("\nInterrupted; progress is saved in the job queue. Run again to resume.")
+        print_queue_summary(queue, QUEUE_NAME)
+        return
+    stats = Counter()
+    for worker in worker_stats:
+        stats.update(worker)
+    elapsed = time.perf_counter() - start
 
-        # Small delay to be nice to servers
-        time.sleep(0.5)
+    # Results keep the input order; failures keep their last error
+    results = [job['result'] or job['payload'] for job in queue.jobs(QUEUE_NAME)]
+    success_count = sum(1 for result in results if result.get('status') == 'success')
+    fail_count = sum(1 for result in results if result.get('status') == 'failed')
+    skip_count = len(results) - success_count - fail_count
 
     # Save results
-    print(f"\nSaving results to: {OUTPUT_JSON}")
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
+    print(f"\nSaving results to: {args.output_json}")
+    with open(args.output_json, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
 
     # Print summary
@@ -197,16 +253,23 @@ def main():
     print(f"  Success:   {success_count}")
     print(f"  Failed:    {fail_count}")
     print(f"  Skipped:   {skip_count}")
-    print(f"\nResults saved to: {OUTPUT_JSON}")
-    print(f"Logos saved to: {OUTPUT_DIR}")
+    print(f"  Requests:  {stats['requests']} ({stats['retries']} retries) in {elapsed:.1f}s")
+    print(f"  Written:   {stats[DOWNLOADED] + stats[COPIED]} ({stats[COPIED]} copied from the cache; "
+          f"not modified: {stats[NOT_MODIFIED]}, same content: {stats[UNCHANGED]})")
+    print_queue_summary(queue, QUEUE_NAME)
+    queue.close()
+    print(f"\nResults saved to: {args.output_json}")
+    print(f"Logos saved to: {args.output_dir}")
 
     # Generate update snippet for integrations.ts
     print("\n" + "=" * 60)
     print("NEXT STEPS:")
     print("=" * 60)
-    print("1. Review downloaded logos in public/images/integrations/")
-    print("2. Update src/data/integrations.ts logoUrl fields to use local paths")
-    print("3. Run: npm run build to verify everything works")
+    print("1. Run: python scripts/logo_optimize.py to fix mislabelled files and shrink the logos")
+    print("2. Review downloaded logos in public/images/integrations/")
+    print("3. Update src/data/integrations.ts logoUrl fields to use local paths")
+    print("4. Run: python scripts/logo_sprites.py to repack the integrations grid sprite and atlas")
+    print("5. Run: npm run build to verify everything works")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Find duplicate and near-duplicate logos in public/images/integrations.
+
+Four downloaders write into the same directory under their own names, so
+the same logo piles up as slack.png and slack.svg, or nextiva.png holding
+the very bytes of nextiva.svg. For every logo this tool computes:
+
+  - an exact hash: SHA-256 of the bytes, or of the minified markup for SVGs
+    so whitespace and editor cruft do not hide a copy
+  - perceptual hashes of a rasterized preview (flattened onto white,
+    grayscale, cropped to the ink): a 64-bit pHash (DCT) and dHash
+    (gradient)
+
+Exact matches are grouped directly. Near matches come from a BK-tree over
+the pHashes, so each logo is only compared with neighbours within
+--threshold bits instead of with every other file. A pair joins a cluster
+when both its pHash and dHash distances are within the threshold and the
+crops have a similar aspect ratio (a square icon is not a wordmark).
+
+Each cluster keeps one canonical file: vector over raster, then one whose
+extension matches its bytes, the largest raster, the most referenced, and
+the shortest name. The others' /images/integrations/... references in src/
+(integration_logos_local.json, integrations.ts, the components) are
+rewritten to it; --delete also removes them. SVGs are rasterized with
+cairosvg when it is installed, otherwise they only match exactly.
+
+    python scripts/logo_dedup.py --dry-run
+    python scripts/logo_dedup.py --threshold 6 --delete
+"""
+
+import argparse
+import hashlib
+import io
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from logo_fetch import CACHE_FILE, LogoCache
+from logo_optimize import (EXTENSIONS, LOGO_DIR, PUBLIC_PREFIX, SRC_DIR, image_size, minify_svg, reference_files,
+                           rewrite_references, sniff_format, update_http_cache)
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+try:
+    import cairosvg
+except ImportError:  # SVGs then only match exactly
+    cairosvg = None
+
+THRESHOLD = 8  # bits out of 64
+MAX_ASPECT_RATIO = 1.25
+PREVIEW_SIZE = 256
+DCT_SIZE = 32
+HASH_SIZE = 8
+
+DCT_COSINES = [[math.cos((2 * x + 1) * u * math.pi / (2 * DCT_SIZE)) for x in range(DCT_SIZE)]
+               for u in range(HASH_SIZE)]
+
+
+@dataclass
+class Logo:
+    name: str
+    format: Optional[str]
+    size: int
+    exact: str
+    pixels: int = 0  # raster area; 0 for SVG
+    aspect: Optional[float] = None
+    phash: Optional[int] = None
+    dhash: Optional[int] = None
+    references: int = 0
+    matches: Dict[str, str] = field(default_factory=dict)  # name -> why it matched
+
+
+# ---------------------------------------------------------------------------
+# Hashes
+# ---------------------------------------------------------------------------
+
+def exact_hash(content: bytes, fmt: Optional[str]) -> str:
+    if fmt == 'svg':
+        try:
+            content = minify_svg(content.decode('utf-8-sig')).encode('utf-8')
+        except (UnicodeDecodeError, ValueError):
+            pass
+    return hashlib.sha256(content).hexdigest()
+
+
+def preview(content: bytes, fmt: Optional[str]):
+    """Grayscale preview on white, cropped to its ink; None when the format cannot be rasterized."""
+    if Image is None:
+        return None
+    if fmt == 'svg':
+        if cairosvg is None:
+            return None
+        try:
+            content = cairosvg.svg2png(bytestring=content, output_width=PREVIEW_SIZE)
+        except Exception:  # cairosvg raises a variety of parser errors
+            return None
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            if image.format == 'ICO':
+                image.size = max(image.info.get('sizes') or [image.size])
+            image.load()
+            image = image.convert('RGBA')
+    except (OSError, ValueError):
+        return None
+    flat = Image.new('RGBA', image.size, (255, 255, 255, 255))
+    flat.alpha_composite(image)
+    gray = flat.convert('L')
+    box = ImageOps.invert(gray).getbbox()
+    return gray.crop(box) if box else gray
+
+
+def dhash(image) -> int:
+    small = image.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    pixels = small.tobytes()
+    bits = 0
+    for y in range(HASH_SIZE):
+        row = pixels[y * (HASH_SIZE + 1):(y + 1) * (HASH_SIZE + 1)]
+        for x in range(HASH_SIZE):
+            bits = bits << 1 | (row[x] > row[x + 1])
+    return bits
+
+
+def phash(image) -> int:
+    """64-bit pHash: the signs of the 8x8 lowest-frequency DCT coefficients against their median."""
+    small = image.resize((DCT_SIZE, DCT_SIZE), Image.LANCZOS)
+    pixels = small.tobytes()
+    rows = [[sum(pixels[y * DCT_SIZE + x] * DCT_COSINES[u][x] for x in range(DCT_SIZE)) for u in range(HASH_SIZE)]
+            for y in range(DCT_SIZE)]
+    coefficients = [sum(DCT_COSINES[v][y] * rows[y][u] for y in range(DCT_SIZE))
+                    for v in range(HASH_SIZE) for u in range(HASH_SIZE)]
+    median = sorted(coefficients[1:])[len(coefficients) // 2 - 1]  # the DC term is left out
+    bits = 0
+    for value in coefficients:
+        bits = bits << 1 | (value > median)
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """Burkhard-Keller tree for nearest-neighbour queries under an integer metric."""
+
+    def __init__(self, distance: Callable[[int, int], int]):
+        self.distance = distance
+        self.root = None  # [key, item, {distance: child}]
+
+    def add(self, key: int, item):
+        if self.root is None:
+            self.root = [key, item, {}]
+            return
+        node = self.root
+        while True:
+            d = self.distance(key, node[0])
+            if d not in node[2]:
+                node[2][d] = [key, item, {}]
+                return
+            node = node[2][d]
+
+    def search(self, key: int, radius: int) -> List[Tuple[int, object]]:
+        """(distance, item) for every item within `radius` of `key`."""
+        found, stack = [], [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            d = self.distance(key, node[0])
+            if d <= radius:
+                found.append((d, node[1]))
+            stack.extend(child for edge, child in node[2].items() if d - radius <= edge <= d + radius)
+        return found
+
+
+# ---------------------------------------------------------------------------
+# Clustering
+# ---------------------------------------------------------------------------
+
+def load_logo(path: Path) -> Logo:
+    content = path.read_bytes()
+    fmt = sniff_format(content)
+    logo = Logo(path.name, fmt, len(content), exact_hash(content, fmt))
+    if fmt != 'svg':
+        width, height = image_size(content) or (0, 0)
+        logo.pixels = width * height
+    image = preview(content, fmt)
+    if image is not None:
+        logo.aspect = image.width / image.height
+        logo.phash = phash(image)
+        logo.dhash = dhash(image)
+    return logo
+
+
+def count_references(names: List[str], roots=(SRC_DIR,)) -> Dict[str, int]:
+    texts = [path.read_text(encoding='utf-8') for path in reference_files(roots)]
+    pattern = re.compile(re.escape(PUBLIC_PREFIX) + r'([\w.-]+?)(?![\w.-])')
+    counts = dict.fromkeys(names, 0)
+    for text in texts:
+        for match in pattern.finditer(text):
+            if match.group(1) in counts:
+                counts[match.group(1)] += 1
+    return counts
+
+
+def cluster(logos: List[Logo], threshold: int = THRESHOLD) -> List[List[Logo]]:
+    """Groups of two or more logos that are exact or perceptual matches (union-find)."""
+    parent = {logo.name: logo.name for logo in logos}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    def union(a: Logo, b: Logo, why: str):
+        a.matches[b.name] = why
+        b.matches[a.name] = why
+        parent[find(a.name)] = find(b.name)
+
+    by_exact: Dict[str, Logo] = {}
+    for logo in logos:
+        if logo.exact in by_exact:
+            union(logo, by_exact[logo.exact], 'identical')
+        else:
+            by_exact[logo.exact] = logo
+
+    tree = BKTree(hamming)
+    for logo in logos:
+        if logo.phash is None:
+            continue
+        for distance, other in tree.search(logo.phash, threshold):
+            if find(logo.name) == find(other.name):
+                continue
+            aspect = max(logo.aspect, other.aspect) / min(logo.aspect, other.aspect)
+            d_distance = hamming(logo.dhash, other.dhash)
+            if d_distance <= threshold and aspect <= MAX_ASPECT_RATIO:
+                union(logo, other, f"pHash {distance}, dHash {d_distance}")
+        tree.add(logo.phash, logo)
+
+    groups: Dict[str, List[Logo]] = {}
+    for logo in logos:
+        groups.setdefault(find(logo.name), []).append(logo)
+    return [sorted(group, key=lambda logo: logo.name) for group in groups.values() if len(group) > 1]
+
+
+def canonical(group: List[Logo]) -> Logo:
+    """Vector first, then a correct extension, the largest raster, the most referenced, the shortest name."""
+    return min(group, key=lambda logo: (logo.format != 'svg', Path(logo.name).suffix != EXTENSIONS.get(logo.format),
+                                        -logo.pixels, -logo.references, len(logo.name), logo.name))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def print_clusters(groups: List[List[Logo]], canonicals: Dict[int, Logo]):
+    print(f"\n{len(groups)} duplicate clusters")
+    for index, group in enumerate(groups):
+        keep = canonicals[index]
+        print(f"\n  keep {keep.name} ({keep.format}, {keep.size:,} bytes, {keep.references} refs)")
+        for logo in group:
+            if logo is not keep:
+                why = keep.matches.get(logo.name) or next(iter(logo.matches.values()))
+                print(f"     - {logo.name} ({logo.format}, {logo.size:,} bytes, {logo.references} refs): {why}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cluster duplicate integration logos and point references at one copy.")
+    parser.add_argument('--dir', type=Path, default=LOGO_DIR, help="logo directory (default: %(default)s)")
+    parser.add_argument('--src', type=Path, default=SRC_DIR, help="where references are rewritten (default: %(default)s)")
+    parser.add_argument('--threshold', type=int, default=THRESHOLD,
+                        help="max pHash/dHash Hamming distance for a near-duplicate (default: %(default)s)")
+    parser.add_argument('--delete', action='store_true', help="remove the duplicates after rewriting references")
+    parser.add_argument('--dry-run', action='store_true', help="report without writing anything")
+    args = parser.parse_args(argv)
+
+    if Image is None:
+        print("[WARNING] Pillow is not installed; only exact duplicates are found: pip install Pillow")
+    elif cairosvg is None:
+        print("[INFO] cairosvg is not installed; SVG logos only match exactly")
+
+    paths = sorted(path for path in Path(args.dir).iterdir() if path.is_file() and not path.name.startswith('.'))
+    logos = [load_logo(path) for path in paths]
+    references = count_references([logo.name for logo in logos], (args.src,))
+    for logo in logos:
+        logo.references = references[logo.name]
+    print(f"{len(logos)} logos in {args.dir}, {sum(logo.phash is not None for logo in logos)} with perceptual hashes")
+
+    groups = cluster(logos, args.threshold)
+    canonicals = {index: canonical(group) for index, group in enumerate(groups)}
+    print_clusters(groups, canonicals)
+    renames = {logo.name: canonicals[index].name
+               for index, group in enumerate(groups) for logo in group if logo is not canonicals[index]}
+    if not renames:
+        return 0
+
+    changed = rewrite_references(renames, (args.src,), dry_run=args.dry_run)
+    print()
+    for path, count in changed.items():
+        print(f"{'Would rewrite' if args.dry_run else 'Rewrote'} {count} reference(s) in {path.relative_to(args.src.parent)}")
+    if args.dry_run:
+        print("Dry run: nothing written")
+        return 0
+    if changed:
+        print("Run: python scripts/logo_sprites.py to repack the integrations grid sprite and atlas")
+
+    if args.delete:
+        logo_dir = Path(args.dir)
+        for name in renames:
+            (logo_dir / name).unlink()
+        print(f"Removed {len(renames)} duplicate files")
+        if CACHE_FILE.exists():
+            # Downloads of a removed duplicate now revalidate against the canonical copy
+            cache = LogoCache()
+            update_http_cache(cache, {(logo_dir / old).resolve(): (logo_dir / new).resolve()
+                                      for old, new in renames.items()})
+            cache.save()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP engine for the logo download scripts.
+
+One pooled requests.Session (keep-alive, a connection pool sized to the
+worker count) is shared by a thread pool. Concurrency is capped per host,
+a global rate limiter spaces request starts instead of a fixed sleep after
+every download, and transient failures (connection errors, timeouts, 429
+and 5xx responses) are retried with exponential backoff and full jitter,
+honouring Retry-After.
+
+requests speaks HTTP/1.1 only; connections are kept alive and reused
+instead.
+
+fetch_to_file() adds an on-disk HTTP cache keyed by URL (CACHE_FILE, in the
+repo's .cache directory rather than next to the public images). It keeps
+each URL's ETag, Last-Modified and content hash, revalidates with
+If-None-Match / If-Modified-Since, and leaves the file - and its mtime -
+alone on a 304 or when the body hashes the same, so a refresh is mostly
+cheap revalidations. A 304 for a URL cached under another file name (two
+scripts storing the same logo under different names) copies the cached
+file to the requested one.
+
+    fetcher = LogoFetcher(workers=8, per_host=4, rate=10, cache=LogoCache())
+    for index, result in fetcher.map(download_one, items):
+        ...
+    fetcher.close()  # also saves the cache
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Headers to mimic browser request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 4
+DEFAULT_RATE = 10.0
+DEFAULT_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+TIMEOUT = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CACHE_FILE = REPO_ROOT / ".cache" / "logo-http.json"
+
+# fetch_to_file() outcomes
+DOWNLOADED = 'downloaded'
+NOT_MODIFIED = 'not-modified'
+UNCHANGED = 'unchanged'
+COPIED = 'copied'  # not modified, but copied from the file the cache stored it as
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class HostLimiter:
+    """A semaphore per host, so no host sees more than `limit` requests at once."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    def __call__(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self.semaphores[host]
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry `attempt` (0-based): Retry-After, else full jitter."""
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass  # an HTTP date; fall back to backoff
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def sha256_file(path: Path) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class LogoCache:
+    """URL -> {etag, last_modified, sha256, path, content_type, size, fetched_at}, saved as JSON."""
+
+    def __init__(self, path: Path = CACHE_FILE):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, dict] = self.read()
+        self.updated = set()
+
+    def read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, url: str) -> Optional[dict]:
+        with self.lock:
+            return self.entries.get(url)
+
+    def put(self, url: str, entry: dict):
+        with self.lock:
+            self.entries[url] = entry
+            self.updated.add(url)
+
+    def save(self):
+        """Write this process's updates over the file's current entries (other processes may share it)."""
+        with self.lock:
+            entries = self.read()
+            entries.update({url: self.entries[url] for url in self.updated})
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    path: Path
+    status: str  # DOWNLOADED, NOT_MODIFIED, UNCHANGED or COPIED
+    size: int
+    sha256: str
+    content_type: str
+    fetched_at: str  # when the stored bytes were last downloaded
+
+    @property
+    def written(self) -> bool:
+        return self.status in (DOWNLOADED, COPIED)
+
+
+class LogoFetcher:
+    """Pooled, rate-limited, retrying GETs shared by a thread pool."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+                 rate: float = DEFAULT_RATE, retries: int = DEFAULT_RETRIES, headers: Optional[dict] = None,
+                 cache: Optional[LogoCache] = None):
+        self.workers = workers
+        self.cache = cache
+        self.retries = retries
+        self.rate_limiter = RateLimiter(rate)
+        self.host_limiter = HostLimiter(per_host)
+        self.session = requests.Session()
+        self.session.headers.update(headers or HEADERS)
+        adapter = HTTPAdapter(pool_connections=max(workers, 10), pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.stats = {'requests': 0, 'retries': 0, DOWNLOADED: 0, NOT_MODIFIED: 0, UNCHANGED: 0, COPIED: 0}
+        self.stats_lock = threading.Lock()
+
+    def get(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """GET with retries; raises requests.RequestException once they run out."""
+        attempt = 0
+        while True:
+            self.rate_limiter.wait()
+            with self.host_limiter(url):
+                with self.stats_lock:
+                    self.stats['requests'] += 1
+                try:
+                    response = self.session.get(url, headers=headers, timeout=TIMEOUT, allow_redirects=True)
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt >= self.retries:
+                        raise
+                    response = None
+            if response is not None and (response.status_code not in RETRY_STATUSES or attempt >= self.retries):
+                response.raise_for_status()
+                return response
+            with self.stats_lock:
+                self.stats['retries'] += 1
+            time.sleep(backoff_delay(attempt, response.headers.get('Retry-After') if response is not None else None))
+            attempt += 1
+
+    def fetch_to_file(self, url: str, path: Union[Path, Callable[[str, bytes], Path]],
+                      validate: Optional[Callable[[bytes, str], Optional[str]]] = None) -> FetchResult:
+        """Fetch `url` into `path`, revalidating against the cache.
+
+        `path` may be a callable taking (content_type, content). `validate`
+        gets (content, content_type) and returns an error message to refuse
+        the body (raised as ValueError, nothing written). A 304, or a body
+        identical to the file on disk, leaves the file untouched; a 304 for a
+        URL the cache stored under another path copies that file to `path`.
+        """
+        entry = self.cache.get(url) if self.cache else None
+        if entry and sha256_file(Path(entry['path'])) != entry['sha256']:
+            entry = None  # the stored file was changed or removed; fetch it in full
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.get(url, headers=headers or None)
+        if response.status_code == 304 and entry:
+            status = NOT_MODIFIED
+            source = Path(entry['path'])
+            content = source.read_bytes()
+            target = Path(path(entry['content_type'], content) if callable(path) else path)
+            if sha256_file(target) != entry['sha256']:
+                write_file(target, content)
+                status = COPIED
+            entry = {**entry,
+                     'path': str(target),
+                     'etag': response.headers.get('ETag', entry.get('etag')),
+                     'last_modified': response.headers.get('Last-Modified', entry.get('last_modified'))}
+        else:
+            content = response.content
+            content_type = response.headers.get('Content-Type', '')
+            if validate:
+                error = validate(content, content_type)
+                if error:
+                    raise ValueError(error)
+            target = Path(path(content_type, content) if callable(path) else path)
+            digest = hashlib.sha256(content).hexdigest()
+            if sha256_file(target) == digest:
+                status = UNCHANGED
+                fetched_at = entry['fetched_at'] if entry and entry['sha256'] == digest else file_time(target)
+            else:
+                status = DOWNLOADED
+                write_file(target, content)
+                fetched_at = time.strftime('%Y-%m-%d %H:%M:%S')
+            entry = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'sha256': digest,
+                'path': str(target),
+                'content_type': content_type,
+                'size': len(content),
+                'fetched_at': fetched_at,
+            }
+
+        if self.cache:
+            self.cache.put(url, entry)
+        with self.stats_lock:
+            self.stats[status] += 1
+        return FetchResult(url, Path(entry['path']), status, entry['size'], entry['sha256'],
+                           entry['content_type'], entry['fetched_at'])
+
+    def map(self, fn: Callable, items: Iterable) -> Iterator[Tuple[int, object]]:
+        """Yield (index, fn(self, item)) as each finishes; exceptions are yielded as results."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(fn, self, item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+
+    def close(self):
+        self.session.close()
+        if self.cache:
+            self.cache.save()
+
+
+def write_file(target: Path, content: bytes):
+    """Replace `target` atomically, so a reader never sees a half-written logo."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, target)
+
+
+def file_time(path: Path) -> str:
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(path.stat().st_mtime))
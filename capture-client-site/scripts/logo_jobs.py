@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Persistent job queue for the logo download scripts.
+
+Every logo URL is a row in a SQLite database (QUEUE_FILE, next to the HTTP
+cache) holding its state, attempt count, last error, backoff deadline and
+result, so a crash or Ctrl-C loses nothing. A run is finished once no job
+is pending or running; until then a rerun resumes it, picking up the jobs
+still pending and skipping everything already done. A rerun after a
+finished run starts a refresh: start_run() makes the done jobs pending
+again, so every logo is revalidated (a cheap 304 when unchanged).
+
+    pending -> running -> done
+                       -> failed  (retried by a later run once next_attempt_at passes)
+                       -> dead    (HTTP 404/410, or MAX_ATTEMPTS used up)
+
+Workers claim jobs in short IMMEDIATE transactions with a lease, so any
+number of processes can drain one queue; jobs held by a worker that died
+are reclaimed when its lease runs out, or at once when recover() finds its
+PID gone. complete() and fail() only record the outcome while the worker
+still holds the job, so a worker whose lease ran out and was reclaimed
+cannot overwrite the new holder's state. Each script uses its own queue
+name inside the shared database.
+
+    queue = JobQueue()
+    queue.enqueue('crm', [(filename, url, None) for filename, url in logos.items()], prune=True)
+    for job in queue.drain('crm'):
+        ...
+        queue.complete(job) or queue.fail(job, error)
+"""
+
+import json
+import os
+import random
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from logo_fetch import REPO_ROOT
+
+QUEUE_FILE = REPO_ROOT / ".cache" / "logo-jobs.sqlite3"
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+DEAD = 'dead'
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 60.0  # seconds before the first retry; doubles per attempt
+BACKOFF_MAX = 24 * 3600.0
+LEASE_SECONDS = 600.0
+PERMANENT_STATUSES = {404, 410}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    queue TEXT NOT NULL,
+    key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    payload TEXT,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    lease_until REAL NOT NULL DEFAULT 0,
+    worker TEXT,
+    result TEXT,
+    updated_at REAL NOT NULL DEFAULT 0,
+    UNIQUE (queue, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (queue, state, next_attempt_at);
+"""
+
+
+@dataclass
+class Job:
+    id: int
+    key: str
+    url: str
+    payload: Any
+    attempts: int
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def is_permanent(error) -> bool:
+    """True for failures retrying cannot fix: the URL is gone."""
+    response = getattr(error, 'response', None)
+    return isinstance(error, requests.HTTPError) and response is not None \
+        and response.status_code in PERMANENT_STATUSES
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number `attempts`, with +/-20% jitter."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class JobQueue:
+    """SQLite-backed job queue; one connection per process."""
+
+    def __init__(self, path: Path = QUEUE_FILE, lease: float = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.worker = worker_id()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA busy_timeout=30000')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def enqueue(self, queue: str, jobs: Iterable[Tuple[str, str, Any]], prune: bool = False) -> int:
+        """Add (key, url, payload) jobs; returns how many are new.
+
+        Existing jobs keep their state unless their URL changed, which
+        resets them to pending. With `prune`, jobs not listed are removed.
+        """
+        now = time.time()
+        jobs = list(jobs)
+        with self.transaction():
+            existing = {row[0] for row in self.db.execute('SELECT key FROM jobs WHERE queue = ?', (queue,))}
+            for key, url, payload in jobs:
+                self.db.execute(
+                    """INSERT INTO jobs (queue, key, url, payload, updated_at) VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT (queue, key) DO UPDATE SET
+                           payload = excluded.payload,
+                           state = CASE WHEN url != excluded.url THEN 'pending' ELSE state END,
+                           attempts = CASE WHEN url != excluded.url THEN 0 ELSE attempts END,
+                           next_attempt_at = CASE WHEN url != excluded.url THEN 0 ELSE next_attempt_at END,
+                           url = excluded.url""",
+                    (queue, key, url, json.dumps(payload), now))
+            if prune:
+                keys = [key for key, _, _ in jobs]
+                self.db.execute(f"DELETE FROM jobs WHERE queue = ? AND key NOT IN ({','.join('?' * len(keys))})",
+                                (queue, *keys))
+        return sum(1 for key, _, _ in jobs if key not in existing)
+
+    def transaction(self):
+        return _Transaction(self.db)
+
+    def claim(self, queue: str, limit: int = 1) -> List[Job]:
+        """Atomically lease up to `limit` eligible jobs to this worker."""
+        now = time.time()
+        with self.transaction():
+            rows = self.db.execute(
+                """SELECT id, key, url, payload, attempts FROM jobs
+                   WHERE queue = ? AND (
+                       state = 'pending'
+                       OR (state = 'failed' AND next_attempt_at <= ?)
+                       OR (state = 'running' AND lease_until < ?))
+                   ORDER BY id LIMIT ?""",
+                (queue, now, now, limit)).fetchall()
+            self.db.executemany(
+                "UPDATE jobs SET state = 'running', worker = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                [(self.worker, now + self.lease, now, row[0]) for row in rows])
+        return [Job(row[0], row[1], row[2], json.loads(row[3]) if row[3] else None, row[4]) for row in rows]
+
+    def drain(self, queue: str, batch: int = 1) -> Iterator[Job]:
+        """Claim and yield jobs until none are eligible; releases unfinished claims on exit."""
+        claimed: List[Job] = []
+        try:
+            while True:
+                claimed = self.claim(queue, batch)
+                if not claimed:
+                    return
+                for job in claimed:
+                    yield job
+        finally:
+            self.release(claimed)
+
+    def complete(self, job: Job, result: Any = None) -> bool:
+        """Mark a claimed job done; False (nothing recorded) when this worker no longer holds it."""
+        return self.db.execute(
+            """UPDATE jobs SET state = 'done', attempts = attempts + 1, last_error = NULL, result = ?,
+                   worker = NULL, lease_until = 0, updated_at = ?
+               WHERE id = ? AND state = 'running' AND worker = ?""",
+            (json.dumps(result), time.time(), job.id, self.worker)).rowcount == 1
+
+    def fail(self, job: Job, error, result: Any = None) -> bool:
+        """Record a failure: dead if permanent or out of attempts, else failed with a backoff deadline.
+
+        Like complete(), returns False when this worker no longer holds the job.
+        """
+        attempts = job.attempts + 1
+        dead = is_permanent(error) or attempts >= self.max_attempts
+        now = time.time()
+        return self.db.execute(
+            """UPDATE jobs SET state = ?, attempts = ?, last_error = ?, next_attempt_at = ?, result = ?,
+                   worker = NULL, lease_until = 0, updated_at = ?
+               WHERE id = ? AND state = 'running' AND worker = ?""",
+            (DEAD if dead else FAILED, attempts, str(error)[:500], 0 if dead else now + backoff_seconds(attempts),
+             json.dumps(result), now, job.id, self.worker)).rowcount == 1
+
+    def release(self, jobs: List[Job]):
+        """Hand claimed jobs that were not finished back to the queue."""
+        self.db.executemany(
+            "UPDATE jobs SET state = 'pending', worker = NULL, lease_until = 0 WHERE id = ? AND state = 'running' "
+            "AND worker = ?", [(job.id, self.worker) for job in jobs])
+
+    def recover(self, queue: str) -> int:
+        """Requeue running jobs whose worker process on this host no longer exists."""
+        host = socket.gethostname()
+        stale = []
+        for job_id, worker in self.db.execute(
+                "SELECT id, worker FROM jobs WHERE queue = ? AND state = 'running'", (queue,)).fetchall():
+            worker_host, _, pid = (worker or '').rpartition(':')
+            if worker_host == host and pid.isdigit() and not pid_alive(int(pid)):
+                stale.append((job_id,))
+        self.db.executemany("UPDATE jobs SET state = 'pending', worker = NULL, lease_until = 0 WHERE id = ?", stale)
+        return len(stale)
+
+    def start_run(self, queue: str) -> int:
+        """Resume an unfinished run, or start a refresh run after a finished one.
+
+        A run is unfinished while any job is pending or running (call
+        recover() first, so a crashed run's jobs count). Otherwise the done
+        jobs become pending again; failed jobs keep their backoff and dead
+        ones stay dead. Returns how many jobs were requeued (0 on a resume).
+        """
+        with self.transaction():
+            unfinished = self.db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE queue = ? AND state IN ('pending', 'running')", (queue,)).fetchone()[0]
+            if unfinished:
+                return 0
+            return self.db.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, updated_at = ? WHERE queue = ? AND state = 'done'",
+                (time.time(), queue)).rowcount
+
+    def reset(self, queue: str, states: Iterable[str] = (DONE, FAILED, DEAD)):
+        """Make jobs in `states` pending again (--fresh, --retry-dead)."""
+        states = list(states)
+        self.db.execute(
+            f"""UPDATE jobs SET state = 'pending', attempts = 0, next_attempt_at = 0, last_error = NULL
+                WHERE queue = ? AND state IN ({','.join('?' * len(states))})""", (queue, *states))
+
+    def counts(self, queue: str) -> Dict[str, int]:
+        counts = {state: 0 for state in (PENDING, RUNNING, DONE, FAILED, DEAD)}
+        counts.update(self.db.execute(
+            'SELECT state, COUNT(*) FROM jobs WHERE queue = ? GROUP BY state', (queue,)).fetchall())
+        return counts
+
+    def jobs(self, queue: str, states: Optional[Iterable[str]] = None) -> List[dict]:
+        """Every job of a queue in enqueue order, as dicts with decoded payload and result."""
+        rows = self.db.execute(
+            """SELECT key, url, payload, state, attempts, last_error, next_attempt_at, result
+               FROM jobs WHERE queue = ? ORDER BY id""", (queue,)).fetchall()
+        keys = ('key', 'url', 'payload', 'state', 'attempts', 'last_error', 'next_attempt_at', 'result')
+        jobs = []
+        for row in rows:
+            job = dict(zip(keys, row))
+            job['payload'] = json.loads(job['payload']) if job['payload'] else None
+            job['result'] = json.loads(job['result']) if job['result'] else None
+            if states is None or job['state'] in states:
+                jobs.append(job)
+        return jobs
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent claimers serialize on the write lock."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def add_queue_arguments(parser):
+    parser.add_argument('--fresh', action='store_true',
+                        help="start over: requeue every job, even in an unfinished run and dead ones included")
+    parser.add_argument('--retry-dead', action='store_true', help="requeue failed and dead jobs now")
+    parser.add_argument('--queue-file', type=Path, default=QUEUE_FILE, help="job database (default: %(default)s)")
+
+
+def open_queue(name: str, args) -> JobQueue:
+    """Open the queue and apply crash recovery, resume-or-refresh and --fresh / --retry-dead for `name`."""
+    queue = JobQueue(args.queue_file)
+    recovered = queue.recover(name)
+    if recovered:
+        print(f"Requeued {recovered} job(s) left running by a crashed run")
+    refreshed = queue.start_run(name)
+    if refreshed:
+        print(f"Previous run finished; revalidating its {refreshed} done job(s)")
+    if args.fresh:
+        queue.reset(name)
+    elif args.retry_dead:
+        queue.reset(name, (FAILED, DEAD))
+    return queue
+
+
+def print_queue_summary(queue: JobQueue, name: str):
+    counts = queue.counts(name)
+    print(f"Queue '{name}': {counts[DONE]} done, {counts[FAILED]} waiting to retry, {counts[DEAD]} dead, "
+          f"{counts[PENDING] + counts[RUNNING]} not yet run")
+    now = time.time()
+    for job in queue.jobs(name, (FAILED, DEAD)):
+        when = "dead" if job['state'] == DEAD else f"retry in {max(0, job['next_attempt_at'] - now) / 60:.0f} min"
+        print(f"   - {job['key']} ({when}, {job['attempts']} attempts): {(job['last_error'] or '')[:80]}")
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Post-download optimization stage for the integration logos.
+
+The downloaders store whatever bytes a URL returns under the name the
+script chose, so the extension can lie (a PNG saved as .svg, a WebP as
+.png) and nothing is optimized. This stage, run after any of them:
+
+  - sniffs each file's real format from its magic bytes
+  - minifies SVGs: drops the XML prolog, comments, <metadata>, editor
+    namespaces and attributes (Inkscape, Sodipodi, Sketch, Illustrator,
+    Figma), inter-tag whitespace, and rounds and compacts path data; the
+    result must still parse or the original is kept
+  - transcodes rasters to WebP (or AVIF with --format avif) that fits the
+    logo box (MAX_SIZE, never upscaled), stepping quality down until the
+    file is under --max-bytes; kept only when smaller than the original
+  - renames files whose extension changes and rewrites their
+    /images/integrations/... references in src/ (.ts, .tsx, .json)
+
+Files are processed in a process pool and a before/after byte report is
+printed. Files are written and renamed before any reference is rewritten.
+MANIFEST_FILE remembers the hash of every file already written (or left
+alone because its new name was taken), so re-runs skip them instead of
+re-encoding lossy output, and HTTP cache entries (logo_fetch.CACHE_FILE)
+are pointed at the optimized files so the downloaders keep revalidating
+instead of fetching the originals again.
+
+    python scripts/logo_optimize.py --dry-run
+    python scripts/logo_optimize.py
+    python scripts/logo_optimize.py slack.png --format avif --force
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from logo_fetch import CACHE_FILE, REPO_ROOT, LogoCache
+
+try:
+    from PIL import Image
+except ImportError:  # SVGs are still minified without Pillow
+    Image = None
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+LOGO_DIR = PROJECT_ROOT / "public" / "images" / "integrations"
+SRC_DIR = PROJECT_ROOT / "src"
+PUBLIC_PREFIX = "/images/integrations/"
+MANIFEST_FILE = REPO_ROOT / ".cache" / "logo-optimize.json"
+REFERENCE_SUFFIXES = ('.ts', '.tsx', '.json')
+
+MAX_SIZE = (512, 256)  # logos render at most ~128x40 CSS px; leaves room for 2x-4x screens
+MAX_BYTES = 20 * 1024
+PRECISION = 3
+QUALITIES = {'webp': (90, 80, 70, 60, 50), 'avif': (80, 70, 60, 50, 40)}
+EXTENSIONS = {'svg': '.svg', 'png': '.png', 'jpg': '.jpg', 'gif': '.gif', 'webp': '.webp', 'avif': '.avif',
+              'ico': '.ico'}
+
+# optimize_logo() actions
+MINIFIED = 'minified'
+TRANSCODED = 'transcoded'
+RENAMED = 'renamed'
+KEPT = 'kept'
+SKIPPED = 'skipped'
+
+EDITOR_PREFIXES = ('inkscape', 'sodipodi', 'sketch', 'serif', 'figma', 'i', 'x', 'graph', 'dc', 'cc', 'rdf')
+_PREFIX = '|'.join(EDITOR_PREFIXES)
+EDITOR_ELEMENT = re.compile(rf'<((?:{_PREFIX}):[\w.-]+|metadata)\b[^>]*?(?:/>|>.*?</\1\s*>)', re.S)
+EDITOR_ATTRIBUTE = re.compile(rf'\s(?:xmlns:(?:{_PREFIX})|(?:{_PREFIX}):[\w.-]+|data-name|enable-background)'
+                              r'\s*=\s*(?:"[^"]*"|\'[^\']*\')')
+COMMENT = re.compile(r'<!--.*?-->', re.S)
+PROLOG = re.compile(r'<\?xml[^>]*\?>')
+DOCTYPE = re.compile(r'<!DOCTYPE[^>\[]*(?:\[.*?\])?\s*>', re.S)
+PATH_DATA = re.compile(r'(\s(?:d|points)\s*=\s*)("[^"]*"|\'[^\']*\')')
+PATH_TOKEN = re.compile(r'[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+TAG = re.compile(r'<[^!?][^>]*>')
+
+
+# ---------------------------------------------------------------------------
+# Format sniffing
+# ---------------------------------------------------------------------------
+
+def sniff_format(content: bytes) -> Optional[str]:
+    """The real image format from magic bytes: a key of EXTENSIONS, 'html', or None."""
+    if content.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if content.startswith(b'\xff\xd8\xff'):
+        return 'jpg'
+    if content.startswith((b'GIF87a', b'GIF89a')):
+        return 'gif'
+    if content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+        return 'webp'
+    if content[4:12] in (b'ftypavif', b'ftypavis'):
+        return 'avif'
+    if content.startswith(b'\x00\x00\x01\x00'):
+        return 'ico'
+    head = content[:2048].lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if head.startswith((b'<!doctype html', b'<html')):
+        return 'html'
+    if b'<svg' in head and head.startswith((b'<?xml', b'<svg', b'<!--', b'<!doctype svg')):
+        return 'svg'
+    return None
+
+
+def image_size(content: bytes) -> Optional[Tuple[int, int]]:
+    """Intrinsic (width, height) of a logo: SVG width/height or viewBox, else Pillow; None if unknown."""
+    if sniff_format(content) == 'svg':
+        try:
+            root = ET.fromstring(content)
+        except ET.ParseError:
+            return None
+        sizes = [re.fullmatch(r'\s*([\d.]+)\s*(?:px)?\s*', root.get(name) or '') for name in ('width', 'height')]
+        if all(sizes):
+            return round(float(sizes[0].group(1))), round(float(sizes[1].group(1)))
+        view_box = re.split(r'[\s,]+', (root.get('viewBox') or '').strip())
+        return (round(float(view_box[2])), round(float(view_box[3]))) if len(view_box) == 4 else None
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            return image.size
+    except (OSError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# SVG minification
+# ---------------------------------------------------------------------------
+
+def format_number(value: float, precision: int) -> str:
+    text = f"{round(value, precision):.{precision}f}".rstrip('0').rstrip('.')
+    if text in ('-0', ''):
+        return '0'
+    if text.startswith('0.'):
+        return text[1:]
+    if text.startswith('-0.'):
+        return '-' + text[2:]
+    return text
+
+
+def compact_path(data: str, precision: int = PRECISION) -> str:
+    """Round the numbers in path data / points and drop redundant separators."""
+    tokens = PATH_TOKEN.findall(data)
+    if not tokens or 'a' in data.lower() or ''.join(tokens) != re.sub(r'[\s,]+', '', data):
+        # Arc flags may be packed ("011") and are not safe to tokenize; unknown syntax is left alone
+        return ' '.join(data.split())
+    out: List[str] = []
+    previous = ''
+    for token in tokens:
+        if token.isalpha():
+            out.append(token)
+            previous = token
+            continue
+        number = format_number(float(token), precision)
+        if previous and not previous.isalpha() and not number.startswith('-') \
+                and not (number.startswith('.') and '.' in previous):
+            out.append(' ')
+        out.append(number)
+        previous = number
+    return ''.join(out)
+
+
+def minify_svg(text: str, precision: int = PRECISION) -> str:
+    """Minified SVG markup; raises ValueError when the result does not parse."""
+    svg = COMMENT.sub('', text)
+    svg = PROLOG.sub('', svg)
+    if '<!ENTITY' not in svg:  # Illustrator exports reference entities declared in the DOCTYPE
+        svg = DOCTYPE.sub('', svg)
+    svg = EDITOR_ELEMENT.sub('', svg)
+    svg = EDITOR_ATTRIBUTE.sub('', svg)
+    svg = PATH_DATA.sub(lambda m: f'{m.group(1)}"{compact_path(m.group(2)[1:-1], precision)}"', svg)
+    svg = TAG.sub(lambda m: re.sub(r'\s+', ' ', m.group()).replace(' />', '/>').replace(' >', '>'), svg)
+    if '<text' not in svg:  # whitespace between tspans is significant
+        svg = re.sub(r'>\s+<', '><', svg)
+    svg = svg.strip()
+    # An <img>-loaded SVG without the SVG namespace does not render
+    root = re.match(r'<svg\b[^>]*>', svg)
+    if root and 'xmlns=' not in root.group():
+        svg = '<svg xmlns="http://www.w3.org/2000/svg"' + svg[4:]
+    try:
+        ET.fromstring(svg.encode('utf-8'))
+    except ET.ParseError as e:
+        raise ValueError(f"minified SVG does not parse: {e}")
+    return svg
+
+
+# ---------------------------------------------------------------------------
+# Raster transcoding
+# ---------------------------------------------------------------------------
+
+def encode(image, fmt: str, max_bytes: int) -> bytes:
+    """The highest-fidelity encoding under max_bytes (lossless WebP first), else the smallest tried."""
+    tried = []
+    if fmt == 'webp':
+        buffer = io.BytesIO()
+        image.save(buffer, 'WEBP', lossless=True, method=6)
+        tried.append(buffer.getvalue())
+    for quality in QUALITIES[fmt]:
+        if tried and len(tried[-1]) <= max_bytes:
+            break
+        buffer = io.BytesIO()
+        image.save(buffer, fmt.upper(), quality=quality, **({'method': 6} if fmt == 'webp' else {}))
+        tried.append(buffer.getvalue())
+    fitting = [data for data in tried if len(data) <= max_bytes]
+    return fitting[0] if fitting else min(tried, key=len)
+
+
+def transcode(content: bytes, fmt: str = 'webp', max_size: Tuple[int, int] = MAX_SIZE,
+              max_bytes: int = MAX_BYTES) -> Tuple[bytes, Tuple[int, int]]:
+    """(encoded bytes, (width, height)) for a raster logo."""
+    with Image.open(io.BytesIO(content)) as image:
+        if image.format == 'ICO':
+            image.size = max(image.info.get('sizes') or [image.size])
+        image.load()
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    image.thumbnail(max_size, Image.LANCZOS)
+    # Aim below the original too, so a re-encode never grows a logo that already fits
+    return encode(image, fmt, min(max_bytes, len(content) - 1)), image.size
+
+
+# ---------------------------------------------------------------------------
+# Per-file stage (process-pool task)
+# ---------------------------------------------------------------------------
+
+def optimize_logo(name: str, content: bytes, fmt: str = 'webp', max_size: Tuple[int, int] = MAX_SIZE,
+                  max_bytes: int = MAX_BYTES, precision: int = PRECISION) -> dict:
+    """Optimize one logo's bytes; returns {name, format, action, output_name, content, before, after, note}."""
+    real = sniff_format(content)
+    stem = Path(name).stem
+    result = {'name': name, 'format': real, 'action': KEPT, 'output_name': name, 'content': None,
+              'before': len(content), 'after': len(content), 'note': ''}
+
+    def rename_to(ext):
+        if Path(name).suffix.lower() != ext and not (ext == '.jpg' and Path(name).suffix.lower() == '.jpeg'):
+            result.update(action=RENAMED, output_name=stem + ext, content=content,
+                          note=f"was labelled {Path(name).suffix or 'without extension'}")
+
+    if real is None or real == 'html':
+        result.update(action=SKIPPED, note="not an image" if real else "unrecognized format")
+    elif real == 'svg':
+        rename_to('.svg')
+        try:
+            minified = minify_svg(content.decode('utf-8-sig'), precision).encode('utf-8')
+        except (UnicodeDecodeError, ValueError) as e:
+            result['note'] = '; '.join(filter(None, (result['note'], str(e))))
+        else:
+            if len(minified) < len(content):
+                result.update(action=MINIFIED, content=minified, after=len(minified))
+    elif Image is None:
+        rename_to(EXTENSIONS[real])
+        result['note'] = '; '.join(filter(None, (result['note'], "Pillow not installed")))
+    else:
+        rename_to(EXTENSIONS[real])
+        try:
+            data, size = transcode(content, fmt, max_size, max_bytes)
+        except (OSError, ValueError) as e:
+            result['note'] = '; '.join(filter(None, (result['note'], f"cannot decode: {e}")))
+        else:
+            if len(data) < len(content):
+                result.update(action=TRANSCODED, output_name=stem + EXTENSIONS[fmt], content=data, after=len(data),
+                              note=f"{real} -> {fmt} {size[0]}x{size[1]}")
+    return result
+
+
+# ---------------------------------------------------------------------------
+# References, manifest and HTTP cache
+# ---------------------------------------------------------------------------
+
+def reference_files(roots: Iterable[Path] = (SRC_DIR,)) -> List[Path]:
+    return sorted(path for root in roots for path in Path(root).rglob('*')
+                  if path.suffix in REFERENCE_SUFFIXES and path.is_file() and 'node_modules' not in path.parts)
+
+
+def rewrite_references(renames: Dict[str, str], roots: Iterable[Path] = (SRC_DIR,), prefix: str = PUBLIC_PREFIX,
+                       dry_run: bool = False) -> Dict[Path, int]:
+    """Point `prefix + old` references at `prefix + new` in the source files; returns {file: replacements}."""
+    if not renames:
+        return {}
+    pattern = re.compile('|'.join(re.escape(prefix + old) for old in sorted(renames, key=len, reverse=True))
+                         + r'(?![\w.-])')
+    changed = {}
+    for path in reference_files(roots):
+        text = path.read_text(encoding='utf-8')
+        new_text, count = pattern.subn(lambda m: prefix + renames[m.group()[len(prefix):]], text)
+        if count:
+            changed[path] = count
+            if not dry_run:
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                tmp.write_text(new_text, encoding='utf-8')
+                os.replace(tmp, path)
+    return changed
+
+
+def manifest_key(path: Path) -> str:
+    return Path(os.path.relpath(Path(path).resolve(), REPO_ROOT)).as_posix()
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> Dict[str, str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: Dict[str, str], path: Path = MANIFEST_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def update_http_cache(cache: LogoCache, moved: Dict[Path, Path]):
+    """Repoint cache entries at the optimized files so the next download revalidates instead of refetching."""
+    for url, entry in list(cache.entries.items()):
+        old = Path(entry.get('path', '')).resolve()
+        if old in moved:
+            new = moved[old]
+            cache.put(url, {**entry, 'path': str(new), 'sha256': hashlib.sha256(new.read_bytes()).hexdigest(),
+                            'size': new.stat().st_size})
+
+
+# ---------------------------------------------------------------------------
+# Report and CLI
+# ---------------------------------------------------------------------------
+
+def print_report(results: List[dict]):
+    width = max([len(r['name']) for r in results] + [4])
+    print(f"{'File':<{width}}  {'Format':<6}  {'Action':<10}  {'Before':>9}  {'After':>9}  {'Saved':>6}  Note")
+    for r in results:
+        saved = f"{1 - r['after'] / r['before']:.0%}" if r['before'] else '-'
+        note = '; '.join(filter(None, (f"-> {r['output_name']}" if r['output_name'] != r['name'] else '', r['note'])))
+        print(f"{r['name']:<{width}}  {r['format'] or '?':<6}  {r['action']:<10}  {r['before']:>9,}  "
+              f"{r['after']:>9,}  {saved:>6}  {note}")
+    before = sum(r['before'] for r in results)
+    after = sum(r['after'] for r in results)
+    print(f"\nTotal: {len(results)} files, {before:,} -> {after:,} bytes "
+          f"({(1 - after / before) if before else 0:.0%} saved)")
+
+
+def report_references(references: Dict[Path, int], src: Path, dry_run: bool = False):
+    for path, count in references.items():
+        print(f"{'Would rewrite' if dry_run else 'Rewrote'} {count} reference(s) in {path.relative_to(src.parent)}")
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {value!r}")
+    return width, height
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Minify SVG logos and normalize raster logos to capped WebP/AVIF.")
+    parser.add_argument('files', nargs='*', help="logo file names in --dir (default: every file)")
+    parser.add_argument('--dir', type=Path, default=LOGO_DIR, help="logo directory (default: %(default)s)")
+    parser.add_argument('--src', type=Path, default=SRC_DIR, help="where references are rewritten (default: %(default)s)")
+    parser.add_argument('--format', choices=sorted(QUALITIES), default='webp', help="raster output format")
+    parser.add_argument('--max-size', type=parse_size, default=MAX_SIZE, metavar='WxH',
+                        help=f"raster bounding box (default: {MAX_SIZE[0]}x{MAX_SIZE[1]})")
+    parser.add_argument('--max-bytes', type=int, default=MAX_BYTES, help="raster byte cap (default: %(default)s)")
+    parser.add_argument('--precision', type=int, default=PRECISION, help="SVG path decimals (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument('--force', action='store_true', help="reprocess files the manifest marks as optimized")
+    parser.add_argument('--dry-run', action='store_true', help="report without writing anything")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logo_dir = Path(args.dir)
+    if args.files:
+        paths = [logo_dir / name for name in args.files]
+        missing = [path.name for path in paths if not path.is_file()]
+        if missing:
+            print(f"[ERROR] Not found in {logo_dir}: {', '.join(missing)}")
+            return 1
+    else:
+        paths = sorted(path for path in logo_dir.iterdir() if path.is_file() and not path.name.startswith('.'))
+
+    manifest = load_manifest()
+    contents = {}
+    for path in paths:
+        content = path.read_bytes()
+        if args.force or manifest.get(manifest_key(path)) != hashlib.sha256(content).hexdigest():
+            contents[path.name] = content
+    print(f"{len(paths)} logos in {logo_dir}, {len(paths) - len(contents)} already optimized")
+    if not contents:
+        return 0
+    if Image is None:
+        print("[WARNING] Pillow is not installed; rasters are only renamed: pip install Pillow")
+
+    task = partial(optimize_logo, fmt=args.format, max_size=args.max_size, max_bytes=args.max_bytes,
+                   precision=args.precision)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(task, contents, contents.values()))
+
+    # Two logos must not end up with the same name
+    taken = {path.name for path in logo_dir.iterdir()}
+    for r in results:
+        if r['output_name'] != r['name'] and r['output_name'] in taken:
+            r.update(action=SKIPPED, output_name=r['name'], content=None, after=r['before'],
+                     note=f"{r['output_name']} already exists")
+        taken.add(r['output_name'])
+
+    print()
+    print_report(results)
+    renames = {r['name']: r['output_name'] for r in results if r['output_name'] != r['name']}
+    if args.dry_run:
+        report_references(rewrite_references(renames, (args.src,), dry_run=True), args.src, dry_run=True)
+        print("\nDry run: nothing written")
+        return 0
+
+    # Files first: a reference must never point at a name that does not exist yet
+    moved = {}
+    for r in results:
+        source = logo_dir / r['name']
+        target = logo_dir / r['output_name']
+        if r['content'] is not None:
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(r['content'])
+            os.replace(tmp, target)
+            if target != source:
+                source.unlink()
+            moved[source.resolve()] = target.resolve()
+        manifest.pop(manifest_key(source), None)
+        # A skipped logo is recorded as it is, so the collision is not reported again on every run
+        manifest[manifest_key(target)] = hashlib.sha256(target.read_bytes()).hexdigest()
+    save_manifest(manifest)
+    report_references(rewrite_references(renames, (args.src,)), args.src)
+    if moved and CACHE_FILE.exists():
+        cache = LogoCache()
+        update_http_cache(cache, moved)
+        cache.save()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Pack the integration logos into one SVG sprite and one raster atlas.
+
+The integrations grid shows every integration in src/data/integrations.ts,
+one logo file - and one request - each. This build step packs them into
+two files under public/images/sprites:
+
+  - sprite.<hash>.svg: every SVG logo as a <symbol id="logo-<name>">, with
+    its ids and <style> classes prefixed so logos cannot clash; rendered
+    with <use href="sprite.<hash>.svg#logo-<name>">
+  - atlas.<hash>.webp: the raster logos scaled into an ATLAS_CELL box and
+    shelf-packed, rendered as a CSS background with a position and size
+
+and writes MANIFEST_FILE (src/data/integration-logo-sprites.json) mapping
+each integration ID to its symbol or atlas rectangle plus its intrinsic
+width and height. The manifest records a hash of the inputs; when no logo,
+mapping or setting changed the build is skipped. Output names carry the
+content hash because /images is served immutable for a year.
+
+Formats are sniffed from the bytes (logo_optimize.sniff_format), so a PNG
+saved as .svg still lands in the atlas. Logos that cannot be packed - an
+SVG without a viewBox or size, or a <style> with element selectors that
+would leak into other symbols - are left out and keep loading on their own.
+
+    python scripts/logo_sprites.py
+    python scripts/logo_sprites.py --force --dry-run
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from logo_optimize import EXTENSIONS, PUBLIC_PREFIX, encode, minify_svg, sniff_format
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+PUBLIC_DIR = PROJECT_ROOT / "public"
+INTEGRATIONS_FILE = PROJECT_ROOT / "src" / "data" / "integrations.ts"
+MANIFEST_FILE = PROJECT_ROOT / "src" / "data" / "integration-logo-sprites.json"
+OUTPUT_DIR = PUBLIC_DIR / "images" / "sprites"
+OUTPUT_PREFIX = "/images/sprites/"
+
+BUILD_VERSION = 1  # bump when the output format changes, to force a rebuild
+ATLAS_CELL = (240, 96)  # raster logos show at most 120x48 CSS px
+ATLAS_WIDTH = 1024
+ATLAS_PADDING = 2
+ATLAS_MAX_BYTES = 200 * 1024
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', XLINK_NS)
+
+INTEGRATION = re.compile(r'\n    id: "([^"]+)",.*?\n    logoUrl: "([^"]+)"', re.S)
+ROOT_ONLY_ATTRIBUTES = {'width', 'height', 'x', 'y', 'version', 'viewBox', 'id', 'baseProfile'}
+CSS_RULE = re.compile(r'([^{}]+)\{[^{}]*\}')
+
+
+def load_integrations(path: Path = INTEGRATIONS_FILE) -> List[Tuple[str, str]]:
+    """(id, logoUrl) for every integration in integrations.ts."""
+    text = Path(path).read_text(encoding='utf-8')
+    return INTEGRATION.findall(text[text.index('export const integrations'):])
+
+
+# ---------------------------------------------------------------------------
+# SVG sprite
+# ---------------------------------------------------------------------------
+
+def svg_length(value: Optional[str]) -> Optional[float]:
+    match = re.fullmatch(r'\s*([\d.]+)\s*(px)?\s*', value or '')
+    return float(match.group(1)) if match else None
+
+
+def scope_style(css: str, ids: Dict[str, str], classes: Dict[str, str]) -> Optional[str]:
+    """CSS with prefixed #ids, .classes and url(#id)s; None if a selector is not a class or id."""
+    for selectors in CSS_RULE.findall(css):
+        for selector in selectors.split(','):
+            if not re.fullmatch(r'\s*(?:[.#][\w-]+\s*)+', selector):
+                return None
+    css = re.sub(r'url\(\s*#([\w.-]+)\s*\)', lambda m: f"url(#{ids.get(m.group(1), m.group(1))})", css)
+    css = re.sub(r'\.([\w-]+)', lambda m: '.' + classes.get(m.group(1), m.group(1)), css)
+    return re.sub(r'#([\w-]+)(?=[^{}]*\{)', lambda m: '#' + ids.get(m.group(1), m.group(1)), css)
+
+
+def prefix_references(value: str, ids: Dict[str, str]) -> str:
+    value = re.sub(r'url\(\s*[\'"]?#([\w.-]+)[\'"]?\s*\)', lambda m: f"url(#{ids.get(m.group(1), m.group(1))})", value)
+    if value.startswith('#') and value[1:] in ids:
+        value = '#' + ids[value[1:]]
+    return value
+
+
+def symbol(symbol_id: str, content: bytes) -> Tuple[ET.Element, float, float]:
+    """The logo as a <symbol> with ids and classes prefixed; raises ValueError when it cannot be packed."""
+    text = content.decode('utf-8-sig')
+    try:
+        text = minify_svg(text)
+    except ValueError:
+        pass
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as e:
+        raise ValueError(f"does not parse: {e}")
+
+    view_box = root.get('viewBox')
+    width, height = svg_length(root.get('width')), svg_length(root.get('height'))
+    if view_box:
+        _, _, box_width, box_height = (float(part) for part in re.split(r'[\s,]+', view_box.strip()))
+        width, height = width or box_width, height or box_height
+    elif width and height:
+        view_box = f"0 0 {width:g} {height:g}"
+    else:
+        raise ValueError("no viewBox or width/height")
+
+    elements = list(root.iter())
+    ids = {el.get('id'): f"{symbol_id}-{el.get('id')}" for el in elements if el.get('id')}
+    classes = {name: f"{symbol_id}-{name}" for el in elements for name in (el.get('class') or '').split()}
+    for el in elements:
+        if el.tag == f'{{{SVG_NS}}}style':
+            scoped = scope_style(el.text or '', ids, classes)
+            if scoped is None:
+                raise ValueError("<style> uses element selectors")
+            el.text = scoped
+        for name, value in el.attrib.items():
+            if name == 'id':
+                el.set(name, ids[value])
+            elif name == 'class':
+                el.set(name, ' '.join(classes[part] for part in value.split()))
+            else:
+                el.set(name, prefix_references(value, ids))
+
+    result = ET.Element(f'{{{SVG_NS}}}symbol', {'id': symbol_id, 'viewBox': view_box})
+    for name, value in root.attrib.items():
+        if name not in ROOT_ONLY_ATTRIBUTES:
+            result.set(name, value)
+    result.extend(list(root))
+    return result, width, height
+
+
+def build_sprite(svgs: Dict[str, bytes]) -> Tuple[Optional[bytes], Dict[str, dict], Dict[str, str]]:
+    """(sprite bytes, {name: {symbol, width, height}}, {name: reason skipped}) for {file name: svg bytes}."""
+    sprite = ET.Element(f'{{{SVG_NS}}}svg')
+    entries, skipped = {}, {}
+    for name, content in sorted(svgs.items()):
+        symbol_id = f"logo-{Path(name).stem}"
+        try:
+            element, width, height = symbol(symbol_id, content)
+        except (UnicodeDecodeError, ValueError) as e:
+            skipped[name] = str(e)
+            continue
+        sprite.append(element)
+        entries[name] = {'symbol': symbol_id, 'width': round(width), 'height': round(height)}
+    if not entries:
+        return None, entries, skipped
+    return ET.tostring(sprite, encoding='utf-8', short_empty_elements=True), entries, skipped
+
+
+# ---------------------------------------------------------------------------
+# Raster atlas
+# ---------------------------------------------------------------------------
+
+def shelf_pack(sizes: Dict[str, Tuple[int, int]], width: int = ATLAS_WIDTH,
+               padding: int = ATLAS_PADDING) -> Tuple[Dict[str, Tuple[int, int]], int]:
+    """Tallest-first shelf packing: ({name: (x, y)}, atlas height)."""
+    positions = {}
+    x = y = shelf_height = 0
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        w, h = sizes[name]
+        if x and x + w > width:
+            x, y, shelf_height = 0, y + shelf_height + padding, 0
+        positions[name] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+    return positions, y + shelf_height
+
+
+def build_atlas(rasters: Dict[str, bytes], cell: Tuple[int, int] = ATLAS_CELL
+                ) -> Tuple[Optional[bytes], Tuple[int, int], Dict[str, dict], Dict[str, str]]:
+    """(WebP bytes, (width, height), {name: {x, y, w, h, width, height}}, {name: reason skipped})."""
+    images, intrinsic, skipped = {}, {}, {}
+    for name, content in sorted(rasters.items()):
+        try:
+            with Image.open(io.BytesIO(content)) as image:
+                if image.format == 'ICO':
+                    image.size = max(image.info.get('sizes') or [image.size])
+                image.load()
+                intrinsic[name] = image.size
+                image = image.convert('RGBA')
+        except (OSError, ValueError) as e:
+            skipped[name] = f"cannot decode: {e}"
+            continue
+        image.thumbnail(cell, Image.LANCZOS)
+        images[name] = image
+    if not images:
+        return None, (0, 0), {}, skipped
+
+    positions, height = shelf_pack({name: image.size for name, image in images.items()})
+    width = max(positions[name][0] + images[name].width for name in images)
+    atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    entries = {}
+    for name, image in images.items():
+        x, y = positions[name]
+        atlas.paste(image, (x, y))
+        entries[name] = {'x': x, 'y': y, 'w': image.width, 'h': image.height,
+                         'width': intrinsic[name][0], 'height': intrinsic[name][1]}
+    return encode(atlas, 'webp', ATLAS_MAX_BYTES), (width, height), entries, skipped
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def input_hash(logos: Dict[str, bytes], integrations: List[Tuple[str, str]]) -> str:
+    digest = hashlib.sha256(json.dumps({
+        'version': BUILD_VERSION, 'cell': ATLAS_CELL, 'width': ATLAS_WIDTH, 'padding': ATLAS_PADDING,
+        'integrations': integrations,
+        'logos': {name: hashlib.sha256(content).hexdigest() for name, content in sorted(logos.items())},
+    }, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_current(manifest: dict, digest: str, public_dir: Path = PUBLIC_DIR) -> bool:
+    """True when the manifest was built from these inputs and its files still exist."""
+    urls = [manifest.get('sprite'), (manifest.get('atlas') or {}).get('url')]
+    return manifest.get('inputHash') == digest and all(
+        (public_dir / url.lstrip('/')).exists() for url in urls if url)
+
+
+def write_hashed(output_dir: Path, stem: str, ext: str, content: bytes) -> str:
+    """Write `<stem>.<hash><ext>`, remove older builds of it; returns the public URL."""
+    name = f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    target = output_dir / name
+    if not target.exists():
+        tmp = target.with_name(f".{name}.{os.getpid()}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, target)
+    for old in output_dir.glob(f"{stem}.*{ext}"):
+        if old != target:
+            old.unlink()
+    return OUTPUT_PREFIX + name
+
+
+def build(integrations: List[Tuple[str, str]], logos: Dict[str, bytes], digest: str, output_dir: Path = OUTPUT_DIR,
+          dry_run: bool = False) -> Tuple[dict, Dict[str, str]]:
+    """Pack `logos` ({file name: bytes}) and return (manifest, {file name: reason not packed})."""
+    svgs, rasters, skipped = {}, {}, {}
+    for filename, content in logos.items():
+        real = sniff_format(content)
+        if real == 'svg':
+            svgs[filename] = content
+        elif real in EXTENSIONS:
+            rasters[filename] = content
+        else:
+            skipped[filename] = f"unrecognized format ({real or 'unknown'})"
+
+    sprite, symbols, sprite_skipped = build_sprite(svgs)
+    if Image is None:
+        atlas, atlas_size, cells, atlas_skipped = None, (0, 0), {}, {name: "Pillow not installed" for name in rasters}
+    else:
+        atlas, atlas_size, cells, atlas_skipped = build_atlas(rasters)
+    skipped.update(sprite_skipped)
+    skipped.update(atlas_skipped)
+
+    manifest = {'inputHash': digest, 'sprite': None, 'atlas': None, 'logos': {}}
+    if not dry_run:
+        if sprite:
+            manifest['sprite'] = write_hashed(output_dir, 'sprite', '.svg', sprite)
+        if atlas:
+            manifest['atlas'] = {'url': write_hashed(output_dir, 'atlas', '.webp', atlas),
+                                 'width': atlas_size[0], 'height': atlas_size[1]}
+    for integration_id, logo_url in integrations:
+        name = Path(logo_url).name
+        if name in symbols:
+            manifest['logos'][integration_id] = {'type': 'symbol', **symbols[name]}
+        elif name in cells:
+            manifest['logos'][integration_id] = {'type': 'atlas', **cells[name]}
+    manifest['stats'] = {'symbols': len(symbols), 'atlas': len(cells), 'spriteBytes': len(sprite or b''),
+                         'atlasBytes': len(atlas or b'')}
+    return manifest, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack the integration logos into an SVG sprite and a WebP atlas.")
+    parser.add_argument('--force', action='store_true', help="rebuild even when the inputs are unchanged")
+    parser.add_argument('--dry-run', action='store_true', help="report what would be packed without writing")
+    args = parser.parse_args(argv)
+
+    integrations = load_integrations()
+    logos, missing = {}, []
+    for integration_id, logo_url in integrations:
+        path = PUBLIC_DIR / logo_url.lstrip('/')
+        if not logo_url.startswith(PUBLIC_PREFIX) or not path.is_file():
+            missing.append(f"{integration_id} ({logo_url})")
+        elif path.name not in logos:
+            logos[path.name] = path.read_bytes()
+    digest = input_hash(logos, integrations)
+    print(f"{len(integrations)} integrations, {len(logos)} local logo files")
+    for entry in missing:
+        print(f"   [SKIP] {entry}: not a local integration logo")
+
+    if not args.force and is_current(load_manifest(), digest):
+        print(f"Up to date: {MANIFEST_FILE.relative_to(PROJECT_ROOT)} matches the inputs")
+        return 0
+
+    manifest, skipped = build(integrations, logos, digest, dry_run=args.dry_run)
+    for filename, reason in sorted(skipped.items()):
+        print(f"   [SKIP] {filename}: {reason}")
+    stats = manifest['stats']
+    before = sum(len(content) for name, content in logos.items() if name not in skipped)
+    print(f"Packed {stats['symbols']} SVG logos into the sprite ({stats['spriteBytes']:,} bytes) and "
+          f"{stats['atlas']} raster logos into the atlas ({stats['atlasBytes']:,} bytes)")
+    print(f"{len(logos) - len(skipped)} logo requests -> {bool(stats['symbols']) + bool(stats['atlas'])}, "
+          f"{before:,} -> {stats['spriteBytes'] + stats['atlasBytes']:,} bytes")
+    if args.dry_run:
+        print("Dry run: nothing written")
+        return 0
+
+    MANIFEST_FILE.write_text(json.dumps(manifest, indent=2) + "\n", encoding='utf-8')
+    print(f"Wrote {MANIFEST_FILE.relative_to(PROJECT_ROOT)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
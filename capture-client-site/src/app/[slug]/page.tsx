@@ -1,4 +1,4 @@
-import { getAllNationalPages, getNationalBySlug } from "@/lib/data";
+import { getAllLongtailSlugs, getAllNationalPages, getLongtailBySlug, getNationalBySlug } from "@/lib/data";
 import { notFound } from "next/navigation";
 import type { Metadata } from "next";
 import Image from "next/image";
@@ -8,10 +8,18 @@ import { getIcon } from "@/lib/icon-map";
 import JsonLd from "@/components/seo/JsonLd";
 
 export async function generateStaticParams() {
-  const nationalPages = await getAllNationalPages();
-  return nationalPages.map((page) => ({
-    slug: page.keyword.keyword_slug,
-  }));
+  const [nationalPages, longtailSlugs] = await Promise.all([getAllNationalPages(), getAllLongtailSlugs()]);
+  return [
+    ...nationalPages.map((page) => ({
+      slug: page.keyword.keyword_slug,
+    })),
+    ...longtailSlugs.map((slug) => ({ slug })),
+  ];
+}
+
+// National keyword pages, then the keyword x industry x location long-tail pages
+async function getPageBySlug(slug: string) {
+  return (await getNationalBySlug(slug)) ?? (await getLongtailBySlug(slug));
 }
 
 // Return true 404 for unknown slugs (prevents soft 404s)
@@ -23,7 +31,7 @@ export async function generateMetadata({
   params: Promise<{ slug: string }>;
 }): Promise<Metadata> {
   const resolvedParams = await params;
-  const page = await getNationalBySlug(resolvedParams.slug);
+  const page = await getPageBySlug(resolvedParams.slug);
 
   if (!page) {
     return {
@@ -55,7 +63,7 @@ export async function generateMetadata({
 
 export default async function NationalPage({ params }: { params: Promise<{ slug: string }> }) {
   const resolvedParams = await params;
-  const page = await getNationalBySlug(resolvedParams.slug);
+  const page = await getPageBySlug(resolvedParams.slug);
 
   if (!page) {
     notFound();
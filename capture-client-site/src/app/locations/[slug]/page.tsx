@@ -1,7 +1,6 @@
 import { getAllLocations, getLocationBySlug } from "@/lib/data";
 import { notFound } from "next/navigation";
 import type { Metadata } from "next";
-import Image from "next/image";
 import OptimizedLeadForm from "@/components/forms/OptimizedLeadForm";
 import JsonLd from "@/components/seo/JsonLd";
 import TrustSignals from "@/components/cro/TrustSignals";
@@ -15,6 +14,7 @@ import LocalMarketStats from "@/components/locations/LocalMarketStats";
 import LocalIndustriesServed from "@/components/locations/LocalIndustriesServed";
 import ServiceAreaMap from "@/components/locations/ServiceAreaMap";
 import CompetitorComparison from "@/components/locations/CompetitorComparison";
+import { LocationHeroImage } from "@/components/locations/LocationHeroImage";
 import { Benefit, FAQItem } from "@/types/content";
 import {
   MapPin,
@@ -74,7 +74,11 @@ export async function generateMetadata({
   }
 
   const pageUrl = `${SITE_CONFIG.url}/locations/${location.page_id}`;
-  const ogImageUrl = location.hero?.hero_image?.url || `${SITE_CONFIG.url}/og-image.png`;
+  // Hero images localized by location_images.py are site-relative; Open Graph needs absolute URLs
+  const heroUrl = location.hero?.hero_image?.url;
+  const ogImageUrl = heroUrl
+    ? heroUrl.startsWith("/") ? `${SITE_CONFIG.url}${heroUrl}` : heroUrl
+    : `${SITE_CONFIG.url}/og-image.png`;
 
   return {
     title: location.seo.page_title,
@@ -264,10 +268,8 @@ export default async function LocationPage({ params }: { params: Promise<{ slug:
           {/* Hero image overlay */}
           {location.hero?.hero_image && (
             <div className="absolute inset-0 opacity-15">
-              <Image
-                src={location.hero.hero_image.url}
-                alt={location.hero.hero_image.alt}
-                fill
+              <LocationHeroImage
+                image={location.hero.hero_image}
                 sizes="100vw"
                 className="object-cover mix-blend-overlay"
                 priority
@@ -3,6 +3,7 @@ import {
   getAllServices,
   getAllLocations,
   getAllNationalPages,
+  getAllLongtailSlugs,
   getAllPackages,
   getAllBlogPosts,
 } from "@/lib/data";
@@ -27,10 +28,11 @@ export default async function sitemap(): Promise<MetadataRoute.Sitemap> {
   const currentDate = new Date();
 
   // Fetch all dynamic content
-  const [services, locations, nationalPages, packages, blogPosts] = await Promise.all([
+  const [services, locations, nationalPages, longtailSlugs, packages, blogPosts] = await Promise.all([
     getAllServices(),
     getAllLocations(),
     getAllNationalPages(),
+    getAllLongtailSlugs(),
     getAllPackages(),
     getAllBlogPosts(),
   ]);
@@ -214,6 +216,14 @@ export default async function sitemap(): Promise<MetadataRoute.Sitemap> {
     priority: 0.85, // National keyword pages - important for organic traffic
   }));
 
+  // Long-tail keyword x industry x location pages
+  const longtailPages: MetadataRoute.Sitemap = longtailSlugs.map((slug) => ({
+    url: `${baseUrl}/${slug}`,
+    lastModified: currentDate,
+    changeFrequency: "monthly" as const,
+    priority: 0.6,
+  }));
+
   // Package pages (high conversion)
   const packagePages: MetadataRoute.Sitemap = packages.map((pkg) => ({
     url: `${baseUrl}/pricing/${pkg.package.package_slug}`,
@@ -291,6 +301,7 @@ export default async function sitemap(): Promise<MetadataRoute.Sitemap> {
     ...servicePages, // Service pages
     ...integrationPages, // Integration pages (feature discovery)
     ...nationalSeoPages, // National SEO pages
+    ...longtailPages, // Long-tail keyword pages
     ...packagePages, // Packages
     ...supportPages, // Supporting content
     ...toolsPages, // Tools pages (free calculators)
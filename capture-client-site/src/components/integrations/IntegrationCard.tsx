@@ -5,6 +5,7 @@ import { motion } from "@/lib/motion";
 import Image from "next/image";
 import Link from "next/link";
 import { Star, ArrowRight } from "lucide-react";
+import { IntegrationSpriteLogo, hasSpriteLogo } from "./IntegrationSpriteLogo";
 
 interface Integration {
   id: string;
@@ -76,7 +77,15 @@ export function IntegrationCard({ integration, featured = false }: IntegrationCa
           {/* Logo Container */}
           <div className="relative flex items-center justify-center h-16 sm:h-20 mb-3 sm:mb-4">
             <div className="relative w-full h-full flex items-center justify-center p-2 sm:p-3 rounded-xl bg-white group-hover:bg-slate-50 transition-all duration-300 shadow-sm overflow-hidden">
-              {!imageError && logoSrc ? (
+              {hasSpriteLogo(integration.id) ? (
+                <IntegrationSpriteLogo
+                  integrationId={integration.id}
+                  name={integration.name}
+                  maxWidth={120}
+                  maxHeight={40}
+                  className="filter group-hover:brightness-110 transition-all duration-300"
+                />
+              ) : !imageError && logoSrc ? (
                 <Image
                   src={logoSrc}
                   alt={`${integration.name} logo`}
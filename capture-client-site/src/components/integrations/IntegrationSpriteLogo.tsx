@@ -0,0 +1,95 @@
+import spriteManifest from "@/data/integration-logo-sprites.json";
+import { cn } from "@/lib/utils";
+
+/**
+ * Integration logos packed by scripts/logo_sprites.py: SVG logos are
+ * <symbol>s in one sprite, raster logos are rectangles in one WebP atlas,
+ * so a page of integration cards loads two files instead of one per logo.
+ */
+
+interface SymbolLogo {
+  type: "symbol";
+  symbol: string;
+  width: number;
+  height: number;
+}
+
+interface AtlasLogo {
+  type: "atlas";
+  x: number;
+  y: number;
+  w: number;
+  h: number;
+  width: number;
+  height: number;
+}
+
+interface SpriteManifest {
+  sprite: string | null;
+  atlas: { url: string; width: number; height: number } | null;
+  logos: Record<string, SymbolLogo | AtlasLogo>;
+}
+
+const manifest = spriteManifest as SpriteManifest;
+
+export function hasSpriteLogo(integrationId: string): boolean {
+  const logo = manifest.logos[integrationId];
+  return Boolean(logo && (logo.type === "symbol" ? manifest.sprite : manifest.atlas));
+}
+
+interface IntegrationSpriteLogoProps {
+  integrationId: string;
+  name: string;
+  maxWidth: number;
+  maxHeight: number;
+  className?: string;
+}
+
+export function IntegrationSpriteLogo({
+  integrationId,
+  name,
+  maxWidth,
+  maxHeight,
+  className,
+}: IntegrationSpriteLogoProps) {
+  const logo = manifest.logos[integrationId];
+  if (!logo) return null;
+
+  // Fit the logo's own aspect ratio into the box, like object-contain
+  const [boxWidth, boxHeight] = logo.type === "atlas" ? [logo.w, logo.h] : [logo.width, logo.height];
+  const scale = Math.min(maxWidth / boxWidth, maxHeight / boxHeight);
+  const width = Math.round(boxWidth * scale);
+  const height = Math.round(boxHeight * scale);
+
+  if (logo.type === "symbol") {
+    return (
+      <svg
+        role="img"
+        aria-label={`${name} logo`}
+        width={width}
+        height={height}
+        viewBox={`0 0 ${logo.width} ${logo.height}`}
+        className={className}
+      >
+        <use href={`${manifest.sprite}#${logo.symbol}`} width={logo.width} height={logo.height} />
+      </svg>
+    );
+  }
+
+  const atlas = manifest.atlas!;
+  const cellScale = width / logo.w;
+  return (
+    <div
+      role="img"
+      aria-label={`${name} logo`}
+      className={cn("bg-no-repeat", className)}
+      style={{
+        width,
+        height,
+        backgroundImage: `url(${atlas.url})`,
+        backgroundSize: `${atlas.width * cellScale}px ${atlas.height * cellScale}px`,
+        backgroundPosition: `-${logo.x * cellScale}px -${logo.y * cellScale}px`,
+      }}
+    />
+  );
+}
@@ -0,0 +1,51 @@
+import Image from "next/image";
+import type { LocalImage } from "@/lib/data";
+import { cn } from "@/lib/utils";
+
+/**
+ * A location page's hero photo, filling its positioned parent.
+ *
+ * Photos ingested by location_images.py already come as AVIF and WebP
+ * variants at several widths, so they render as a <picture> the browser
+ * picks from directly instead of going through the next/image optimizer
+ * again; the blur placeholder shows underneath until the photo loads.
+ * Remote photos not ingested yet still use next/image.
+ */
+
+interface LocationHeroImageProps {
+  image: LocalImage;
+  sizes: string;
+  className?: string;
+  priority?: boolean;
+}
+
+export function LocationHeroImage({ image, sizes, className, priority = false }: LocationHeroImageProps) {
+  const placeholder = image.blur_data_url
+    ? { placeholder: "blur" as const, blurDataURL: image.blur_data_url }
+    : {};
+
+  if (!image.srcset?.avif && !image.srcset?.webp) {
+    return (
+      <Image src={image.url} alt={image.alt} fill sizes={sizes} className={className} priority={priority} {...placeholder} />
+    );
+  }
+
+  return (
+    <picture>
+      {image.srcset.avif && <source type="image/avif" srcSet={image.srcset.avif} sizes={sizes} />}
+      {image.srcset.webp && <source type="image/webp" srcSet={image.srcset.webp} sizes={sizes} />}
+      {/* eslint-disable-next-line @next/next/no-img-element -- the variants are already optimized */}
+      <img
+        src={image.url}
+        alt={image.alt}
+        width={image.width}
+        height={image.height}
+        loading={priority ? "eager" : "lazy"}
+        fetchPriority={priority ? "high" : "auto"}
+        decoding="async"
+        className={cn("absolute inset-0 h-full w-full bg-cover bg-center", className)}
+        style={image.blur_data_url ? { backgroundImage: `url(${image.blur_data_url})` } : undefined}
+      />
+    </picture>
+  );
+}
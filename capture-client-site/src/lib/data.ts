@@ -2,6 +2,20 @@ import { promises as fs } from "fs";
 import path from "path";
 
 // Generic types for dynamic JSON data
+
+// Images localized by location_images.py carry their intrinsic size and a
+// blur placeholder; source_url keeps the original remote URL.
+export interface LocalImage {
+  url: string;
+  alt: string;
+  width?: number;
+  height?: number;
+  source_url?: string;
+  srcset?: { avif?: string; webp?: string };
+  blur_data_url?: string;
+  blurhash?: string;
+}
+
 export interface HeroSection {
   headline?: string;
   subheadline?: string;
@@ -11,7 +25,7 @@ export interface HeroSection {
     primary?: { text: string; action: string; type?: string };
     secondary?: { text: string; action: string; type?: string };
   };
-  hero_image?: { url: string; alt: string };
+  hero_image?: LocalImage;
   badge?: string;
   price_display?: { amount: string; period: string; note?: string };
 }
@@ -370,16 +384,53 @@ export async function getLocationBySlug(slug: string): Promise<LocationData | nu
   }
 }
 
+// Generated national pages may store shared sections once in this file and
+// reference them as { "$fragment": "<id>" } (see national_pages.py).
+const NATIONAL_FRAGMENTS_FILE = "_fragments.json";
+
+type NationalFragments = Record<string, unknown>;
+
+async function loadNationalFragments(nationalDir: string): Promise<NationalFragments> {
+  try {
+    const content = await fs.readFile(path.join(nationalDir, NATIONAL_FRAGMENTS_FILE), "utf-8");
+    return JSON.parse(content) as NationalFragments;
+  } catch {
+    return {};
+  }
+}
+
+function resolveFragments(value: unknown, fragments: NationalFragments): unknown {
+  if (Array.isArray(value)) {
+    return value.map((item) => resolveFragments(item, fragments));
+  }
+  if (value && typeof value === "object") {
+    const ref = (value as { $fragment?: unknown }).$fragment;
+    if (typeof ref === "string") {
+      if (!(ref in fragments)) {
+        throw new Error(`Unknown national page fragment: ${ref}`);
+      }
+      return resolveFragments(fragments[ref], fragments);
+    }
+    return Object.fromEntries(
+      Object.entries(value).map(([key, item]) => [key, resolveFragments(item, fragments)])
+    );
+  }
+  return value;
+}
+
 export async function getAllNationalPages(): Promise<NationalData[]> {
   const nationalDir = path.join(dataDir, "national");
-  const files = await fs.readdir(nationalDir);
+  const [files, fragments] = await Promise.all([
+    fs.readdir(nationalDir),
+    loadNationalFragments(nationalDir),
+  ]);
 
   const pages = await Promise.all(
     files
-      .filter((file) => file.endsWith(".json"))
+      .filter((file) => file.endsWith(".json") && !file.startsWith("_"))
       .map(async (file) => {
         const content = await fs.readFile(path.join(nationalDir, file), "utf-8");
-        return JSON.parse(content) as NationalData;
+        return resolveFragments(JSON.parse(content), fragments) as NationalData;
       })
   );
 
@@ -387,13 +438,73 @@ export async function getAllNationalPages(): Promise<NationalData[]> {
 }
 
 export async function getNationalBySlug(slug: string): Promise<NationalData | null> {
+  if (slug.startsWith("_")) {
+    return null;
+  }
   try {
-    const filePath = path.join(dataDir, "national", `${slug}.json`);
-    const content = await fs.readFile(filePath, "utf-8");
-    return JSON.parse(content) as NationalData;
+    const nationalDir = path.join(dataDir, "national");
+    const [content, fragments] = await Promise.all([
+      fs.readFile(path.join(nationalDir, `${slug}.json`), "utf-8"),
+      loadNationalFragments(nationalDir),
+    ]);
+    return resolveFragments(JSON.parse(content), fragments) as NationalData;
+  } catch {
+    return null;
+  }
+}
+
+// Long-tail keyword x industry x location pages written by
+// generate_longtail_pages.py: longtail/<national page id>/<page id>.json, one
+// shard per national keyword, with their own _fragments.json. They render
+// through the [slug] route like the national pages.
+const LONGTAIL_DIR = "longtail";
+
+async function getLongtailShards(longtailDir: string): Promise<string[]> {
+  try {
+    const entries = await fs.readdir(longtailDir, { withFileTypes: true });
+    return entries
+      .filter((entry) => entry.isDirectory() && !entry.name.startsWith("."))
+      .map((entry) => entry.name);
   } catch {
+    return [];
+  }
+}
+
+export async function getAllLongtailSlugs(): Promise<string[]> {
+  const longtailDir = path.join(dataDir, LONGTAIL_DIR);
+  const shards = await getLongtailShards(longtailDir);
+  const slugs = await Promise.all(
+    shards.map(async (shard) => {
+      const files = await fs.readdir(path.join(longtailDir, shard));
+      return files
+        .filter((file) => file.endsWith(".json") && !file.startsWith("_"))
+        .map((file) => file.slice(0, -".json".length));
+    })
+  );
+  return slugs.flat();
+}
+
+export async function getLongtailBySlug(slug: string): Promise<NationalData | null> {
+  if (slug.startsWith("_") || slug.startsWith(".") || slug.includes("/")) {
     return null;
   }
+  const longtailDir = path.join(dataDir, LONGTAIL_DIR);
+  // A page id starts with its shard's national page id; try the longest match first
+  const shards = (await getLongtailShards(longtailDir))
+    .filter((shard) => slug.startsWith(`${shard}-`))
+    .sort((a, b) => b.length - a.length);
+  for (const shard of shards) {
+    try {
+      const [content, fragments] = await Promise.all([
+        fs.readFile(path.join(longtailDir, shard, `${slug}.json`), "utf-8"),
+        loadNationalFragments(longtailDir),
+      ]);
+      return resolveFragments(JSON.parse(content), fragments) as NationalData;
+    } catch {
+      continue;
+    }
+  }
+  return null;
 }
 
 export async function getAllPackages(): Promise<PackageData[]> {
@@ -1,11 +1,28 @@
-import requests
+import argparse
 import os
+import sys
 from pathlib import Path
 
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent / "capture-client-site" / "scripts"))
+from logo_fetch import LogoCache, LogoFetcher  # noqa: E402
+from logo_jobs import DEAD, DONE, FAILED, add_queue_arguments, open_queue, print_queue_summary  # noqa: E402
+from logo_optimize import EXTENSIONS, sniff_format  # noqa: E402
+
+QUEUE_NAME = "crm-logos"
+
+parser = argparse.ArgumentParser(description="Download the CRM integration logos (resumes an interrupted run).")
+add_queue_arguments(parser)
+args = parser.parse_args()
+
 # Output directory
-output_dir = r"C:\Users\eaqqa\capture-client-website-seo\capture-client-site\public\images\integrations"
+output_dir = str(Path(__file__).parent / "capture-client-site" / "public" / "images" / "integrations")
 os.makedirs(output_dir, exist_ok=True)
 
+# Logos already on disk are revalidated (ETag / Last-Modified), not re-downloaded
+fetcher = LogoFetcher(workers=1, cache=LogoCache())
+
 # CRM Logo URLs from various reliable sources
 logos = {
     # HubSpot - Simple Icons CDN
@@ -33,59 +50,45 @@ logos = {
     "close.svg": "https://freebiesupply.com/wp-content/uploads/2023/11/close-logo.png",
 }
 
+def check_image(filename, content, content_type):
+    """Refuse HTML; warn when the content does not match the file extension"""
+    real = sniff_format(content)
+    if real == 'html':
+        return "Received HTML instead of image"
+
+    if real is None:
+        print("   WARNING: Content may not be a valid image")
+    elif Path(filename).suffix.lower() not in (EXTENSIONS[real], '.jpeg' if real == 'jpg' else None):
+        print(f"   WARNING: {filename} is really {real.upper()}; scripts/logo_optimize.py will rename it")
+    else:
+        print(f"   Valid {real.upper()} detected")
+    return None
+
 def download_logo(url, filename):
-    """Download a logo from URL and save to integrations directory"""
+    """Download a logo from URL and save to integrations directory; returns the error, if any"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-
         print(f"\nDownloading {filename}...")
         print(f"   URL: {url}")
 
-        response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
-        response.raise_for_status()
+        result = fetcher.fetch_to_file(url, os.path.join(output_dir, filename),
+                                       lambda content, content_type: check_image(filename, content, content_type))
 
-        content = response.content
-
-        # Verify it's not HTML
-        if content.startswith(b'<!DOCTYPE') or content.startswith(b'<html') or content.startswith(b'<HTML'):
-            print(f"   ERROR: Received HTML instead of image")
-            return False
-
-        # Check if it looks like valid image data
-        valid_image = False
-        file_type = "UNKNOWN"
-
-        if filename.endswith('.svg'):
-            valid_image = b'<svg' in content or b'<?xml' in content
-            file_type = "SVG"
-        elif filename.endswith('.png'):
-            valid_image = content.startswith(b'\x89PNG')
-            file_type = "PNG"
-        elif filename.endswith('.jpg') or filename.endswith('.jpeg'):
-            valid_image = content.startswith(b'\xff\xd8\xff')
-            file_type = "JPG"
-
-        if valid_image:
-            print(f"   Valid {file_type} detected")
+        file_size = result.size / 1024  # KB
+        if result.written:
+            print(f"   SUCCESS: Saved {file_size:.1f} KB to {filename}")
         else:
-            print(f"   WARNING: Content may not be valid {file_type}")
-
-        filepath = os.path.join(output_dir, filename)
-        with open(filepath, 'wb') as f:
-            f.write(content)
-
-        file_size = len(content) / 1024  # KB
-        print(f"   SUCCESS: Saved {file_size:.1f} KB to {filename}")
-        return True
+            print(f"   SUCCESS: {filename} {result.status} ({file_size:.1f} KB), existing file kept")
+        return None
 
+    except ValueError as e:
+        print(f"   ERROR: {e}")
+        return e
     except requests.exceptions.RequestException as e:
         print(f"   ERROR: {str(e)}")
-        return False
+        return e
     except Exception as e:
         print(f"   ERROR: Unexpected error - {str(e)}")
-        return False
+        return e
 
 # Download all CRM logos
 print("=" * 70)
@@ -94,14 +97,21 @@ print("=" * 70)
 print(f"Output directory: {output_dir}")
 print(f"Total logos to download: {len(logos)}\n")
 
-success_count = 0
-failed_logos = []
-
-for filename, url in logos.items():
-    if download_logo(url, filename):
-        success_count += 1
+# Progress is kept in the job queue: an interrupted run resumes, a finished one is revalidated
+queue = open_queue(QUEUE_NAME, args)
+queue.enqueue(QUEUE_NAME, [(filename, url, None) for filename, url in logos.items()], prune=True)
+for job in queue.drain(QUEUE_NAME):
+    error = download_logo(job.url, job.key)
+    if error is None:
+        queue.complete(job)
     else:
-        failed_logos.append((filename, url))
+        queue.fail(job, error)
+
+fetcher.close()
+
+jobs = queue.jobs(QUEUE_NAME)
+success_count = sum(1 for job in jobs if job['state'] == DONE)
+failed_logos = [(job['key'], job['url']) for job in jobs if job['state'] in (FAILED, DEAD)]
 
 # Summary
 print("\n" + "=" * 70)
@@ -115,4 +125,6 @@ if failed_logos:
     for filename, url in failed_logos:
         print(f"   - {filename}")
 
+print_queue_summary(queue, QUEUE_NAME)
+
 print("\n" + "=" * 70)
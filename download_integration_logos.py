@@ -1,63 +1,72 @@
-import requests
+import argparse
 import os
+import sys
+from pathlib import Path
 from urllib.parse import urljoin
-import time
 
-output_dir = r"C:\Users\eaqqa\capture-client-website-seo\capture-client-site\public\images\integrations"
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent / "capture-client-site" / "scripts"))
+from logo_fetch import LogoCache, LogoFetcher  # noqa: E402
+from logo_jobs import DONE, add_queue_arguments, open_queue, print_queue_summary  # noqa: E402
+
+QUEUE_NAME = "scraped-integration-logos"
+
+parser = argparse.ArgumentParser(description="Download the scraped integration logos (resumes an interrupted run).")
+add_queue_arguments(parser)
+args = parser.parse_args()
+
+output_dir = str(Path(__file__).parent / "capture-client-site" / "public" / "images" / "integrations")
 
 # Ensure output directory exists
 os.makedirs(output_dir, exist_ok=True)
 
+# One request a second; logos already on disk are revalidated, not re-downloaded
+fetcher = LogoFetcher(workers=1, rate=1, cache=LogoCache())
+
+# Check for common image signatures
+image_signatures = [
+    b'\x89PNG',  # PNG
+    b'\xff\xd8\xff',  # JPEG
+    b'GIF89a', b'GIF87a',  # GIF
+    b'<svg',  # SVG
+    b'<?xml',  # SVG (XML variant)
+    b'RIFF',  # WEBP
+]
+
+def check_image(content, content_type):
+    """Validate it's an actual image; returns the reason when it is not"""
+    if content.startswith(b'<!DOCTYPE') or content.startswith(b'<html') or content.startswith(b'<HTML'):
+        return "Got HTML instead of image"
+
+    is_image = any(content.startswith(sig) for sig in image_signatures) or b'<svg' in content[:500]
+    if not is_image:
+        return (f"Content doesn't appear to be an image (first 20 bytes: {content[:20]}, "
+                f"content type: {content_type or 'unknown'})")
+    return None
+
 def download_logo(url, filename, base_url=None):
-    """Download logo from URL and save to integrations directory"""
+    """Download logo from URL and save to integrations directory; returns the error, if any"""
     # Handle relative URLs
     if base_url and not url.startswith('http'):
         url = urljoin(base_url, url)
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-    }
     try:
-        response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
-        response.raise_for_status()
-        content = response.content
-
-        # Validate it's an actual image
-        if content.startswith(b'<!DOCTYPE') or content.startswith(b'<html') or content.startswith(b'<HTML'):
-            print(f"[ERROR] {filename} - Got HTML instead of image from {url}")
-            return False
-
-        # Check for common image signatures
-        image_signatures = [
-            b'\x89PNG',  # PNG
-            b'\xff\xd8\xff',  # JPEG
-            b'GIF89a', b'GIF87a',  # GIF
-            b'<svg',  # SVG
-            b'<?xml',  # SVG (XML variant)
-            b'RIFF',  # WEBP
-        ]
-
-        is_image = any(content.startswith(sig) for sig in image_signatures) or b'<svg' in content[:500]
-        if not is_image:
-            print(f"[ERROR] {filename} - Content doesn't appear to be an image (first 20 bytes: {content[:20]})")
-            print(f"   Content type: {response.headers.get('content-type', 'unknown')}")
-            return False
-
-        filepath = os.path.join(output_dir, filename)
-        with open(filepath, 'wb') as f:
-            f.write(content)
-
-        file_size = len(content) / 1024  # KB
-        print(f"[SUCCESS] {filename} - {file_size:.1f} KB downloaded")
-        return True
+        result = fetcher.fetch_to_file(url, os.path.join(output_dir, filename), check_image)
+        if result.written:
+            print(f"[SUCCESS] {filename} - {result.size / 1024:.1f} KB downloaded")
+        else:
+            print(f"[SUCCESS] {filename} - {result.status}, existing file kept")
+        return None
+    except ValueError as e:
+        print(f"[ERROR] {filename} - {e} from {url}")
+        return e
     except requests.exceptions.RequestException as e:
         print(f"[ERROR] {filename} - {e}")
-        return False
+        return e
     except Exception as e:
         print(f"[ERROR] {filename} - Unexpected error: {e}")
-        return False
+        return e
 
 # Logo mappings with official URLs found via web scraping
 logos_to_download = {
@@ -100,24 +109,31 @@ print("INTEGRATION LOGO DOWNLOADER")
 print("=" * 80)
 print(f"Output directory: {output_dir}\n")
 
-successful = []
-failed = []
+# Progress is kept in the job queue: an interrupted run resumes, a finished one is revalidated
+queue = open_queue(QUEUE_NAME, args)
+queue.enqueue(QUEUE_NAME, [(filename, urljoin(base_url, url) if base_url else url, None)
+                           for filename, (url, base_url) in logos_to_download.items()], prune=True)
 
-for filename, (url, base_url) in logos_to_download.items():
-    print(f"\nDownloading: {filename}")
-    print(f"From: {url}")
+for job in queue.drain(QUEUE_NAME):
+    print(f"\nDownloading: {job.key}")
+    print(f"From: {job.url}")
 
-    if download_logo(url, filename, base_url):
-        successful.append(filename)
+    error = download_logo(job.url, job.key)
+    if error is None:
+        queue.complete(job)
     else:
-        failed.append(filename)
+        queue.fail(job, error)
+
+fetcher.close()
 
-    # Be respectful with rate limiting
-    time.sleep(1)
+jobs = queue.jobs(QUEUE_NAME)
+successful = [job['key'] for job in jobs if job['state'] == DONE]
+failed = [job['key'] for job in jobs if job['state'] != DONE]
 
 print("\n" + "=" * 80)
 print("DOWNLOAD SUMMARY")
 print("=" * 80)
+print_queue_summary(queue, QUEUE_NAME)
 print(f"[SUCCESS] Automatic downloads successful: {len(successful)}/{len(logos_to_download)}")
 print(f"[FAILED] Automatic downloads failed: {len(failed)}/{len(logos_to_download)}")
 print(f"[MANUAL] Manual downloads needed: {len(manual_downloads_needed)}")
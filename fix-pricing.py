@@ -2,18 +2,207 @@
 """
 Fix pricing inconsistencies across all data files.
 Replace $999 -> $97, $1,997 -> $797, "Custom" -> "$2,997"
+
+By default each file is parsed once and FIELD_RULES are applied to the
+JSON tree through path selectors, so only the targeted string values change
+(each is spliced back in place; the rest of the file keeps its formatting)
+and only files that actually changed are written back - as one batch_edit
+transaction, so a failure leaves every file untouched. --text runs the
+original whole-file string replacement instead.
+
+Selectors are dot-separated keys with JSONPath-like wildcards:
+  packages[*].price   "price" of every item in the "packages" list
+  faq[2].answer       a single list item
+  *.price             "price" of any direct child object
+  **.price            "price" at any depth
+  **                  every value in the file
 """
 
+import argparse
 import json
+import operator
 import os
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache, partial, reduce
 from pathlib import Path
 
+import batch_edit
+import location_data
+
 # Correct pricing
 CORRECT_PRICES = {
     "$999": "$97",
     "$1,997": "$797",
 }
 
+
+@dataclass(frozen=True)
+class FieldRule:
+    """Rewrite string values selected by `selector`.
+
+    With `exact`, a value equal to `old` becomes `new`; otherwise every
+    occurrence of the price `old` inside the value is replaced, but not
+    where it is only the start of a longer amount ("$999" in "$9,999.50").
+    """
+    selector: str
+    old: str
+    new: str
+    exact: bool = False
+
+    def apply(self, value):
+        """Return (new value, number of replacements)."""
+        if not isinstance(value, str):
+            return value, 0
+        if self.exact:
+            return (self.new, 1) if value == self.old else (value, 0)
+        return amount_pattern(self.old).subn(lambda m: self.new, value)
+
+
+FIELD_RULES = [
+    *(FieldRule("**", old, new) for old, new in CORRECT_PRICES.items()),
+    # "Custom" pricing for Enterprise
+    FieldRule("**.price", "Custom", "$2,997", exact=True),
+    FieldRule("**.period", "pricing", "per month", exact=True),
+]
+
+
+@lru_cache(maxsize=None)
+def amount_pattern(amount):
+    return re.compile(rf"(?<![\w$,]){re.escape(amount)}(?![\d]|[,.]\d)")
+
+
+@lru_cache(maxsize=None)
+def parse_selector(selector):
+    """Turn "packages[*].price" into ("packages", "[*]", "price")."""
+    tokens = []
+    for part in selector.split("."):
+        match = re.fullmatch(r"(\*\*|\*|[^\[\]*]+)?((?:\[(?:\*|\d+)\])*)", part)
+        if not match or not part:
+            raise ValueError(f"invalid selector: {selector!r}")
+        if match.group(1):
+            tokens.append(match.group(1))
+        for index in re.findall(r"\[(\*|\d+)\]", match.group(2)):
+            tokens.append("[*]" if index == "*" else int(index))
+    return tuple(tokens)
+
+
+def children(node, token):
+    """Yield (key, child) for one selector step."""
+    if token in ("*", "**"):
+        if isinstance(node, dict):
+            yield from node.items()
+        elif isinstance(node, list) and token == "**":
+            yield from enumerate(node)
+    elif token == "[*]":
+        if isinstance(node, list):
+            yield from enumerate(node)
+    elif isinstance(token, int):
+        if isinstance(node, list) and -len(node) <= token < len(node):
+            yield token, node[token]
+    elif isinstance(node, dict) and token in node:
+        yield token, node[token]
+
+
+def select(node, tokens, path=()):
+    """Yield (path, container, key) for every value `tokens` selects."""
+    token, rest = tokens[0], tokens[1:]
+    if token == "**":
+        if rest:
+            yield from select(node, rest, path)
+        for key, child in children(node, token):
+            if not rest:
+                yield path + (key,), node, key
+            yield from select(child, tokens, path + (key,))
+        return
+    for key, child in children(node, token):
+        if rest:
+            yield from select(child, rest, path + (key,))
+        else:
+            yield path + (key,), node, key
+
+
+def format_path(path):
+    return "".join(f"[{key}]" if isinstance(key, int) else f".{key}" for key in path).lstrip(".")
+
+
+def apply_rules(data, rules):
+    """Apply every rule to a parsed file in place; returns the list of changes."""
+    changes = []
+    for rule in rules:
+        for path, container, key in list(select(data, parse_selector(rule.selector))):
+            old_value = container[key]
+            new_value, count = rule.apply(old_value)
+            if count:
+                container[key] = new_value
+                changes.append((format_path(path), rule.selector, old_value, new_value))
+    return changes
+
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+DECODER = json.JSONDecoder()
+
+
+def value_spans(text, pos=0, path=(), spans=None):
+    """Map the path of every value in a JSON document to its (start, end) in `text`.
+
+    Returns (spans, end of the value at `pos`).
+    """
+    spans = {} if spans is None else spans
+    pos = WHITESPACE.match(text, pos).end()
+    start = pos
+    if text[pos] == "{":
+        pos = WHITESPACE.match(text, pos + 1).end()
+        while text[pos] != "}":
+            key, pos = json.decoder.scanstring(text, pos + 1)
+            pos = WHITESPACE.match(text, pos).end() + 1  # the ':'
+            _, pos = value_spans(text, pos, path + (key,), spans)
+            pos = WHITESPACE.match(text, pos).end()
+            if text[pos] == ",":
+                pos = WHITESPACE.match(text, pos + 1).end()
+        pos += 1
+    elif text[pos] == "[":
+        pos = WHITESPACE.match(text, pos + 1).end()
+        index = 0
+        while text[pos] != "]":
+            _, pos = value_spans(text, pos, path + (index,), spans)
+            pos = WHITESPACE.match(text, pos).end()
+            if text[pos] == ",":
+                pos = WHITESPACE.match(text, pos + 1).end()
+            index += 1
+        pos += 1
+    else:
+        _, pos = DECODER.raw_decode(text, pos)
+    spans[path] = (start, pos)
+    return spans, pos
+
+
+def rewrite_text(file_path, text, rules=FIELD_RULES):
+    """batch_edit edit function; the detail is the list of field changes.
+
+    Each changed value is spliced in at its original position, so the rest
+    of the file keeps its formatting byte for byte.
+    """
+    data = json.loads(text)
+    changes = apply_rules(data, rules)
+    if not changes:
+        return None, changes
+    spans, _ = value_spans(text)
+    new_text = text
+    # The rules only rewrite strings, so compare each string in the text with its new value
+    for path, (start, end) in sorted(spans.items(), key=lambda item: item[1][0], reverse=True):
+        if text[start] != '"':
+            continue
+        new_value = reduce(operator.getitem, path, data)
+        if new_value != json.loads(text[start:end]):
+            new_text = new_text[:start] + json.dumps(new_value, ensure_ascii=False) + new_text[end:]
+    if json.loads(new_text) != data:
+        raise ValueError(f"splicing the new values into {file_path} did not reproduce the edited data")
+    return new_text, changes
+
+
 def fix_pricing_in_text(text):
     """Replace all price occurrences in text"""
     result = text
@@ -57,9 +246,8 @@ def process_file(file_path):
     except Exception as e:
         return False, str(e)
 
-def main():
-    data_dir = Path("C:/Users/eaqqa/capture-client-website-seo/capture-client-site/src/data")
-
+def text_main(data_dir):
+    """The original whole-file string replacement (--text)."""
     fixed_files = []
     error_files = []
     skipped_files = []
@@ -98,6 +286,69 @@ def main():
 
     return len(fixed_files), len(error_files)
 
+def field_main(data_dir, rules=FIELD_RULES, workers=None, dry_run=False, timings=False):
+    """Selector-based rewrite of every JSON file under data_dir, as one transaction."""
+    files = [path for path in sorted(data_dir.rglob("*.json")) if not batch_edit.is_staging_path(path)]
+    try:
+        result = batch_edit.run_batch(files, partial(rewrite_text, rules=rules), workers=workers, dry_run=dry_run)
+    except batch_edit.BatchEditError as e:
+        print(f"[ERROR] {e}")
+        return 0, 1
+
+    fixed_files = [(edit.path, edit.detail) for edit in result.changed]
+    per_rule = Counter()
+
+    # Report
+    print(f"\n{'='*60}")
+    print("PRICING FIX REPORT" + (" (DRY RUN)" if dry_run else ""))
+    print(f"{'='*60}\n")
+
+    print(f"[OK] Files {'to fix' if dry_run else 'Fixed'}: {len(fixed_files)}")
+    for path, changes in fixed_files:
+        print(f"   - {path.relative_to(data_dir)}")
+        for field, selector, old_value, new_value in changes:
+            per_rule[selector, field.rsplit(".", 1)[-1]] += 1
+            print(f"       {field}: {shorten(old_value)} -> {shorten(new_value)}")
+
+    print(f"\n[SKIP] Files Skipped (no pricing issues): {len(result.edits) - len(fixed_files)}")
+
+    if per_rule:
+        print("\nChanges per rule and field:")
+        for (selector, field), count in sorted(per_rule.items()):
+            print(f"   {selector:<14} {field:<24} {count}")
+
+    batch_edit.print_report(result, data_dir, diff=dry_run, timings=timings)
+
+    print(f"\n{'='*60}")
+    print(f"SUMMARY: {len(fixed_files)} files {'would be ' if dry_run else ''}corrected successfully")
+    print(f"{'='*60}\n")
+
+    return len(fixed_files), 0
+
+def shorten(value, width=70):
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fix pricing inconsistencies across the site data files.")
+    parser.add_argument("--data-dir", type=Path, default=location_data.DATA_DIR,
+                        help="directory searched for *.json (default: %(default)s)")
+    parser.add_argument("--text", action="store_true",
+                        help="use the original whole-file string replacement")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: automatic; 1 runs inline)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report the field changes and diffs without writing files")
+    parser.add_argument("--timings", action="store_true",
+                        help="print how long each file took")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.text:
+        return text_main(args.data_dir)
+    return field_main(args.data_dir, workers=args.workers, dry_run=args.dry_run, timings=args.timings)
+
 if __name__ == "__main__":
     fixed, errors = main()
-    exit(0 if errors == 0 else 1)
+    sys.exit(0 if errors == 0 else 1)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Generate long-tail keyword x industry x location pages.
+
+Crosses every national page spec (national-page-specs.json) with each of
+its industries and every local area in target-areas.json (optionally their
+suburbs too), and renders the combinations through the national_pages build
+engine. Combinations are produced lazily, so the full product never sits in
+memory; pages go into one subdirectory per national keyword of
+src/data/longtail, where the site serves each at /<page id>, and a
+checkpoint lets an interrupted run pick up where it stopped.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from itertools import islice
+from pathlib import Path
+
+import national_pages
+
+DEFAULT_AREAS_FILE = national_pages.BASE_DIR / "target-areas.json"
+# Read by capture-client-site/src/lib/data.ts (getLongtailBySlug) for the [slug] route
+DEFAULT_OUTPUT_ROOT = national_pages.BASE_DIR / "capture-client-site" / "src" / "data" / "longtail"
+CHECKPOINT_NAME = "checkpoint.json"
+PAGE_TYPE = "longtail-seo"
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def load_areas(areas_file=DEFAULT_AREAS_FILE):
+    with open(areas_file, "r", encoding="utf-8") as f:
+        return json.load(f)["local_areas"]
+
+
+def iter_locations(areas, include_suburbs=False, states=None):
+    """Yield {"city", "state", "state_full", "metro"} for each target location.
+
+    Areas come first so a city that is also listed as another area's suburb
+    keeps its own metro; each city/state pair is yielded once.
+    """
+    areas = [area for area in areas if not states or area["state"] in states]
+    seen = set()
+    candidates = [(area["city"], area) for area in areas]
+    if include_suburbs:
+        candidates += [(suburb, area) for area in areas for suburb in area.get("suburbs", [])]
+    for city, area in candidates:
+        key = (slugify(city), area["state"])
+        if key in seen:
+            continue
+        seen.add(key)
+        yield {"city": city, "state": area["state"], "state_full": area["state_full"], "metro": area["city"]}
+
+
+def derive_spec(base, industry, location):
+    """Build a page spec for one keyword/industry/location combination."""
+    keyword = base["keyword"]
+    place = f"{location['city']}, {location['state']}"
+    near = "" if location["metro"] == location["city"] else f" and the greater {location['metro']} area"
+    return {
+        "id": f"{base['id']}-{slugify(industry)}-{slugify(location['city'])}-{location['state'].lower()}",
+        "shard": base["id"],
+        "page_type": PAGE_TYPE,
+        "title": f"{keyword} for {industry} in {place} | Capture Client",
+        "h1": f"{keyword} for {industry} in {place}",
+        "keyword": f"{keyword} for {industry} in {location['city']}",
+        "meta": (f"Looking for {keyword.lower()} for {industry.lower()} in {location['city']}? Capture Client helps "
+                 f"{industry.lower()} businesses automate calls, generate leads, and grow revenue. Free consultation!"),
+        "headline": f"{keyword} for {industry} Businesses in {place}",
+        "sub": base["sub"],
+        "intro": (f"{industry} businesses in {location['city']}{near} use Capture Client for "
+                  f"{keyword.lower()}. {base['intro']}"),
+        "industries": [industry] + [other for other in base["industries"] if other != industry],
+        "images": base.get("images", "voice_ai"),
+    }
+
+
+def iter_specs(base_specs, locations):
+    """Lazily yield derived specs in a fixed order (keyword, industry, location)."""
+    for base in base_specs:
+        for industry in base["industries"]:
+            for location in locations():
+                yield derive_spec(base, industry, location)
+
+
+def count_specs(base_specs, locations):
+    per_keyword = sum(1 for _ in locations())
+    return sum(len(base["industries"]) for base in base_specs) * per_keyword
+
+
+def input_fingerprint(*parts):
+    """Identifies the combination sequence a checkpoint belongs to."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_checkpoint(path, fingerprint):
+    """Return (completed, changed, unchanged) from a previous run with the same inputs.
+
+    completed is how many combinations it finished; changed and unchanged
+    are the page names it wrote or skipped, carried into this run's summary.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return 0, [], []
+    if checkpoint.get("inputs") != fingerprint:
+        return 0, [], []
+    return checkpoint["completed"], checkpoint.get("changed", []), checkpoint.get("unchanged", [])
+
+
+def save_checkpoint(path, fingerprint, completed, writer):
+    data = json.dumps({"inputs": fingerprint, "completed": completed,
+                       "changed": writer.changed, "unchanged": writer.unchanged}, indent=2).encode("utf-8")
+    national_pages.atomic_write(path, data)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate keyword x industry x location long-tail pages.")
+    parser.add_argument("--specs", default=national_pages.DEFAULT_SPECS_FILE,
+                        help="national page spec file (default: %(default)s)")
+    parser.add_argument("--areas", default=DEFAULT_AREAS_FILE,
+                        help="target areas file (default: %(default)s)")
+    parser.add_argument("--output-root", default=DEFAULT_OUTPUT_ROOT,
+                        help="directory the page shards are written to (default: %(default)s)")
+    parser.add_argument("--keywords", nargs="+", metavar="PAGE_ID",
+                        help="only cross these national page ids")
+    parser.add_argument("--states", nargs="+", metavar="ST",
+                        help="only use local areas in these states (e.g. TN KY)")
+    parser.add_argument("--include-suburbs", action="store_true",
+                        help="also generate pages for each area's suburbs")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="stop after this many pages")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="render processes (default: automatic; 1 disables the pool)")
+    parser.add_argument("--batch-size", type=int, default=national_pages.WRITE_BATCH_SIZE,
+                        help="pages per render batch and checkpoint (default: %(default)s)")
+    parser.add_argument("--intern-fragments", action="store_true",
+                        help=f"store shared sections once in {national_pages.FRAGMENTS_NAME}")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore any checkpoint and start from the first combination")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    image_sets, base_specs = national_pages.load_specs(args.specs)
+    areas = load_areas(args.areas)
+
+    if args.keywords:
+        unknown = set(args.keywords) - {spec["id"] for spec in base_specs}
+        if unknown:
+            print(f"[ERROR] Unknown page ids: {', '.join(sorted(unknown))}")
+            return 1
+        base_specs = [spec for spec in base_specs if spec["id"] in args.keywords]
+    states = {state.upper() for state in args.states} if args.states else None
+
+    def locations():
+        return iter_locations(areas, args.include_suburbs, states)
+
+    total = count_specs(base_specs, locations)
+    if args.limit is not None:
+        total = min(total, args.limit)
+
+    output_root = Path(args.output_root)
+    writer = national_pages.PageWriter(output_root)
+    checkpoint_path = writer.build_dir / CHECKPOINT_NAME
+    fingerprint = input_fingerprint(base_specs, image_sets, areas, sorted(states or []), args.include_suburbs,
+                                    args.intern_fragments)
+    start, earlier_changed, earlier_unchanged = ((0, [], []) if args.restart
+                                                 else load_checkpoint(checkpoint_path, fingerprint))
+    start = min(start, total)
+    if start:
+        print(f"Resuming after {start}/{total} pages (checkpoint {checkpoint_path})")
+        # The summary covers the whole run, not just the resumed part
+        writer.changed.extend(earlier_changed)
+        writer.unchanged.extend(earlier_unchanged)
+
+    print(f"Generating {total - start} long-tail pages into {output_root}")
+    specs = islice(iter_specs(base_specs, locations), start, total)
+    registry = national_pages.FragmentRegistry(image_sets=image_sets) if args.intern_fragments else None
+    pages = national_pages.build_pages(specs, image_sets, output_root, args.workers, args.batch_size,
+                                       writer=writer, registry=registry)
+    completed = start
+    try:
+        for path, changed in pages:
+            if path.name == national_pages.FRAGMENTS_NAME:
+                continue
+            completed += 1
+            if completed % args.batch_size == 0:
+                writer.save_manifest()
+                save_checkpoint(checkpoint_path, fingerprint, completed, writer)
+                print(f"  {completed}/{total} pages ({len(writer.changed)} changed)")
+    except KeyboardInterrupt:
+        # Keep the pages written since the last checkpoint in the resumed run's summary
+        writer.save_manifest()
+        save_checkpoint(checkpoint_path, fingerprint, completed, writer)
+        print(f"\nInterrupted after {completed}/{total} pages; run again to resume.")
+        return 1
+    # Pages written after the last checkpoint of an interrupted run come round again as unchanged
+    changed_names = set(writer.changed)
+    writer.unchanged = [name for name in writer.unchanged if name not in changed_names]
+    summary = writer.finish()
+    checkpoint_path.unlink(missing_ok=True)
+
+    print(f"\nAll {total} long-tail pages generated successfully!")
+    print(f"Changed: {len(summary['changed'])}  Unchanged: {len(summary['unchanged'])}")
+    print(f"Summary for revalidation: {writer.build_dir / national_pages.SUMMARY_NAME}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
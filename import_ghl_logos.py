@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Import the logos of the GHL integration catalog as local assets.
+
+ghl-integrations-data.json points every integration at
+logo.clearbit.com/<domain>, so a page built from it would hotlink one
+third-party image per logo. This importer fetches each distinct domain's
+logo once (several integrations share a domain), stores it under
+capture-client-site/public/images/integrations as <domain>.<ext> with the
+extension taken from the bytes (ghl-<domain>.<ext> when that name is taken
+by a logo this importer did not download), and writes
+ghl-integrations-data-local.json: the same catalog with logo_url pointing
+at the local file plus its width, height and SHA-256. An integration whose logo could not be fetched gets
+logo_url null and logo_error rather than the remote URL.
+
+Downloads go through logo_fetch (pooled, rate-limited, retrying, cached
+with ETag revalidation) and the logo_jobs queue (queue "ghl-catalog-logos"),
+so an interrupted run resumes and a rerun after a finished one revalidates.
+--source-base fetches the Clearbit URLs from a local stand-in instead:
+
+    python -m http.server 8000 --directory fixtures/
+    python import_ghl_logos.py --source-base http://127.0.0.1:8000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).parent / "capture-client-site" / "scripts"))
+from logo_fetch import (CACHE_FILE, COPIED, DEFAULT_PER_HOST, DEFAULT_RATE, DEFAULT_WORKERS, DOWNLOADED,  # noqa: E402
+                        NOT_MODIFIED, UNCHANGED, LogoCache, LogoFetcher)
+from logo_jobs import DEAD, DONE, FAILED, add_queue_arguments, open_queue, print_queue_summary  # noqa: E402
+from logo_optimize import EXTENSIONS, PUBLIC_PREFIX, image_size, sniff_format  # noqa: E402
+
+BASE_DIR = Path(__file__).parent
+CATALOG_FILE = BASE_DIR / "ghl-integrations-data.json"
+OUTPUT_FILE = BASE_DIR / "ghl-integrations-data-local.json"
+OUTPUT_DIR = BASE_DIR / "capture-client-site" / "public" / "images" / "integrations"
+SOURCE_BASE = "https://logo.clearbit.com"
+QUEUE_NAME = "ghl-catalog-logos"
+# Stored as ghl-<domain>.<ext> instead when <domain>.<ext> is someone else's file
+COLLISION_PREFIX = "ghl-"
+
+
+def logo_domain(logo_url):
+    """The domain a catalog logo belongs to: the Clearbit path, else the URL's host."""
+    parsed = urlparse(logo_url)
+    if parsed.netloc == urlparse(SOURCE_BASE).netloc:
+        return parsed.path.strip("/").lower()
+    return parsed.netloc.lower()
+
+
+def fetch_url(url, source_base=SOURCE_BASE):
+    """The URL actually fetched: SOURCE_BASE swapped for a stand-in when given."""
+    if source_base != SOURCE_BASE and url.startswith(SOURCE_BASE):
+        return source_base.rstrip("/") + url[len(SOURCE_BASE):]
+    return url
+
+
+def check_image(content, content_type):
+    """Refuse anything that is not an image; returns the reason"""
+    real = sniff_format(content)
+    if real not in EXTENSIONS:
+        return f"not an image ({real or 'unknown format'}, content type: {content_type or 'unknown'})"
+    return None
+
+
+def logo_path(fetcher, url, stem, ext, output_dir, owned_name=None):
+    """Where a logo is stored, without overwriting a file this importer did not download.
+
+    The logo directory also holds hand-picked logos (authorize-net.svg is
+    referenced by integration-partners.ts), so an existing <stem><ext> is only
+    reused when it is this queue's earlier result or the cache has it as the
+    download of `url`; otherwise COLLISION_PREFIX is added to the name.
+    """
+    cached = fetcher.cache.get(url) if fetcher.cache else None
+    for name in (f"{stem}{ext}", f"{COLLISION_PREFIX}{stem}{ext}"):
+        path = output_dir / name
+        if not path.exists() or name == owned_name or (cached and Path(cached["path"]).resolve() == path.resolve()):
+            return path
+    raise ValueError(f"{stem}{ext} and {COLLISION_PREFIX}{stem}{ext} already exist and were not downloaded by this importer")
+
+
+def fetch_logo(fetcher, job, output_dir, source_base, owned_name=None):
+    """Fetch one domain's logo; returns its {local_path, width, height, sha256, format}, raises on failure.
+
+    `owned_name` is the file this queue stored for the domain on an earlier run.
+    """
+    stem = job.key.replace(".", "-")
+    url = fetch_url(job.url, source_base)
+    result = fetcher.fetch_to_file(
+        url,
+        lambda content_type, content: logo_path(fetcher, url, stem, EXTENSIONS[sniff_format(content)], output_dir,
+                                                owned_name),
+        check_image)
+    content = result.path.read_bytes()
+    width, height = image_size(content) or (None, None)
+    print(f"  [{result.status.upper()}] {job.key} -> {result.path.name} ({result.size:,} bytes, {width}x{height})")
+    return {
+        "local_path": PUBLIC_PREFIX + result.path.name,
+        "width": width,
+        "height": height,
+        "sha256": result.sha256,
+        "format": sniff_format(content),
+    }
+
+
+def localize(catalog, logos, errors):
+    """The catalog with every logo_url pointing at its local copy (or null when it failed)."""
+    integrations = []
+    for integration in catalog["integrations"]:
+        domain = logo_domain(integration.get("logo_url", ""))
+        logo = logos.get(domain)
+        entry = {**integration, "logo_url": logo["local_path"] if logo else None,
+                 "source_logo_url": integration.get("logo_url")}
+        if logo:
+            entry.update(width=logo["width"], height=logo["height"], sha256=logo["sha256"])
+        else:
+            entry["logo_error"] = errors.get(domain, "not downloaded")
+        integrations.append(entry)
+    notes = {**catalog.get("notes", {}),
+             "logo_source": f"Local copies under {PUBLIC_PREFIX} written by import_ghl_logos.py; "
+                            "source_logo_url keeps each original Clearbit URL"}
+    return {**catalog, "integrations": integrations, "notes": notes}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Store the GHL catalog's logos locally and write a localized catalog.")
+    parser.add_argument("--catalog", type=Path, default=CATALOG_FILE, help="catalog JSON (default: %(default)s)")
+    parser.add_argument("--output", type=Path, default=OUTPUT_FILE, help="localized catalog (default: %(default)s)")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="logo directory (default: %(default)s)")
+    parser.add_argument("--source-base", default=SOURCE_BASE,
+                        help="fetch Clearbit URLs from this base instead, e.g. a local stand-in")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent downloads")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="concurrent downloads per host")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="max requests per second overall (0 = unlimited)")
+    parser.add_argument("--cache", type=Path, default=CACHE_FILE, help="HTTP cache file (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="download everything in full")
+    add_queue_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(args.catalog, "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+
+    # One job per domain: integrations sharing a domain share its logo
+    domains = {}
+    for integration in catalog["integrations"]:
+        if integration.get("logo_url"):
+            domains.setdefault(logo_domain(integration["logo_url"]), integration["logo_url"])
+    print(f"{len(catalog['integrations'])} integrations, {len(domains)} distinct logo domains")
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    queue = open_queue(QUEUE_NAME, args)
+    queue.enqueue(QUEUE_NAME, [(domain, url, None) for domain, url in domains.items()], prune=True)
+    owned = {job["key"]: Path(job["result"]["local_path"]).name for job in queue.jobs(QUEUE_NAME) if job["result"]}
+    fetcher = LogoFetcher(workers=args.workers, per_host=args.per_host, rate=args.rate,
+                          cache=None if args.no_cache else LogoCache(args.cache))
+    start = time.perf_counter()
+    try:
+        while True:
+            jobs = queue.claim(QUEUE_NAME, args.workers)
+            if not jobs:
+                break
+            finished = []
+            try:
+                for i, outcome in fetcher.map(
+                        lambda fetcher, job: fetch_logo(fetcher, job, args.output_dir, args.source_base,
+                                                        owned.get(job.key)), jobs):
+                    job = jobs[i]
+                    if isinstance(outcome, Exception):
+                        print(f"  [ERROR] {job.key}: {str(outcome)[:80]}")
+                        queue.fail(job, outcome)
+                    else:
+                        queue.complete(job, outcome)
+                    finished.append(job)
+            finally:
+                queue.release([job for job in jobs if job not in finished])
+    except KeyboardInterrupt:
+        print("\nInterrupted; progress is saved in the job queue. Run again to resume.")
+        print_queue_summary(queue, QUEUE_NAME)
+        return 1
+    finally:
+        fetcher.close()
+
+    jobs = queue.jobs(QUEUE_NAME)
+    logos = {job["key"]: job["result"] for job in jobs if job["state"] == DONE}
+    errors = {job["key"]: job["last_error"] for job in jobs if job["state"] in (FAILED, DEAD)}
+    localized = localize(catalog, logos, errors)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(localized, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    stats = fetcher.stats
+    print(f"\n{len(logos)}/{len(domains)} logos local in {time.perf_counter() - start:.1f}s "
+          f"({stats['requests']} requests, {stats[DOWNLOADED] + stats[COPIED]} downloaded, "
+          f"{stats[NOT_MODIFIED] + stats[UNCHANGED]} unchanged)")
+    print(f"Localized catalog written to {args.output}")
+    print_queue_summary(queue, QUEUE_NAME)
+    queue.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Reconcile LOCATION_LANDMARKS with the location pages, target-areas.json and
+the hero image CSV.
+
+The four sources are loaded into slug-keyed columns and joined in a single
+pass over the union of slugs, then reported as:
+
+  - location pages without a landmark entry
+  - landmark entries without a location page
+  - target areas (and, with --suburbs, their suburbs) without a page
+  - stale hero images: the Unsplash photo ID of the hero the page renders
+    (hero.hero_image) is missing or malformed, or differs from the photo
+    chosen for the page in the CSV
+  - hero photos shared by more than one city
+
+The CSV is applied by update_local_images.py to the images-section hero
+(images.hero_image or the first gallery image), which the location page
+does not render; a page whose CSV photo landed only there is reported as
+stale, with the images-section photo alongside.
+
+Usage:
+  python landmark_coverage.py
+  python landmark_coverage.py --suburbs --json
+  python landmark_coverage.py --strict        # exit 1 when anything is reported
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import generate_longtail_pages
+import location_data
+from update_local_images import (LOCATION_LANDMARKS, PHOTO_ID_PATTERN, PLACEHOLDER, hero_photo_id, normalize_photo_id,
+                                 photo_id)
+
+DEFAULT_CSV = location_data.BASE_DIR / "LOCAL_IMAGES_TO_UPDATE.csv"
+
+
+def target_slug(city, state):
+    return f"{generate_longtail_pages.slugify(city)}-{state.lower()}"
+
+
+def page_columns(locations):
+    """slug -> (rendered hero photo ID, images-section hero photo ID, has a rendered hero) per location page.
+
+    The location page renders hero.hero_image; the images-section hero is
+    the one update_local_images.py sets from the CSV.
+    """
+    return {
+        location.slug: (photo_id(location.data.get("hero", {}).get("hero_image")), hero_photo_id(location.data),
+                        bool(location.data.get("hero", {}).get("hero_image")))
+        for location in locations
+    }
+
+
+def target_columns(areas, include_suburbs=False):
+    """slug -> metro city for every target area (and suburb)."""
+    return {
+        target_slug(location["city"], location["state"]): location["metro"]
+        for location in generate_longtail_pages.iter_locations(areas, include_suburbs)
+    }
+
+
+def csv_columns(csv_file):
+    """slug -> chosen photo ID from the hero image CSV; comments and placeholders skipped."""
+    chosen = {}
+    try:
+        with open(csv_file, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(line for line in f if not line.lstrip().startswith("#")):
+                slug = (row.get("location_slug") or "").strip()
+                value = (row.get("photo_id") or "").strip()
+                if slug and value and value != PLACEHOLDER:
+                    chosen[slug] = normalize_photo_id(value)
+    except FileNotFoundError:
+        pass
+    return chosen
+
+
+def reconcile(pages, landmarks, targets, chosen):
+    """Join the slug-keyed columns in one pass; returns the report dict."""
+    report = {
+        "pages_without_landmark": [],
+        "landmarks_without_page": [],
+        "targets_without_page": [],
+        "stale_images": [],
+        "shared_images": {},
+    }
+    by_photo = defaultdict(list)
+    for slug in sorted(pages.keys() | landmarks.keys() | targets.keys()):
+        has_page = slug in pages
+        if has_page and slug not in landmarks:
+            report["pages_without_landmark"].append(slug)
+        if slug in landmarks and not has_page:
+            report["landmarks_without_page"].append(slug)
+        if slug in targets and not has_page:
+            metro = targets[slug]
+            report["targets_without_page"].append(
+                {"slug": slug, "metro": None if target_slug(metro, slug[-2:]) == slug else metro})
+        if not has_page:
+            continue
+
+        current, images_hero, has_hero = pages[slug]
+        if current is not None:
+            by_photo[current].append(slug)
+        reason = None
+        if current is None:
+            reason = "no Unsplash hero image" if has_hero else "page renders no hero image (no hero.hero_image)"
+        elif not PHOTO_ID_PATTERN.fullmatch(current):
+            reason = f"malformed photo ID {current}"
+        elif slug in chosen and chosen[slug] != current:
+            reason = f"CSV chose {chosen[slug]}"
+            if images_hero == chosen[slug]:
+                reason += " (set on the images-section hero only)"
+        if reason:
+            report["stale_images"].append(
+                {"slug": slug, "photo_id": current, "images_photo_id": images_hero, "reason": reason})
+
+    report["shared_images"] = {photo: slugs for photo, slugs in sorted(by_photo.items()) if len(slugs) > 1}
+    return report
+
+
+def print_report(report, counts):
+    print("=" * 60)
+    print("LANDMARK COVERAGE")
+    print("=" * 60)
+    print(f"{counts['pages']} pages, {counts['landmarks']} landmarks, "
+          f"{counts['targets']} targets, {counts['chosen']} CSV photo choices")
+
+    def section(title, items, fmt=str):
+        print(f"\n{title}: {len(items)}")
+        for item in items:
+            print(f"   - {fmt(item)}")
+
+    section("Pages without a landmark", report["pages_without_landmark"])
+    section("Landmarks without a page", report["landmarks_without_page"])
+    section("Targets without a page", report["targets_without_page"],
+            lambda t: t["slug"] + (f" (suburb of {t['metro']})" if t["metro"] else ""))
+    section("Stale hero images (hero.hero_image, as rendered)", report["stale_images"],
+            lambda s: f"{s['slug']}: {s['reason']}")
+    shared = report["shared_images"]
+    section("Hero photos shared across cities (hero.hero_image, as rendered)", list(shared),
+            lambda photo: f"{photo} x{len(shared[photo])}: {', '.join(shared[photo])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile landmarks, location pages, target areas and the image CSV.")
+    parser.add_argument("--areas", type=Path, default=generate_longtail_pages.DEFAULT_AREAS_FILE,
+                        help="target areas file (default: %(default)s)")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV, help="hero image CSV (default: %(default)s)")
+    parser.add_argument("--suburbs", action="store_true", help="also expect a page for every suburb")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--strict", action="store_true", help="exit 1 when anything is reported")
+    args = parser.parse_args(argv)
+
+    pages = page_columns(location_data.load_locations())
+    targets = target_columns(generate_longtail_pages.load_areas(args.areas), args.suburbs)
+    chosen = csv_columns(args.csv)
+    report = reconcile(pages, LOCATION_LANDMARKS, targets, chosen)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        counts = {"pages": len(pages), "landmarks": len(LOCATION_LANDMARKS),
+                  "targets": len(targets), "chosen": len(chosen)}
+        print_report(report, counts)
+    return 1 if args.strict and any(report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
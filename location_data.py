@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Shared loader for the location pages in capture-client-site/src/data/locations.
+
+Reads every voice-ai-*.json once, checks it against a small schema and
+indexes the pages by slug, state, city and primary keyword. The location
+files grew several shapes over time (state vs state_full/state_abbr, images
+as a list or as {"gallery", "hero_image"}), so the Location records and the
+helpers below hide those differences from the maintenance scripts.
+
+    import location_data
+
+    locations = location_data.load_locations()
+    akron = locations.get("akron-oh")
+    for location in locations.in_state("KY"):
+        ...
+"""
+
+import copy
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = BASE_DIR / "capture-client-site" / "src" / "data"
+LOCATIONS_DIR = DATA_DIR / "locations"
+FILE_PREFIX = "voice-ai-"
+
+# Required keys and the JSON types they must have
+SCHEMA = {
+    "page_id": str,
+    "page_type": str,
+    "location": dict,
+    "seo": dict,
+    "hero": dict,
+    "images": (list, dict),
+    "faq": list,
+}
+LOCATION_SCHEMA = {"city": str}
+SEO_SCHEMA = {"page_title": str, "meta_description": str, "keywords": list}
+
+
+class LocationSchemaError(ValueError):
+    """A location file is not valid JSON or does not match SCHEMA."""
+
+
+@dataclass(frozen=True)
+class Location:
+    slug: str  # "akron-oh": the file name without FILE_PREFIX and .json
+    path: Path
+    page_id: str
+    city: str
+    state: str  # two-letter abbreviation
+    state_name: Optional[str]
+    primary_keyword: str
+    data: dict = field(repr=False, compare=False)
+
+    def editable_data(self) -> dict:
+        """A deep copy of the page data, safe to modify and serialize with dumps()."""
+        return copy.deepcopy(self.data)
+
+
+def check_keys(data, schema, prefix=""):
+    errors = []
+    for key, expected in schema.items():
+        if key not in data:
+            errors.append(f"missing {prefix}{key}")
+        elif not isinstance(data[key], expected):
+            errors.append(f"{prefix}{key} has type {type(data[key]).__name__}")
+    return errors
+
+
+def validate(data) -> List[str]:
+    """Return the schema problems in one location page (empty when valid)."""
+    if not isinstance(data, dict):
+        return ["top level is not an object"]
+    errors = check_keys(data, SCHEMA)
+    if isinstance(data.get("location"), dict):
+        location = data["location"]
+        errors += check_keys(location, LOCATION_SCHEMA, "location.")
+        if not any(key in location for key in ("state", "state_abbr", "state_full")):
+            errors.append("missing location.state / state_abbr / state_full")
+    if isinstance(data.get("seo"), dict):
+        errors += check_keys(data["seo"], SEO_SCHEMA, "seo.")
+    if isinstance(data.get("images"), dict) and not isinstance(data["images"].get("gallery"), list):
+        errors.append("images object has no gallery list")
+    return errors
+
+
+def slug_for_path(path) -> str:
+    return Path(path).stem[len(FILE_PREFIX):]
+
+
+def path_for_slug(slug, directory=LOCATIONS_DIR) -> Path:
+    return Path(directory) / f"{FILE_PREFIX}{slug}.json"
+
+
+def parse_location(path, data) -> Location:
+    slug = slug_for_path(path)
+    location = data["location"]
+    state = location.get("state", "")
+    abbr = location.get("state_abbr") or (state if len(state) == 2 else slug.rsplit("-", 1)[-1].upper())
+    name = location.get("state_full") or (state if len(state) > 2 else None)
+    keywords = data["seo"]["keywords"]
+    return Location(
+        slug=slug,
+        path=Path(path),
+        page_id=data["page_id"],
+        city=location["city"],
+        state=abbr.upper(),
+        state_name=name,
+        primary_keyword=keywords[0].lower() if keywords else "",
+        data=data,
+    )
+
+
+def read_location(path) -> Location:
+    """Load and validate a single location file."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError as e:
+        raise LocationSchemaError(f"{Path(path).name}: invalid JSON: {e}") from e
+    errors = validate(data)
+    if errors:
+        raise LocationSchemaError(f"{Path(path).name}: {'; '.join(errors)}")
+    return parse_location(path, data)
+
+
+class LocationIndex:
+    """All location pages, loaded once and indexed for lookup."""
+
+    def __init__(self, locations, errors=None):
+        self.errors: Dict[str, str] = dict(errors or {})
+        self.build(locations)
+
+    def build(self, locations):
+        self.locations: Tuple[Location, ...] = tuple(sorted(locations, key=lambda loc: loc.slug))
+        self.by_slug: Dict[str, Location] = {}
+        self.by_page_id: Dict[str, Location] = {}
+        self.by_state: Dict[str, List[Location]] = {}
+        self.by_city: Dict[str, List[Location]] = {}
+        self.by_keyword: Dict[str, Location] = {}
+        for location in self.locations:
+            self.by_slug[location.slug] = location
+            self.by_page_id[location.page_id] = location
+            self.by_state.setdefault(location.state, []).append(location)
+            self.by_city.setdefault(location.city.lower(), []).append(location)
+            if location.primary_keyword:
+                self.by_keyword.setdefault(location.primary_keyword, location)
+
+    def __iter__(self):
+        return iter(self.locations)
+
+    def __len__(self):
+        return len(self.locations)
+
+    def get(self, slug) -> Optional[Location]:
+        """Look up "akron-oh", "voice-ai-akron-oh" or a page_id."""
+        if slug in self.by_slug:
+            return self.by_slug[slug]
+        if slug.startswith(FILE_PREFIX) and slug[len(FILE_PREFIX):] in self.by_slug:
+            return self.by_slug[slug[len(FILE_PREFIX):]]
+        return self.by_page_id.get(slug)
+
+    def in_state(self, state) -> List[Location]:
+        """Locations in a state, by abbreviation ("KY") or full name ("Kentucky")."""
+        state = state.strip()
+        if len(state) == 2:
+            return list(self.by_state.get(state.upper(), []))
+        return [loc for loc in self.locations if (loc.state_name or "").lower() == state.lower()]
+
+    def in_city(self, city) -> List[Location]:
+        return list(self.by_city.get(city.lower(), []))
+
+    def with_keyword(self, keyword) -> Optional[Location]:
+        return self.by_keyword.get(keyword.lower())
+
+
+@lru_cache(maxsize=None)
+def _load(directory: Path) -> LocationIndex:
+    locations = []
+    errors = {}
+    for path in sorted(directory.glob(f"{FILE_PREFIX}*.json")):
+        try:
+            locations.append(read_location(path))
+        except LocationSchemaError as e:
+            errors[path.name] = str(e)
+    return LocationIndex(locations, errors)
+
+
+def load_locations(directory=LOCATIONS_DIR, strict=False) -> LocationIndex:
+    """Load (once per process) and index every location file in `directory`.
+
+    Files that fail validation are left out and listed in `.errors`; with
+    `strict` the first of them raises LocationSchemaError instead.
+    """
+    index = _load(Path(directory).resolve())
+    if strict and index.errors:
+        raise LocationSchemaError(next(iter(index.errors.values())))
+    return index
+
+
+def dumps(data: dict) -> str:
+    """Serialize page data the way location files are written."""
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def validate_text(path, text) -> List[str]:
+    """batch_edit validator: the edited text must still be a valid location page."""
+    try:
+        return validate(json.loads(text))
+    except ValueError as e:
+        return [f"invalid JSON: {e}"]
+
+
+def gallery(data) -> list:
+    """The page's image list, whichever shape "images" has."""
+    images = data.get("images", [])
+    return images.get("gallery", []) if isinstance(images, dict) else images
+
+
+def hero_image(data) -> Optional[dict]:
+    """The image used as the page hero: images.hero_image, else the first gallery image."""
+    images = data.get("images", [])
+    if isinstance(images, dict) and images.get("hero_image"):
+        return images["hero_image"]
+    items = gallery(data)
+    return items[0] if items else None
+
+
+if __name__ == "__main__":
+    index = load_locations()
+    print(f"{len(index)} location files in {LOCATIONS_DIR}")
+    for state, locations in sorted(index.by_state.items()):
+        print(f"  {state}: {len(locations)}")
+    for name, error in index.errors.items():
+        print(f"[ERROR] {error}")
+    raise SystemExit(1 if index.errors else 0)
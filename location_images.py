@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Ingest location hero images into the site as optimized local assets.
+
+For every location page whose hero image still points at a remote URL
+(images.unsplash.com), the photo is fetched once, stored content-addressed
+under capture-client-site/public/images/locations, and encoded as AVIF and
+WebP at several widths. The page JSON is then rewritten to the local files
+with width/height, srcsets, a blurred LQIP data URL and a blurhash, which
+the site's LocationHeroImage renders as a <picture> (next/image would
+re-encode the variants).
+
+images.json in the output directory records every source URL already
+ingested, so re-runs only fetch new photos. --source-base points the
+fetcher at a local HTTP stand-in instead of Unsplash, e.g.
+
+    python -m http.server 8000 --directory fixtures/
+    python location_images.py --source-base http://127.0.0.1:8000
+
+Needs Pillow (with AVIF support for the .avif variants) and requests.
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import batch_edit
+import location_data
+
+try:
+    import requests
+except ImportError:  # only needed when something has to be fetched
+    requests = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+OUTPUT_DIR = location_data.BASE_DIR / "capture-client-site" / "public" / "images" / "locations"
+PUBLIC_PREFIX = "/images/locations/"
+INDEX_NAME = "images.json"
+
+SOURCE_BASE = "https://images.unsplash.com"
+WIDTHS = (640, 1080, 1920)
+FORMATS = {"avif": {"quality": 50}, "webp": {"quality": 75}}
+LQIP_WIDTH = 16
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 30
+
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+# ---------------------------------------------------------------------------
+# Blurhash (https://blurha.sh) encoder
+# ---------------------------------------------------------------------------
+
+def encode83(value, length):
+    return "".join(BASE83[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+
+def srgb_to_linear(value):
+    v = value / 255
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+
+SRGB_TO_LINEAR = [srgb_to_linear(value) for value in range(256)]
+
+
+def linear_to_srgb(value):
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(image, x_components=4, y_components=3):
+    """Blurhash of a PIL image, computed on a 32px thumbnail."""
+    small = image.convert("RGB")
+    small.thumbnail((32, 32))
+    width, height = small.size
+    raw = small.tobytes()
+    pixels = [tuple(SRGB_TO_LINEAR[c] for c in raw[k:k + 3]) for k in range(0, len(raw), 3)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            norm = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                cos_y = math.cos(math.pi * j * y / height)
+                for x in range(width):
+                    basis = norm * math.cos(math.pi * i * x / width) * cos_y
+                    pr, pg, pb = pixels[y * width + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = 1 / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised = max(0, min(82, int(max(abs(c) for f in ac for c in f) * 166 - 0.5)))
+        max_value = (quantised + 1) / 166
+    else:
+        quantised, max_value = 0, 1
+    result += encode83(quantised, 1)
+    result += encode83((linear_to_srgb(dc[0]) << 16) + (linear_to_srgb(dc[1]) << 8) + linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        q = [max(0, min(18, int(math.floor(math.copysign(abs(c / max_value) ** 0.5, c) * 9 + 9.5)))) for c in factor]
+        result += encode83(q[0] * 19 * 19 + q[1] * 19 + q[2], 2)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Fetch and encode
+# ---------------------------------------------------------------------------
+
+def fetch_url(url, source_base=SOURCE_BASE):
+    """The URL actually fetched: SOURCE_BASE swapped for a stand-in when given."""
+    if source_base != SOURCE_BASE and url.startswith(SOURCE_BASE):
+        return source_base.rstrip("/") + url[len(SOURCE_BASE):]
+    return url
+
+
+def fetch(session, url, source_base):
+    response = session.get(fetch_url(url, source_base), timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def lqip(image):
+    """Tiny blurred WebP as a data URL, for next/image placeholder="blur"."""
+    small = image.convert("RGB")
+    small.thumbnail((LQIP_WIDTH, LQIP_WIDTH * 4))
+    buffer = io.BytesIO()
+    small.save(buffer, "WEBP", quality=40)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def ingest(data, output_dir=OUTPUT_DIR, widths=WIDTHS):
+    """Process-pool task: store one photo and its variants; returns its index record."""
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    output_dir = Path(output_dir)
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        ext = (image.format or "jpeg").lower().replace("jpeg", "jpg")
+        original = output_dir / f"{digest}.{ext}"
+        if not original.exists():
+            original.write_bytes(data)
+
+        width, height = image.size
+        sizes = sorted({w for w in widths if w < width} | {min(width, max(widths))})
+        variants = {fmt: [] for fmt in FORMATS}
+        for size in sizes:
+            resized = image.convert("RGB")
+            if size != width:
+                resized = resized.resize((size, round(height * size / width)), Image.LANCZOS)
+            for fmt, options in FORMATS.items():
+                name = f"{digest}-{size}.{fmt}"
+                if not (output_dir / name).exists():
+                    buffer = io.BytesIO()
+                    resized.save(buffer, fmt.upper(), **options)
+                    (output_dir / name).write_bytes(buffer.getvalue())
+                variants[fmt].append({"width": size, "url": PUBLIC_PREFIX + name})
+
+        largest = sizes[-1]
+        return {
+            "hash": digest,
+            "original": PUBLIC_PREFIX + original.name,
+            "width": largest,
+            "height": round(height * largest / width),
+            "src": PUBLIC_PREFIX + f"{digest}-{largest}.webp",
+            "srcset": {fmt: ", ".join(f"{v['url']} {v['width']}w" for v in items) for fmt, items in variants.items()},
+            "blur_data_url": lqip(image),
+            "blurhash": blurhash(image),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Location pages
+# ---------------------------------------------------------------------------
+
+def hero_entries(data):
+    """The hero image dicts of a page: hero.hero_image and the images hero."""
+    entries = []
+    hero = data.get("hero", {}).get("hero_image")
+    if isinstance(hero, dict):
+        entries.append(hero)
+    image = location_data.hero_image(data)
+    if isinstance(image, dict) and image is not hero:
+        entries.append(image)
+    return entries
+
+
+def is_remote(url):
+    return isinstance(url, str) and url.startswith(("http://", "https://"))
+
+
+# Fields localize() adds; they describe one particular photo
+LOCALIZED_FIELDS = ("source_url", "width", "height", "srcset", "blur_data_url", "blurhash")
+
+
+def localize(image, record):
+    image["source_url"] = image["url"]
+    image["url"] = record["src"]
+    image["width"] = record["width"]
+    image["height"] = record["height"]
+    image["srcset"] = record["srcset"]
+    image["blur_data_url"] = record["blur_data_url"]
+    image["blurhash"] = record["blurhash"]
+
+
+def edit_location(path, text, records):
+    """batch_edit edit function: point remote hero images at their local copies."""
+    data = json.loads(text)
+    changed = 0
+    for image in hero_entries(data):
+        record = records.get(image.get("url"))
+        if record is not None:
+            localize(image, record)
+            changed += 1
+    return (location_data.dumps(data) if changed else None), changed
+
+
+def load_index(output_dir):
+    try:
+        with open(Path(output_dir) / INDEX_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index(output_dir, index):
+    path = Path(output_dir) / INDEX_NAME
+    path.write_text(json.dumps(index, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def is_stored(record, output_dir):
+    """True when every file an index record points to still exists."""
+    names = [record["original"], record["src"]]
+    names += [part.split()[0] for srcset in record["srcset"].values() for part in srcset.split(", ")]
+    return all((Path(output_dir) / name[len(PUBLIC_PREFIX):]).exists() for name in names)
+
+
+def run(slugs=None, states=None, output_dir=OUTPUT_DIR, source_base=SOURCE_BASE, widths=WIDTHS, dry_run=False,
+        workers=None, locations_dir=location_data.LOCATIONS_DIR):
+    if Image is None:
+        print("[ERROR] Pillow is required: pip install Pillow")
+        return 1
+
+    locations = list(location_data.load_locations(locations_dir))
+    if slugs:
+        locations = [location for location in locations if location.slug in slugs]
+    if states:
+        locations = [location for location in locations if location.state in states]
+    wanted = {}
+    for location in locations:
+        for image in hero_entries(location.data):
+            if is_remote(image.get("url")):
+                wanted.setdefault(image["url"], []).append(location)
+    print(f"{len(wanted)} remote hero images across {len(locations)} location pages")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    index = load_index(output_dir)
+    todo = [url for url in wanted if url not in index or not is_stored(index[url], output_dir)]
+    if todo and requests is None:
+        print("[ERROR] requests is required to fetch images: pip install requests")
+        return 1
+
+    failed = {}
+    if todo and not dry_run:
+        print(f"Fetching {len(todo)} images...")
+        session = requests.Session()
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            futures = {url: pool.submit(fetch, session, url, source_base) for url in todo}
+        payloads = {}
+        for url, future in futures.items():
+            try:
+                payloads[url] = future.result()
+            except Exception as e:
+                failed[url] = str(e)
+        # One undecodable image must not lose the records of the others
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {url: pool.submit(ingest, data, output_dir=output_dir, widths=widths)
+                           for url, data in payloads.items()}
+                for url, future in futures.items():
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        failed[url] = str(e)
+                        continue
+                    index[url] = record
+                    print(f"[OK] {record['hash']} {record['width']}x{record['height']} <- {url[:70]}")
+        finally:
+            save_index(output_dir, index)
+    elif todo:
+        print(f"Would fetch {len(todo)} images")
+
+    for url, error in failed.items():
+        print(f"[ERROR] {url}: {error}")
+
+    records = {url: index[url] for url in wanted if url in index}
+    paths = sorted({location.path for url in records for location in wanted[url]})
+    try:
+        result = batch_edit.run_batch(paths, partial(edit_location, records=records),
+                                      validate=location_data.validate_text, dry_run=dry_run)
+    except batch_edit.BatchEditError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    batch_edit.print_report(result, locations_dir, diff=dry_run)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store location hero images locally as optimized variants.")
+    parser.add_argument("slugs", nargs="*", help="location slugs (default: every location)")
+    parser.add_argument("--state", nargs="+", metavar="ST", help="only locations in these states")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="asset directory (default: %(default)s)")
+    parser.add_argument("--source-base", default=SOURCE_BASE,
+                        help="fetch Unsplash URLs from this base instead, e.g. a local stand-in")
+    parser.add_argument("--widths", nargs="+", type=int, default=list(WIDTHS), help="variant widths")
+    parser.add_argument("--workers", type=int, default=None, help="encoder processes (default: one per CPU)")
+    parser.add_argument("--dry-run", action="store_true", help="list what would change without fetching or writing")
+    args = parser.parse_args(argv)
+    states = {state.upper() for state in args.state} if args.state else None
+    return run(args.slugs, states, args.output_dir, args.source_base, tuple(args.widths), args.dry_run, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Apply localized city content to the location pages from patch files.
+
+A patch file (location-patches/*.json, or .yaml/.yml when PyYAML is
+installed) holds the content for a set of location pages plus the rules
+that say where each piece goes:
+
+    {
+      "fields": {"intro": ["intro.paragraph", "local_intro.paragraph"]},
+      "lists": [{
+        "sections": ["faq"], "match": "question", "target": "answer",
+        "rules": [{"all": ["types of", "businesses"], "content": "faq_area_mention"}]
+      }],
+      "locations": {"louisville-ky": {"intro": "...", "faq_area_mention": "..."}}
+    }
+
+"fields" sets a dotted path (the first one whose parent exists) from a
+content key. Each "lists" entry walks the items of the first section
+present, tests item[match] against its rules in order (case-insensitive
+"any" / "all" substrings, compiled once per file) and sets item[target]
+from the first matching rule the location has content for.
+
+Every patched page across all patch files is edited in one batch_edit
+transaction.
+
+Usage:
+  python location_patches.py                         # every file in location-patches/
+  python location_patches.py location-patches/ky.json --dry-run
+"""
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import batch_edit
+import location_data
+
+try:
+    import yaml
+except ImportError:  # YAML patches are optional
+    yaml = None
+
+PATCHES_DIR = Path(__file__).parent / "location-patches"
+PATCH_EXTENSIONS = (".json", ".yaml", ".yml")
+
+
+class PatchError(ValueError):
+    """A patch file is unreadable or malformed."""
+
+
+@dataclass(frozen=True)
+class Matcher:
+    """Case-insensitive substring test: any of `any_of` and all of `all_of`."""
+    any_of: Optional[re.Pattern]
+    all_of: Tuple[re.Pattern, ...]
+
+    def __call__(self, text):
+        if self.any_of is not None and not self.any_of.search(text):
+            return False
+        return all(pattern.search(text) for pattern in self.all_of)
+
+
+@dataclass(frozen=True)
+class ListRule:
+    matcher: Matcher
+    content: str
+
+
+@dataclass(frozen=True)
+class ListPatch:
+    sections: Tuple[str, ...]
+    match: str
+    target: str
+    rules: Tuple[ListRule, ...]
+
+
+@dataclass(frozen=True)
+class Patch:
+    source: str
+    fields: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    lists: Tuple[ListPatch, ...]
+    locations: Dict[str, Dict[str, str]]
+
+
+def compile_matcher(rule, source):
+    any_of = rule.get("any", [])
+    all_of = rule.get("all", [])
+    if not any_of and not all_of:
+        raise PatchError(f"{source}: rule for {rule.get('content')!r} has no \"any\" or \"all\" terms")
+    return Matcher(
+        re.compile("|".join(re.escape(term) for term in any_of), re.IGNORECASE) if any_of else None,
+        tuple(re.compile(re.escape(term), re.IGNORECASE) for term in all_of),
+    )
+
+
+def compile_patch(raw, source="<patch>"):
+    """Turn a parsed patch document into a Patch with precompiled matchers."""
+    try:
+        fields = tuple(
+            (content, tuple([paths] if isinstance(paths, str) else paths))
+            for content, paths in raw.get("fields", {}).items()
+        )
+        lists = tuple(
+            ListPatch(
+                sections=tuple(entry["sections"]),
+                match=entry["match"],
+                target=entry["target"],
+                rules=tuple(ListRule(compile_matcher(rule, source), rule["content"]) for rule in entry["rules"]),
+            )
+            for entry in raw.get("lists", [])
+        )
+        locations = raw["locations"]
+    except (KeyError, TypeError, AttributeError) as e:
+        raise PatchError(f"{source}: malformed patch ({type(e).__name__}: {e})") from e
+    return Patch(str(source), fields, lists, locations)
+
+
+def load_patch(path):
+    path = Path(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.suffix in (".yaml", ".yml"):
+                if yaml is None:
+                    raise PatchError(f"{path.name}: install PyYAML to read YAML patches")
+                raw = yaml.safe_load(f)
+            else:
+                raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise PatchError(f"{path.name}: {e}") from e
+    return compile_patch(raw or {}, path.name)
+
+
+def patch_files(paths=None):
+    if paths:
+        return [Path(path) for path in paths]
+    return sorted(path for path in PATCHES_DIR.iterdir() if path.suffix in PATCH_EXTENSIONS)
+
+
+def set_path(data, dotted, value):
+    """Set data[a][b]... for "a.b".
+
+    Returns None when the parent is missing, else whether the value changed.
+    """
+    *parents, key = dotted.split(".")
+    node = data
+    for part in parents:
+        node = node.get(part) if isinstance(node, dict) else None
+        if node is None:
+            return None
+    if not isinstance(node, dict):
+        return None
+    if key in node and node[key] == value:
+        return False
+    node[key] = value
+    return True
+
+
+def apply_patch(data, patch, content):
+    """Apply one location's content to a parsed page; returns the paths whose value changed."""
+    changed = []
+    for key, paths in patch.fields:
+        if key not in content:
+            continue
+        for dotted in paths:
+            result = set_path(data, dotted, content[key])
+            if result is not None:
+                if result:
+                    changed.append(dotted)
+                break
+
+    for entry in patch.lists:
+        section = next((name for name in entry.sections if isinstance(data.get(name), list)), None)
+        if section is None:
+            continue
+        for index, item in enumerate(data[section]):
+            text = item.get(entry.match) if isinstance(item, dict) else None
+            if not isinstance(text, str):
+                continue
+            rule = next((rule for rule in entry.rules if rule.content in content and rule.matcher(text)), None)
+            if rule is not None and item.get(entry.target, object()) != content[rule.content]:
+                item[entry.target] = content[rule.content]
+                changed.append(f"{section}[{index}].{entry.target}")
+    return changed
+
+
+def edit_location(path, text, patches_by_slug):
+    """batch_edit edit function; the detail is the list of changed paths.
+
+    A page none of whose values differ is left alone (None), not re-serialized.
+    """
+    slug = location_data.slug_for_path(path)
+    data = json.loads(text)
+    changed = []
+    for patch, content in patches_by_slug[slug]:
+        changed += apply_patch(data, patch, content)
+    return (location_data.dumps(data) if changed else None), changed
+
+
+def collect(patches):
+    """Group patch content by location slug, in patch-file order."""
+    by_slug: Dict[str, List[Tuple[Patch, dict]]] = {}
+    for patch in patches:
+        for slug, content in patch.locations.items():
+            by_slug.setdefault(slug, []).append((patch, content))
+    return by_slug
+
+
+def run(paths=None, dry_run=False, states=None, workers=None):
+    """Apply patch files to the location pages; returns an exit status."""
+    try:
+        patches = [load_patch(path) for path in patch_files(paths)]
+    except (PatchError, OSError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    locations = location_data.load_locations()
+    by_slug = collect(patches)
+    missing = [slug for slug in by_slug if locations.get(slug) is None]
+    for slug in missing:
+        print(f"[ERROR] No location file for {slug}: {location_data.path_for_slug(slug)}")
+    if missing:
+        return 1
+
+    # Patch keys may be any form locations.get() accepts; edits look up the file slug
+    by_slug = {locations.get(key).slug: entries for key, entries in by_slug.items()}
+    targets = [locations.get(slug) for slug in by_slug]
+    if states:
+        targets = [location for location in targets if location.state in states]
+    print(f"Applying {len(patches)} patch file(s) to {len(targets)} location pages...")
+    print("=" * 60)
+
+    try:
+        result = batch_edit.run_batch([location.path for location in targets],
+                                      partial(edit_location, patches_by_slug=by_slug),
+                                      validate=location_data.validate_text, workers=workers, dry_run=dry_run)
+    except batch_edit.BatchEditError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    for edit in result.edits:
+        slug = location_data.slug_for_path(edit.path)
+        status = "no change" if not edit.changed else ("would update" if dry_run else "updated")
+        print(f"[OK] {slug}: {status} ({len(edit.detail)} fields)")
+    batch_edit.print_report(result, location_data.LOCATIONS_DIR, diff=dry_run)
+
+    print("=" * 60)
+    print(f"{'Would update' if dry_run else 'Updated'} {len(result.changed)}/{len(targets)} files successfully")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply localized content patches to the location pages.")
+    parser.add_argument("patches", nargs="*", help=f"patch files (default: every file in {PATCHES_DIR})")
+    parser.add_argument("--state", nargs="+", metavar="ST", help="only patch locations in these states")
+    parser.add_argument("--dry-run", action="store_true", help="show the diffs without writing")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: automatic; 1 runs inline)")
+    args = parser.parse_args(argv)
+    states = {state.upper() for state in args.state} if args.state else None
+    return run(args.patches, args.dry_run, states, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
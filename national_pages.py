@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+National SEO page build engine.
+
+Renders national keyword pages from page specs (national-page-specs.json)
+through shared section builders and writes one JSON file per page.
+Used by generate_all_national_pages.py and generate_national_pages.py;
+import it to build pages from any other spec source.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_SPECS_FILE = BASE_DIR / "national-page-specs.json"
+DEFAULT_OUTPUT_ROOT = BASE_DIR / "pages" / "national"
+
+PHONE = "865-346-3339"
+
+# Fingerprint manifest and change summary. A dot-directory, so the site's
+# loader (every *.json directly in src/data/national) never picks them up.
+BUILD_DIR_NAME = ".build"
+MANIFEST_NAME = "manifest.json"
+SUMMARY_NAME = "summary.json"
+
+# Shared fragments written next to the pages. The leading underscore tells
+# the site's loader it is not a page; "$fragment" objects in a page are
+# replaced with the entry of that id when the page is loaded.
+FRAGMENTS_NAME = "_fragments.json"
+FRAGMENT_REF = "$fragment"
+
+# Below this many pages a process pool costs more than it saves
+PARALLEL_THRESHOLD = 200
+WRITE_BATCH_SIZE = 500
+
+# Boilerplate shared by every generated page
+BENEFITS = [
+    {"title": "24/7 Availability", "description": "Never miss a lead or opportunity with round-the-clock service.", "icon": "clock"},
+    {"title": "Instant Response", "description": "Respond to inquiries within seconds not hours or days.", "icon": "zap"},
+    {"title": "Cost Effective", "description": "Save 60-80 percent compared to traditional methods.", "icon": "dollar-sign"},
+    {"title": "Scalable System", "description": "Handle 10 or 1000 leads without adding staff.", "icon": "trending-up"},
+    {"title": "Full Integration", "description": "Works with your existing CRM calendar and tools.", "icon": "link"}
+]
+
+HOW_IT_WORKS = [
+    {"step": 1, "title": "Free Consultation", "description": "We analyze your business and create a custom strategy."},
+    {"step": 2, "title": "Setup & Training", "description": "We build and train your system with your business knowledge."},
+    {"step": 3, "title": "Testing & Launch", "description": "We test thoroughly then launch your automated system."},
+    {"step": 4, "title": "Optimize & Scale", "description": "We continuously improve performance and scale with your growth."}
+]
+
+NATIONWIDE_COVERAGE = {
+    "heading": "Serving Businesses Nationwide",
+    "description": "We work with businesses across all 50 states from small local operations to multi-location enterprises.",
+    "regions_highlighted": ["East Coast", "West Coast", "Midwest", "South", "Southwest"]
+}
+
+TESTIMONIALS = [
+    {"quote": "This system transformed our business. We went from struggling to find leads to having more than we can handle.", "author": "John Smith", "business": "ABC Services", "location": "Denver CO"},
+    {"quote": "Best investment we have made. The ROI was positive in the first month.", "author": "Sarah Johnson", "business": "XYZ Company", "location": "Miami FL"},
+    {"quote": "Finally a marketing system that actually works. Highly recommend.", "author": "Mike Davis", "business": "123 Solutions", "location": "Portland OR"}
+]
+
+CTA_SECTION = {
+    "headline": "Ready to Transform Your Business?",
+    "subheadline": "Get your free consultation and discover how our system can generate more leads and revenue for your business.",
+    "cta_primary": {"text": f"Call Now: {PHONE}", "action": f"tel:{PHONE}", "type": "phone"},
+    "urgency_text": "Limited slots available for new clients"
+}
+
+RELATED_PAGES = {
+    "related_national_keywords": ["voice-ai-small-business", "lead-generation-agency"],
+    "packages": ["starter-package", "growth-package"]
+}
+
+FAQ_COST = {"question": "How much does it cost?", "answer": "Packages start at $999 per month. Most businesses see 3-5x ROI within 60 days making it a highly profitable investment."}
+FAQ_START = {"question": "How quickly can I get started?", "answer": "Most businesses are fully operational within 1-2 weeks from initial consultation to launch."}
+FAQ_RESULTS = {"question": "What kind of results can I expect?", "answer": "Most businesses see 2-3x more leads 40-60 percent higher conversion rates and 3-5x ROI within the first 90 days."}
+FAQ_CONTRACT = {"question": "Is there a contract?", "answer": "No long-term contracts required. Month-to-month service with 30-day cancellation notice."}
+
+# Shared values that --intern-fragments stores once in FRAGMENTS_NAME
+SHARED_FRAGMENTS = {
+    "benefits": BENEFITS,
+    "how_it_works": HOW_IT_WORKS,
+    "nationwide_coverage": NATIONWIDE_COVERAGE,
+    "testimonials": TESTIMONIALS,
+    "cta_section": CTA_SECTION,
+    "related_pages": RELATED_PAGES,
+    "faq.cost": FAQ_COST,
+    "faq.start": FAQ_START,
+    "faq.results": FAQ_RESULTS,
+    "faq.contract": FAQ_CONTRACT,
+}
+
+
+# ---------------------------------------------------------------------------
+# Section builders: each takes (spec, images) and returns one top-level value
+# ---------------------------------------------------------------------------
+
+def build_keyword(spec, images):
+    return {
+        "primary_keyword": spec["keyword"],
+        "secondary_keywords": [f"{spec['keyword']} services", f"best {spec['keyword']}", f"affordable {spec['keyword']}"],
+        "keyword_slug": spec["id"]
+    }
+
+
+def build_industry_focus(spec, images):
+    return {
+        "industries": spec["industries"],
+        "business_types": [f"{ind} companies" for ind in spec["industries"][:3]]
+    }
+
+
+def build_seo(spec, images):
+    return {
+        "page_title": spec["title"],
+        "meta_description": spec["meta"],
+        "h1_heading": spec["h1"],
+        "keywords": [spec["keyword"].lower(), "capture client", "automation"]
+    }
+
+
+def build_hero(spec, images):
+    return {
+        "headline": spec["headline"],
+        "subheadline": spec["sub"],
+        "cta_primary": {"text": "Get Your Free Consultation", "action": f"tel:{PHONE}", "type": "phone"},
+        "hero_image": {
+            "url": images[0]["url"].replace("w=1200", "w=1920"),
+            "alt": images[0]["alt"],
+            "credit": {"photographer": "Unsplash Photographer", "unsplash_url": "https://unsplash.com"}
+        }
+    }
+
+
+def build_intro(spec, images):
+    return {"paragraph": spec["intro"]}
+
+
+def build_benefits(spec, images):
+    return BENEFITS
+
+
+def build_how_it_works(spec, images):
+    return HOW_IT_WORKS
+
+
+def build_industry_use_cases(spec, images):
+    industry = spec["industries"][0]
+    return [
+        {
+            "industry": industry,
+            "challenge": f"{industry} businesses struggle with inconsistent lead flow and high customer acquisition costs.",
+            "solution": "Our system generates qualified leads 24/7 and converts them automatically.",
+            "result": f"Average {industry} business sees 3-5x ROI within 60-90 days."
+        }
+    ]
+
+
+def build_nationwide_coverage(spec, images):
+    return NATIONWIDE_COVERAGE
+
+
+def build_testimonials(spec, images):
+    return TESTIMONIALS
+
+
+def build_faq(spec, images):
+    keyword = spec["keyword"]
+    industries = spec["industries"]
+    return [
+        {"question": f"How does {keyword} work?", "answer": f"{keyword} uses advanced technology to automate and optimize your sales and marketing processes for maximum efficiency and results."},
+        FAQ_COST,
+        FAQ_START,
+        {"question": "Do you work with businesses in my industry?", "answer": f"Yes we specialize in {industries[0]} {industries[1]} and {industries[2]} as well as many other service-based industries."},
+        FAQ_RESULTS,
+        FAQ_CONTRACT
+    ]
+
+
+def build_images(spec, images):
+    return {"gallery": images}
+
+
+def build_cta_section(spec, images):
+    return CTA_SECTION
+
+
+def build_related_pages(spec, images):
+    return RELATED_PAGES
+
+
+# Page layout: top-level key -> builder, in output order
+SECTION_BUILDERS = [
+    ("keyword", build_keyword),
+    ("industry_focus", build_industry_focus),
+    ("seo", build_seo),
+    ("hero", build_hero),
+    ("intro", build_intro),
+    ("benefits", build_benefits),
+    ("how_it_works", build_how_it_works),
+    ("industry_use_cases", build_industry_use_cases),
+    ("nationwide_coverage", build_nationwide_coverage),
+    ("testimonials", build_testimonials),
+    ("faq", build_faq),
+    ("images", build_images),
+    ("cta_section", build_cta_section),
+    ("related_pages", build_related_pages),
+]
+
+
+def resolve_images(spec, image_sets):
+    """A spec names an image set ("voice_ai") or lists images inline."""
+    images = spec.get("images", "voice_ai")
+    if isinstance(images, str):
+        return image_sets[images]
+    return images
+
+
+def render_page(spec, image_sets):
+    """Build one page dict from a spec.
+
+    A spec's optional "sections" mapping replaces builder output key by key,
+    for hand-written pages that only share the layout. "page_type" defaults
+    to "national-seo".
+    """
+    images = resolve_images(spec, image_sets)
+    overrides = spec.get("sections", {})
+    page = {"page_id": spec["id"], "page_type": spec.get("page_type", "national-seo")}
+    for key, builder in SECTION_BUILDERS:
+        page[key] = overrides[key] if key in overrides else builder(spec, images)
+    return page
+
+
+def serialize_page(page):
+    return json.dumps(page, indent=2).encode("utf-8")
+
+
+def fingerprint(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def canonical_json(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+class FragmentRegistry:
+    """Replaces shared page values with references into one fragments file.
+
+    Fragment ids are the registered name plus a content hash, so editing a
+    shared value changes the reference in every page that uses it and those
+    pages are rewritten (and revalidated) along with the fragments file.
+    Only values equal to a registered fragment are interned; page-specific
+    and hand-written content stays inline. The fragments file always holds
+    every registered fragment, so partial and resumed builds stay loadable.
+    """
+
+    def __init__(self, shared=None, image_sets=None):
+        self.fragments = {}
+        self.index = {}
+        for name, value in (shared or SHARED_FRAGMENTS).items():
+            self.register(name, value)
+        for name, images in (image_sets or {}).items():
+            self.register(f"images.{name}", images)
+
+    def register(self, name, value):
+        key = canonical_json(value)
+        fragment_id = f"{name}.{hashlib.sha256(key.encode('utf-8')).hexdigest()[:8]}"
+        self.index[key] = fragment_id
+        self.fragments[fragment_id] = value
+        return fragment_id
+
+    def ref(self, value):
+        fragment_id = self.index.get(canonical_json(value))
+        return value if fragment_id is None else {FRAGMENT_REF: fragment_id}
+
+    def intern_page(self, page):
+        """Return `page` with shared values replaced by references.
+
+        Checks each top-level section, then the items of list sections and
+        the values of object sections (FAQ entries, the image gallery).
+        """
+        interned = {}
+        for key, value in page.items():
+            value = self.ref(value)
+            if isinstance(value, list):
+                value = [self.ref(item) for item in value]
+            elif isinstance(value, dict) and FRAGMENT_REF not in value:
+                value = {k: self.ref(v) for k, v in value.items()}
+            interned[key] = value
+        return interned
+
+    def serialize(self):
+        return serialize_page(dict(sorted(self.fragments.items())))
+
+
+def page_file_name(spec):
+    """Output path relative to the output root; a spec's "shard" is a subdirectory."""
+    name = f"{spec['id']}.json"
+    return f"{spec['shard']}/{name}" if spec.get("shard") else name
+
+
+def page_route(name):
+    """The site route serving a page written as `name`, or None for "_" data files.
+
+    The [slug] route serves national pages (src/data/national/<id>.json) and
+    sharded long-tail pages (src/data/longtail/<keyword>/<id>.json) alike at
+    /<page id>.
+    """
+    path = Path(name)
+    if path.name.startswith("_"):
+        return None
+    return f"/{path.stem}"
+
+
+def render_serialized(spec, image_sets, registry=None):
+    """Process-pool task: render, serialize and fingerprint in the worker."""
+    page = render_page(spec, image_sets)
+    if registry is not None:
+        page = registry.intern_page(page)
+    data = serialize_page(page)
+    return page_file_name(spec), data, fingerprint(data)
+
+
+def load_specs(specs_file=DEFAULT_SPECS_FILE):
+    """Return (image_sets, page specs) from a spec file."""
+    with open(specs_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("image_sets", {}), data["pages"]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def atomic_write(path, data):
+    """Write via a temp file in the same directory and rename over `path`."""
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PageWriter:
+    """Writes rendered pages only when their bytes actually change.
+
+    Each page's fingerprint is checked against the manifest from the last
+    build (falling back to the file on disk when there is no entry), so
+    unchanged pages keep their mtime and downstream build caches stay valid.
+    finish() saves the manifest and a changed/unchanged summary for ISR
+    revalidation.
+    """
+
+    def __init__(self, output_root):
+        self.output_root = Path(output_root)
+        self.build_dir = self.output_root / BUILD_DIR_NAME
+        try:
+            with open(self.build_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.changed = []
+        self.unchanged = []
+
+    def is_current(self, path, name, data, digest):
+        if self.manifest.get(name) == digest:
+            try:
+                return path.stat().st_size == len(data)
+            except OSError:
+                return False
+        try:
+            return path.read_bytes() == data
+        except OSError:
+            return False
+
+    def write(self, name, data, digest):
+        """Write one page; returns (path, changed)."""
+        path = self.output_root / name
+        changed = not self.is_current(path, name, data, digest)
+        if changed:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, data)
+            self.changed.append(name)
+        else:
+            self.unchanged.append(name)
+        self.manifest[name] = digest
+        return path, changed
+
+    def save_manifest(self):
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.build_dir / MANIFEST_NAME, json.dumps(self.manifest, indent=2, sort_keys=True).encode("utf-8"))
+
+    def finish(self):
+        """Persist the manifest and the run summary; returns the summary."""
+        self.save_manifest()
+        summary = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "revalidate_paths": [route for route in map(page_route, self.changed) if route],
+        }
+        atomic_write(self.build_dir / SUMMARY_NAME, json.dumps(summary, indent=2).encode("utf-8"))
+        return summary
+
+
+def build_pages(specs, image_sets, output_root=DEFAULT_OUTPUT_ROOT, workers=None, batch_size=WRITE_BATCH_SIZE,
+                writer=None, registry=None):
+    """Render and write every spec; yields (path, changed) for each page.
+
+    `specs` may be any iterable, including a generator: it is consumed one
+    batch at a time, so only `batch_size` pages are ever held in memory.
+    Rendering goes through a process pool when `workers` > 1, runs inline
+    when it is 1, and by default switches to a pool once the first batch is
+    large enough to be worth it.
+
+    Pages go through `writer` (a PageWriter for `output_root` by default),
+    which skips unchanged files; call its finish() to save the manifest.
+
+    With a FragmentRegistry, shared sections are written once to
+    FRAGMENTS_NAME (yielded last) and referenced from each page.
+    """
+    output_root = Path(output_root)
+    output_root.mkdir(parents=True, exist_ok=True)
+    writer = writer or PageWriter(output_root)
+    task = partial(render_serialized, image_sets=image_sets, registry=registry)
+    pool = None
+    try:
+        for batch in batched(specs, batch_size):
+            use_pool = workers > 1 if workers else len(batch) >= PARALLEL_THRESHOLD
+            if pool is None and use_pool:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            if pool is not None:
+                chunksize = max(1, len(batch) // ((workers or os.cpu_count() or 1) * 4))
+                rendered = list(pool.map(task, batch, chunksize=chunksize))
+            else:
+                rendered = [task(spec) for spec in batch]
+            for name, data, digest in rendered:
+                yield writer.write(name, data, digest)
+        if registry is not None:
+            data = registry.serialize()
+            yield writer.write(FRAGMENTS_NAME, data, fingerprint(data))
+    finally:
+        if pool is not None:
+            pool.shutdown()
@@ -1,58 +1,150 @@
 #!/usr/bin/env python3
 """
-Batch replace phone numbers in location JSON files
+Batch replace phone numbers across the site data (capture-client-site/src/data)
 Replace 865-346-3339 with 865-346-6111 across all formats
+
+Every old number in PHONE_REPLACEMENTS is compiled into one regex that
+matches it in any common format - 865-346-3339, (865) 346-3339,
+865.346.3339, 8653463339, +1 865 346 3339, tel:+18653463339 - so each file
+is scanned once, and the replacement keeps the format it found. Files are
+edited as one batch_edit transaction: all of them change, or none do.
+
+Usage:
+  python replace_phone_numbers.py                      # apply PHONE_REPLACEMENTS
+  python replace_phone_numbers.py 865-346-3339 865-346-6111 [OLD NEW ...]
+  python replace_phone_numbers.py --dry-run            # show diffs only
 """
 
-import os
+import argparse
 import re
+import sys
+from functools import partial
 from pathlib import Path
 
-# Define the directory containing location JSON files
-locations_dir = Path("capture-client-site/src/data/locations")
+import batch_edit
+import location_data
+
+# Phone number mappings (old -> new); any format works, digits are what count
+PHONE_REPLACEMENTS = {
+    "865-346-3339": "865-346-6111",
+}
+
+# Text data files the numbers can appear in
+DATA_EXTENSIONS = (".json", ".ts")
+
+SEPARATOR = r"[\s.-]?"
+
+
+def national_digits(number):
+    """The 10-digit national number, with any +1 country code dropped."""
+    digits = re.sub(r"\D", "", number)
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    if len(digits) != 10:
+        raise ValueError(f"not a 10-digit US phone number: {number!r}")
+    return digits
+
+
+def number_pattern(digits):
+    area, exchange, line = digits[:3], digits[3:6], digits[6:]
+    return rf"(?:\({area}\)|{area}){SEPARATOR}{exchange}{SEPARATOR}{line}"
+
+
+class PhoneReplacer:
+    """Single-pass, format-preserving replacement of a set of phone numbers."""
+
+    def __init__(self, replacements):
+        self.mapping = {national_digits(old): national_digits(new) for old, new in replacements.items()}
+        alternatives = "|".join(number_pattern(digits) for digits in self.mapping)
+        # Optional +1 / 1 country code; never match inside a longer digit run
+        self.pattern = re.compile(rf"(?<!\d)(?:\+?1{SEPARATOR})?(?:{alternatives})(?!\d)")
+
+    def substitute(self, match):
+        text = match.group(0)
+        new_digits = iter(self.mapping[national_digits(text)])
+        # Rewrite the last 10 digits in place, keeping separators, parentheses
+        # and any country code exactly as they were
+        skip = sum(c.isdigit() for c in text) - 10
+        out = []
+        for c in text:
+            if c.isdigit():
+                if skip:
+                    skip -= 1
+                else:
+                    c = next(new_digits)
+            out.append(c)
+        return "".join(out)
 
-# Phone number mappings (old -> new)
-phone_replacements = [
-    ("865-346-3339", "865-346-6111"),
-    ("(865) 346-3339", "(865) 346-6111"),
-    ("8653463339", "8653466111"),
-]
+    def replace(self, content):
+        """Return (new content, number of replacements)."""
+        return self.pattern.subn(self.substitute, content)
 
-# Track changes
-files_modified = []
-total_replacements = 0
 
-# Process each JSON file
-for json_file in sorted(locations_dir.glob("voice-ai-*.json")):
+def iter_data_files(root=location_data.DATA_DIR):
+    for path in sorted(Path(root).rglob("*")):
+        if path.suffix in DATA_EXTENSIONS and path.is_file() and not batch_edit.is_staging_path(path):
+            yield path
+
+
+def edit_file(path, content, replacer):
+    """batch_edit edit function; the detail is the replacement count."""
+    new_content, count = replacer.replace(content)
+    return (new_content if count else None), count
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replace phone numbers across the site data files.")
+    parser.add_argument("numbers", nargs="*", metavar="OLD NEW",
+                        help="pairs of old and new numbers (default: PHONE_REPLACEMENTS)")
+    parser.add_argument("--root", default=location_data.DATA_DIR,
+                        help="directory to process (default: %(default)s)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show the diffs without writing any file")
+    parser.add_argument("--timings", action="store_true",
+                        help="print how long each file took")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: automatic; 1 runs inline)")
+    args = parser.parse_args(argv)
+    if len(args.numbers) % 2:
+        parser.error("numbers must be given as OLD NEW pairs")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pairs = dict(zip(args.numbers[::2], args.numbers[1::2])) or PHONE_REPLACEMENTS
     try:
-        # Read the file
-        content = json_file.read_text(encoding='utf-8')
-        original_content = content
-        file_replacements = 0
-
-        # Apply each replacement
-        for old_phone, new_phone in phone_replacements:
-            count = content.count(old_phone)
-            if count > 0:
-                content = content.replace(old_phone, new_phone)
-                file_replacements += count
-
-        # Write back only if changes were made
-        if content != original_content:
-            json_file.write_text(content, encoding='utf-8')
-            files_modified.append((json_file.name, file_replacements))
-            total_replacements += file_replacements
-            print(f"[OK] {json_file.name} - {file_replacements} replacements")
-
-    except Exception as e:
-        print(f"[ERROR] Error processing {json_file.name}: {e}")
-
-# Summary
-print("\n" + "="*60)
-print(f"BATCH REPLACEMENT COMPLETE")
-print("="*60)
-print(f"Files modified: {len(files_modified)}")
-print(f"Total replacements: {total_replacements}")
-print("\nModified files:")
-for filename, count in files_modified:
-    print(f"  - {filename} ({count} replacements)")
+        replacer = PhoneReplacer(pairs)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    root = Path(args.root)
+    try:
+        result = batch_edit.run_batch(iter_data_files(root), partial(edit_file, replacer=replacer),
+                                      workers=args.workers, dry_run=args.dry_run)
+    except batch_edit.BatchEditError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    files_modified = []
+    for edit in result.changed:
+        files_modified.append((edit.path.relative_to(root), edit.detail))
+        print(f"[OK] {edit.path.name} - {edit.detail} replacements")
+    batch_edit.print_report(result, root, diff=args.dry_run, timings=args.timings)
+
+    # Summary
+    print("\n" + "=" * 60)
+    print("BATCH REPLACEMENT " + ("DRY RUN" if args.dry_run else "COMPLETE"))
+    print("=" * 60)
+    print(f"Files {'to modify' if args.dry_run else 'modified'}: {len(files_modified)}")
+    print(f"Total replacements: {sum(count for _, count in files_modified)}")
+    if files_modified:
+        print("\nModified files:")
+        for filename, count in files_modified:
+            print(f"  - {filename} ({count} replacements)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
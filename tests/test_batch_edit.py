@@ -0,0 +1,138 @@
+"""batch_edit.run_batch: staging, the rename swap, rollback and the mtime conflict check."""
+
+import json
+import os
+from functools import partial
+
+import pytest
+
+import batch_edit
+
+
+def bump_count(path, text):
+    data = json.loads(text)
+    if "count" not in data:
+        return None, 0
+    data["count"] += 1
+    return json.dumps(data), data["count"]
+
+
+def break_json(path, text):
+    return text.rstrip("}"), None
+
+
+def fail_on(name, path, text):
+    if path.name == name:
+        raise ValueError("no good")
+    return bump_count(path, text)
+
+
+def write_files(tmp_path, count=3, **extra):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"page-{i}.json"
+        path.write_text(json.dumps({"count": i}), encoding="utf-8")
+        paths.append(path)
+    for name, text in extra.items():
+        path = tmp_path / f"{name}.json"
+        path.write_text(text, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def contents(paths):
+    return [path.read_text(encoding="utf-8") for path in paths]
+
+
+def staging_dirs(tmp_path):
+    return [path for path in tmp_path.iterdir() if path.name.startswith(batch_edit.STAGING_PREFIX)]
+
+
+def test_commits_changed_files_and_leaves_the_rest(tmp_path):
+    paths = write_files(tmp_path, other='{"title": "x"}')
+    untouched = paths[-1].stat().st_mtime_ns
+
+    result = batch_edit.run_batch(paths, bump_count, workers=1)
+
+    assert result.committed
+    assert [edit.path for edit in result.changed] == paths[:3]
+    assert [json.loads(text) for text in contents(paths[:3])] == [{"count": 1}, {"count": 2}, {"count": 3}]
+    assert paths[-1].stat().st_mtime_ns == untouched
+    assert staging_dirs(tmp_path) == []
+
+
+def test_pool_gives_the_same_result(tmp_path):
+    paths = write_files(tmp_path, count=6)
+    result = batch_edit.run_batch(paths, bump_count, workers=2)
+    assert [edit.detail for edit in result.edits] == [1, 2, 3, 4, 5, 6]
+
+
+def test_dry_run_writes_nothing_and_reports_diffs(tmp_path, capsys):
+    paths = write_files(tmp_path)
+    before = contents(paths)
+
+    result = batch_edit.run_batch(paths, bump_count, workers=1, dry_run=True)
+    batch_edit.print_report(result, tmp_path, diff=True)
+
+    assert contents(paths) == before and not result.committed
+    out = capsys.readouterr().out
+    assert '+{"count": 1}' in out and "3 files checked, 3 would change" in out
+
+
+@pytest.mark.parametrize("edit", [break_json, partial(fail_on, "page-1.json")])
+def test_a_failing_file_rolls_back_the_whole_batch(tmp_path, edit):
+    paths = write_files(tmp_path)
+    before = contents(paths)
+
+    with pytest.raises(batch_edit.BatchEditError, match="nothing written"):
+        batch_edit.run_batch(paths, edit, workers=1)
+
+    assert contents(paths) == before
+    assert staging_dirs(tmp_path) == []
+
+
+def test_a_failed_rename_restores_the_files_already_swapped(tmp_path, monkeypatch):
+    paths = write_files(tmp_path)
+    before = contents(paths)
+    real_replace = os.replace
+    calls = []
+
+    def flaky_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", flaky_replace)
+    with pytest.raises(batch_edit.BatchEditError, match="rolled back"):
+        batch_edit.run_batch(paths, bump_count, workers=1)
+
+    assert contents(paths) == before
+    assert staging_dirs(tmp_path) == []
+
+
+def test_a_file_changed_during_the_batch_aborts_the_commit(tmp_path):
+    paths = write_files(tmp_path)
+
+    def edit_and_touch(path, text):
+        if path == paths[2]:
+            # Someone else saves page-0 after the batch has read it
+            paths[0].write_text('{"count": 99}', encoding="utf-8")
+            os.utime(paths[0], ns=(paths[0].stat().st_atime_ns, paths[0].stat().st_mtime_ns + 10**9))
+        return bump_count(path, text)
+
+    with pytest.raises(batch_edit.BatchEditError, match="changed on disk"):
+        batch_edit.run_batch(paths, edit_and_touch, workers=1)
+
+    assert json.loads(paths[0].read_text(encoding="utf-8")) == {"count": 99}
+    assert [json.loads(text) for text in contents(paths[1:])] == [{"count": 1}, {"count": 2}]
+    assert staging_dirs(tmp_path) == []
+
+
+def test_line_endings_survive_the_round_trip(tmp_path):
+    path = tmp_path / "page.json"
+    path.write_bytes(b'{\r\n  "count": 1\r\n}\r\n')
+
+    batch_edit.run_batch([path], lambda path, text: (text.replace("1", "2"), None), workers=1)
+
+    assert path.read_bytes() == b'{\r\n  "count": 2\r\n}\r\n'
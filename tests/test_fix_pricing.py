@@ -0,0 +1,77 @@
+"""fix-pricing.py: selector rules spliced into the original text."""
+
+import importlib.util
+import json
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+
+spec = importlib.util.spec_from_file_location("fix_pricing", REPO_ROOT / "fix-pricing.py")
+fix_pricing = importlib.util.module_from_spec(spec)
+sys.modules["fix_pricing"] = fix_pricing
+spec.loader.exec_module(fix_pricing)
+
+PAGE = """{
+  "title": "Plans from $999",
+  "packages": [
+    {"name": "Starter", "price": "$999", "period": "per month", "sizes": [1, 2, 3]},
+    {"name": "Growth", "price": "$1,997", "note": "was $9,999 or $999.50"},
+    {"name": "Enterprise", "price": "Custom", "period": "pricing"}
+  ],
+  "faq": [{"answer": "Custom plans start at $999"}]
+}
+"""
+
+
+def test_rewrite_splices_only_the_changed_values():
+    new_text, changes = fix_pricing.rewrite_text("page.json", PAGE)
+
+    assert new_text == (PAGE
+                        .replace("Plans from $999", "Plans from $97")
+                        .replace('"price": "$999"', '"price": "$97"')
+                        .replace('"$1,997"', '"$797"')
+                        .replace('"Custom"', '"$2,997"')
+                        .replace('"pricing"', '"per month"')
+                        .replace("start at $999", "start at $97"))
+    assert {field for field, *_ in changes} == {
+        "title", "packages[0].price", "packages[1].price", "packages[2].price",
+        "packages[2].period", "faq[0].answer",
+    }
+
+
+@pytest.mark.parametrize("value", ["$999.50", "$9,999", "$1,9999", "US$999", "$9990"])
+def test_longer_amounts_are_left_alone(value):
+    text = json.dumps({"price": value})
+    assert fix_pricing.rewrite_text("page.json", text) == (None, [])
+
+
+def test_exact_rules_only_match_the_whole_value():
+    text = json.dumps({"price": "Custom quote", "faq": {"price": "Custom"}, "label": "Custom"})
+    new_text, changes = fix_pricing.rewrite_text("page.json", text)
+
+    assert json.loads(new_text) == {"price": "Custom quote", "faq": {"price": "$2,997"}, "label": "Custom"}
+    assert [field for field, *_ in changes] == ["faq.price"]
+
+
+@pytest.mark.parametrize("selector, tokens", [
+    ("packages[*].price", ("packages", "[*]", "price")),
+    ("faq[2].answer", ("faq", 2, "answer")),
+    ("**.price", ("**", "price")),
+])
+def test_parse_selector(selector, tokens):
+    assert fix_pricing.parse_selector(selector) == tokens
+
+
+def test_field_main_rewrites_files_in_one_batch(tmp_path):
+    (tmp_path / "locations").mkdir()
+    page = tmp_path / "locations" / "knoxville.json"
+    page.write_text(PAGE, encoding="utf-8")
+    clean = tmp_path / "clean.json"
+    clean.write_text('{"price": "$97"}\n', encoding="utf-8")
+
+    assert fix_pricing.field_main(tmp_path, workers=1) == (1, 0)
+
+    assert '"price": "$97"' in page.read_text(encoding="utf-8")
+    assert clean.read_text(encoding="utf-8") == '{"price": "$97"}\n'
@@ -0,0 +1,87 @@
+"""location_images.run() against a local http.server stand-in for images.unsplash.com."""
+
+import io
+import json
+import shutil
+
+import pytest
+
+import location_data
+import location_images
+
+PIL = pytest.importorskip("PIL.Image")
+
+PAGES = {"akron-oh": "photo-good", "alexandria-va": "photo-broken", "alpharetta-ga": "photo-missing"}
+
+
+def remote_url(name):
+    return f"{location_images.SOURCE_BASE}/{name}?ixlib=rb-4.1.0&w=1920&q=80"
+
+
+@pytest.fixture
+def locations_dir(tmp_path):
+    """Copies of three location pages whose heroes point at the stand-in's photos."""
+    directory = tmp_path / "locations"
+    directory.mkdir()
+    for slug, photo in PAGES.items():
+        path = directory / location_data.path_for_slug(slug).name
+        shutil.copy(location_data.path_for_slug(slug), path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for image in location_images.hero_entries(data):
+            image["url"] = remote_url(photo)
+            for key in location_images.LOCALIZED_FIELDS:
+                image.pop(key, None)
+        path.write_text(location_data.dumps(data), encoding="utf-8")
+    return directory
+
+
+def hero(locations_dir, slug):
+    path = locations_dir / location_data.path_for_slug(slug).name
+    return location_images.hero_entries(json.loads(path.read_text(encoding="utf-8")))[0]
+
+
+def test_run_localizes_good_photos_and_reports_the_rest(tmp_path, stand_in, locations_dir, capsys):
+    served, base = stand_in
+    buffer = io.BytesIO()
+    PIL.new("RGB", (800, 500), (20, 120, 200)).save(buffer, "JPEG")
+    (served / "photo-good").write_bytes(buffer.getvalue())
+    (served / "photo-broken").write_bytes(b"not an image")
+    output_dir = tmp_path / "assets"
+
+    status = location_images.run(output_dir=output_dir, source_base=base, widths=(320, 640), workers=1,
+                                 locations_dir=locations_dir)
+
+    assert status == 1
+    errors = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[ERROR]")]
+    assert any("photo-broken" in line for line in errors)
+    assert any("photo-missing" in line and "404" in line for line in errors)
+
+    index = json.loads((output_dir / location_images.INDEX_NAME).read_text(encoding="utf-8"))
+    assert list(index) == [remote_url("photo-good")]
+
+    image = hero(locations_dir, "akron-oh")
+    record = index[remote_url("photo-good")]
+    assert image["url"] == record["src"] and image["source_url"] == remote_url("photo-good")
+    assert (image["width"], image["height"]) == (640, 400)
+    assert set(image["srcset"]) == set(location_images.FORMATS)
+    assert (output_dir / image["url"].rsplit("/", 1)[-1]).is_file()
+    assert image["blur_data_url"].startswith("data:image/webp;base64,")
+
+    assert hero(locations_dir, "alexandria-va")["url"] == remote_url("photo-broken")
+    assert hero(locations_dir, "alpharetta-ga")["url"] == remote_url("photo-missing")
+
+
+def test_rerun_after_localizing_fetches_nothing(tmp_path, stand_in, locations_dir):
+    served, base = stand_in
+    buffer = io.BytesIO()
+    PIL.new("RGB", (400, 300), (200, 30, 30)).save(buffer, "PNG")
+    for photo in PAGES.values():
+        (served / photo).write_bytes(buffer.getvalue())
+    output_dir = tmp_path / "assets"
+    assert location_images.run(output_dir=output_dir, source_base=base, widths=(320,), workers=1,
+                               locations_dir=locations_dir) == 0
+
+    for photo in PAGES.values():
+        (served / photo).unlink()  # a second fetch would now 404
+    assert location_images.run(output_dir=output_dir, source_base=base, widths=(320,), workers=1,
+                               locations_dir=locations_dir) == 0
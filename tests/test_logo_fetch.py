@@ -0,0 +1,53 @@
+"""logo_fetch.LogoFetcher.fetch_to_file against a local http.server stand-in."""
+
+from logo_fetch import COPIED, DOWNLOADED, NOT_MODIFIED, LogoCache, LogoFetcher
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+def fetcher_for(tmp_path):
+    return LogoFetcher(workers=2, rate=0, cache=LogoCache(tmp_path / "cache.json"))
+
+
+def test_refetch_revalidates_in_place(tmp_path, stand_in):
+    served, base = stand_in
+    (served / "logo.png").write_bytes(PNG)
+    fetcher = fetcher_for(tmp_path)
+
+    first = fetcher.fetch_to_file(f"{base}/logo.png", tmp_path / "a.png")
+    second = fetcher.fetch_to_file(f"{base}/logo.png", tmp_path / "a.png")
+
+    assert (first.status, second.status) == (DOWNLOADED, NOT_MODIFIED)
+    assert second.path == tmp_path / "a.png"
+
+
+def test_same_url_under_another_name_is_written(tmp_path, stand_in):
+    served, base = stand_in
+    (served / "logo.png").write_bytes(PNG)
+    fetcher = fetcher_for(tmp_path)
+
+    fetcher.fetch_to_file(f"{base}/logo.png", tmp_path / "a.png")
+    result = fetcher.fetch_to_file(f"{base}/logo.png", tmp_path / "b.png")
+
+    assert result.status == COPIED and result.written
+    assert result.path == tmp_path / "b.png"
+    assert (tmp_path / "b.png").read_bytes() == PNG
+    assert (tmp_path / "a.png").read_bytes() == PNG
+
+
+def test_callable_path_sees_the_cached_content_on_304(tmp_path, stand_in):
+    served, base = stand_in
+    (served / "logo").write_bytes(PNG)
+    fetcher = fetcher_for(tmp_path)
+    seen = []
+
+    def target(content_type, content):
+        seen.append(content)
+        return tmp_path / f"logo-{len(seen)}.png"
+
+    fetcher.fetch_to_file(f"{base}/logo", target)
+    result = fetcher.fetch_to_file(f"{base}/logo", target)
+
+    assert seen == [PNG, PNG]
+    assert result.status == COPIED
+    assert (tmp_path / "logo-2.png").read_bytes() == PNG
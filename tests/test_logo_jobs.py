@@ -0,0 +1,95 @@
+"""logo_jobs.JobQueue: claiming, leases, resuming an interrupted run and refreshing a finished one."""
+
+import requests
+
+from logo_jobs import DEAD, DONE, FAILED, PENDING, JobQueue
+
+QUEUE = "test"
+
+
+def make_queue(tmp_path, **kwargs):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", **kwargs)
+    queue.enqueue(QUEUE, [(key, f"https://example.com/{key}.png", None) for key in ("a", "b", "c")])
+    return queue
+
+
+def states(queue):
+    return {job["key"]: job["state"] for job in queue.jobs(QUEUE)}
+
+
+def queue_result(queue, key):
+    return next(job["result"] for job in queue.jobs(QUEUE) if job["key"] == key)
+
+
+def not_found():
+    response = requests.Response()
+    response.status_code = 404
+    return requests.HTTPError("404", response=response)
+
+
+def test_claim_leases_each_job_once(tmp_path):
+    queue = make_queue(tmp_path)
+    first = queue.claim(QUEUE, 2)
+    second = queue.claim(QUEUE, 2)
+    assert [job.key for job in first] == ["a", "b"]
+    assert [job.key for job in second] == ["c"]
+    assert queue.claim(QUEUE, 2) == []
+
+
+def test_expired_lease_is_reclaimed_and_the_old_worker_cannot_finish(tmp_path):
+    stale = make_queue(tmp_path, lease=-1)
+    [job] = stale.claim(QUEUE, 1)
+    other = JobQueue(tmp_path / "jobs.sqlite3")
+    other.worker = "elsewhere:1"
+
+    [reclaimed] = other.claim(QUEUE, 1)
+
+    assert reclaimed.key == job.key
+    assert not stale.complete(job, {"from": "stale"})
+    assert not stale.fail(job, RuntimeError("late"))
+    assert other.complete(reclaimed, {"from": "other"})
+    assert queue_result(other, job.key) == {"from": "other"}
+
+
+def test_failures_back_off_and_404_is_dead(tmp_path):
+    queue = make_queue(tmp_path)
+    a, b, c = queue.claim(QUEUE, 3)
+    queue.fail(a, RuntimeError("timeout"))
+    queue.fail(b, not_found())
+    queue.complete(c)
+    assert states(queue) == {"a": FAILED, "b": DEAD, "c": DONE}
+    assert queue.claim(QUEUE, 3) == []
+
+
+def test_interrupted_run_resumes_without_redoing_done_jobs(tmp_path):
+    queue = make_queue(tmp_path)
+    a, b, c = queue.claim(QUEUE, 3)
+    queue.complete(a)
+    queue.release([b, c])  # Ctrl-C
+
+    assert queue.start_run(QUEUE) == 0
+    assert [job.key for job in queue.claim(QUEUE, 3)] == ["b", "c"]
+
+
+def test_crashed_worker_is_recovered_then_resumed(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.claim(QUEUE, 3)
+    queue.worker = queue.worker.rsplit(":", 1)[0] + ":999999999"  # a PID that cannot exist
+    queue.db.execute("UPDATE jobs SET worker = ?", (queue.worker,))
+
+    assert queue.recover(QUEUE) == 3
+    assert queue.start_run(QUEUE) == 0
+    assert set(states(queue).values()) == {PENDING}
+
+
+def test_finished_run_is_refreshed_on_the_next_start(tmp_path):
+    queue = make_queue(tmp_path)
+    a, b, c = queue.claim(QUEUE, 3)
+    queue.complete(a, {"local_path": "a.png"})
+    queue.complete(b)
+    queue.fail(c, not_found())
+
+    assert queue.start_run(QUEUE) == 2
+    assert states(queue) == {"a": PENDING, "b": PENDING, "c": DEAD}
+    assert queue_result(queue, "a") == {"local_path": "a.png"}
+    assert [job.key for job in queue.claim(QUEUE, 3)] == ["a", "b"]
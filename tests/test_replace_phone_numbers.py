@@ -0,0 +1,58 @@
+"""replace_phone_numbers: one regex pass per file that keeps each number's format."""
+
+import json
+
+import pytest
+
+import replace_phone_numbers
+from replace_phone_numbers import PhoneReplacer
+
+
+@pytest.mark.parametrize("old, new", [
+    ("865-346-3339", "865-346-6111"),
+    ("(865) 346-3339", "(865) 346-6111"),
+    ("865.346.3339", "865.346.6111"),
+    ("8653463339", "8653466111"),
+    ("+1 865 346 3339", "+1 865 346 6111"),
+    ("tel:+18653463339", "tel:+18653466111"),
+    ("1-865-346-3339", "1-865-346-6111"),
+])
+def test_keeps_the_format_it_found(old, new):
+    replacer = PhoneReplacer({"865-346-3339": "865-346-6111"})
+    assert replacer.replace(f"Call {old} today") == (f"Call {new} today", 1)
+
+
+def test_every_number_is_replaced_in_one_pass():
+    replacer = PhoneReplacer({"865-346-3339": "865-346-6111", "(423) 555-0100": "423.555.0199"})
+    # A swap must not chain: the first number's new value is not rewritten again
+    chained = PhoneReplacer({"865-346-3339": "865-346-6111", "865-346-6111": "865-346-0000"})
+
+    assert replacer.replace("865-346-3339 / 423-555-0100") == ("865-346-6111 / 423-555-0199", 2)
+    assert chained.replace("865-346-3339 865-346-6111") == ("865-346-6111 865-346-0000", 2)
+
+
+@pytest.mark.parametrize("text", ["98653463339", "86534633391", "865-346-33390", "order 18653463339000"])
+def test_leaves_longer_digit_runs_alone(text):
+    assert PhoneReplacer({"865-346-3339": "865-346-6111"}).replace(text) == (text, 0)
+
+
+def test_rejects_numbers_that_are_not_ten_digits():
+    with pytest.raises(ValueError, match="10-digit"):
+        PhoneReplacer({"346-3339": "346-6111"})
+
+
+def test_main_rewrites_only_the_files_that_mention_the_number(tmp_path, capsys):
+    (tmp_path / "nested").mkdir()
+    hit = tmp_path / "nested" / "knoxville.json"
+    hit.write_text(json.dumps({"phone": "(865) 346-3339", "tel": "tel:+18653463339"}), encoding="utf-8")
+    miss = tmp_path / "other.ts"
+    miss.write_text('export const phone = "423-555-0100";\n', encoding="utf-8")
+    skipped = tmp_path / "notes.md"
+    skipped.write_text("865-346-3339\n", encoding="utf-8")
+
+    assert replace_phone_numbers.main(["--root", str(tmp_path), "--workers", "1"]) == 0
+
+    assert json.loads(hit.read_text(encoding="utf-8")) == {"phone": "(865) 346-6111", "tel": "tel:+18653466111"}
+    assert miss.read_text(encoding="utf-8") == 'export const phone = "423-555-0100";\n'
+    assert skipped.read_text(encoding="utf-8") == "865-346-3339\n"
+    assert "Total replacements: 2" in capsys.readouterr().out
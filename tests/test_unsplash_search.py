@@ -0,0 +1,46 @@
+"""unsplash_search.search_all: the cache, and a rate limit that only applies to the network."""
+
+import json
+
+import unsplash_search
+from unsplash_search import FixtureBackend, SearchCache, UnsplashBackend, search_all
+
+RESULTS = {"results": [{"id": "abc123", "likes": 10}]}
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.waits = 0
+
+    def wait(self):
+        self.waits += 1
+
+
+def test_fixture_backend_is_not_throttled(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    fixtures.mkdir()
+    (fixtures / "default.json").write_text(json.dumps(RESULTS), encoding="utf-8")
+    limiter = CountingLimiter()
+
+    responses, errors, fetched = search_all(FixtureBackend(fixtures), ["a", "b"], SearchCache(tmp_path / "cache"), limiter)
+
+    assert (fetched, errors, limiter.waits) == (2, {}, 0)
+    assert responses["a"] == RESULTS["results"]
+
+
+def test_unsplash_backend_waits_for_every_request_and_caches(tmp_path, stand_in):
+    served, base_url = stand_in
+    (served / "search").mkdir()
+    (served / "search" / "photos").write_text(json.dumps(RESULTS), encoding="utf-8")
+    backend = UnsplashBackend(api_base=base_url)
+    cache = SearchCache(tmp_path / "cache")
+    limiter = CountingLimiter()
+
+    assert search_all(backend, ["a", "b"], cache, limiter)[1:] == ({}, 2)
+    assert limiter.waits == 2
+    assert search_all(backend, ["a", "b"], cache, limiter) == ({"a": RESULTS["results"], "b": RESULTS["results"]}, {}, 0)
+    assert limiter.waits == 2
+
+
+def test_default_rate_fits_the_demo_tier():
+    assert unsplash_search.DEFAULT_RATE * 3600 <= 50
@@ -0,0 +1,58 @@
+"""update_local_images.py against a hero image location_images.py has already localized."""
+
+import json
+
+import location_data
+import location_images
+import update_local_images
+
+OLD_PHOTO = "1500000000000-0123456789ab"
+NEW_PHOTO = "1600000000000-ba9876543210"
+
+
+def localized_page(tmp_path):
+    """A copy of a real location page whose hero is a localized OLD_PHOTO."""
+    source = location_data.path_for_slug("akron-oh")
+    data = json.loads(source.read_text(encoding="utf-8"))
+    image = location_data.hero_image(data)
+    image["url"] = f"https://images.unsplash.com/photo-{OLD_PHOTO}?ixlib=rb-4.1.0&w=1920&q=80"
+    location_images.localize(image, {
+        "src": "/images/locations/old.jpg",
+        "width": 1920,
+        "height": 1280,
+        "srcset": "/images/locations/old-640.jpg 640w, /images/locations/old.jpg 1920w",
+        "blur_data_url": "data:image/jpeg;base64,AAAA",
+        "blurhash": "LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+    })
+    path = tmp_path / source.name
+    text = location_data.dumps(data)
+    path.write_text(text, encoding="utf-8")
+    return path, text
+
+
+def test_hero_photo_id_of_localized_hero_comes_from_source_url(tmp_path):
+    _, text = localized_page(tmp_path)
+    assert update_local_images.hero_photo_id(json.loads(text)) == OLD_PHOTO
+
+
+def test_updating_localized_hero_drops_old_photo_fields(tmp_path):
+    path, text = localized_page(tmp_path)
+    updates = {"akron-oh": (NEW_PHOTO, "Jane Doe", "janedoe")}
+
+    new_text, detail = update_local_images.edit_hero_image(path, text, updates)
+
+    assert detail == ("akron-oh", OLD_PHOTO, NEW_PHOTO)
+    image = location_data.hero_image(json.loads(new_text))
+    assert NEW_PHOTO in image["url"]
+    for key in location_images.LOCALIZED_FIELDS:
+        assert key not in image
+    assert image["credit"]["photographer"] == "Jane Doe"
+
+
+def test_remote_url_wins_over_stale_source_url(tmp_path):
+    _, text = localized_page(tmp_path)
+    data = json.loads(text)
+    image = location_data.hero_image(data)
+    image["url"] = f"https://images.unsplash.com/photo-{NEW_PHOTO}?w=1920"
+
+    assert update_local_images.hero_photo_id(data) == NEW_PHOTO
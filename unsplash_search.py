@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Search Unsplash for every LOCATION_LANDMARKS entry and rank the candidates.
+
+Each landmark's primary and alternative searches are sent to a search
+backend concurrently (the Unsplash API under a shared rate limit), and
+every response is cached on disk for --ttl hours, so a re-run only
+queries entries whose cache has expired. The results are merged per location, ranked, and
+printed as a table; --prefill fills the REPLACE_ME rows of the image CSV
+with each location's best candidate, ready for
+`python update_local_images.py update LOCAL_IMAGES_TO_UPDATE.csv`.
+
+Backends:
+  unsplash   the Unsplash search API (needs UNSPLASH_ACCESS_KEY); --api-base
+             points it at a stand-in server with the same /search/photos API
+  fixtures   canned responses from --fixtures DIR, one <query-slug>.json
+             per query (default.json for anything else)
+
+Usage:
+  python unsplash_search.py --top 3
+  python unsplash_search.py chattanooga-tn knoxville-tn --refresh
+  python unsplash_search.py --backend fixtures --fixtures fx/ --prefill LOCAL_IMAGES_TO_UPDATE.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import location_data
+from update_local_images import LOCATION_LANDMARKS, PHOTO_URL_PATTERN, PLACEHOLDER, hero_photo_id
+
+try:
+    import requests
+except ImportError:  # only the unsplash backend needs it
+    requests = None
+
+API_BASE = "https://api.unsplash.com"
+CACHE_DIR = location_data.BASE_DIR / ".cache" / "unsplash-search"
+DEFAULT_CSV = location_data.BASE_DIR / "LOCAL_IMAGES_TO_UPDATE.csv"
+DEFAULT_TTL_HOURS = 7 * 24
+PER_PAGE = 10
+SEARCH_WORKERS = 4
+# The demo tier allows 50 requests an hour; pass --rate for a production key
+DEFAULT_RATE = 50 / 3600
+MAX_RETRIES = 3
+TIMEOUT = 30
+
+ALT_SEARCH_WEIGHT = 0.85
+REUSED_PENALTY = 0.3
+
+
+class SearchError(Exception):
+    """A backend could not answer a query."""
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class UnsplashBackend:
+    """GET /search/photos on the Unsplash API (or a stand-in at `api_base`)."""
+    name = "unsplash"
+    rate_limited = True
+
+    def __init__(self, access_key=None, api_base=API_BASE):
+        if requests is None:
+            raise SearchError("requests is required for the unsplash backend: pip install requests")
+        self.api_base = api_base.rstrip("/")
+        self.session = requests.Session()
+        self.session.headers["Accept-Version"] = "v1"
+        if access_key:
+            self.session.headers["Authorization"] = f"Client-ID {access_key}"
+
+    def search(self, query, per_page=PER_PAGE):
+        params = {"query": query, "per_page": per_page, "orientation": "landscape"}
+        for attempt in range(MAX_RETRIES + 1):
+            response = self.session.get(f"{self.api_base}/search/photos", params=params, timeout=TIMEOUT)
+            if response.status_code not in (403, 429) or attempt == MAX_RETRIES:
+                break
+            # Rate limited: wait as told, else back off exponentially
+            time.sleep(float(response.headers.get("Retry-After") or 2 ** attempt))
+        if response.status_code != 200:
+            raise SearchError(f"{query!r}: HTTP {response.status_code} {response.text[:200]}")
+        return response.json().get("results", [])
+
+
+class FixtureBackend:
+    """Canned search responses: <dir>/<slug of query>.json, else <dir>/default.json."""
+    name = "fixtures"
+    rate_limited = False
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def search(self, query, per_page=PER_PAGE):
+        slug = re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")
+        for name in (f"{slug}.json", "default.json"):
+            path = self.directory / name
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f).get("results", [])[:per_page]
+        raise SearchError(f"{query!r}: no fixture {slug}.json or default.json in {self.directory}")
+
+
+# ---------------------------------------------------------------------------
+# Rate limit and cache
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Spaces calls to wait() at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class SearchCache:
+    """One JSON file per (backend, query); entries older than `ttl` seconds are stale."""
+
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL_HOURS * 3600):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def path(self, backend, query, per_page):
+        key = hashlib.sha1(f"{backend}\0{query}\0{per_page}".encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def get(self, backend, query, per_page):
+        try:
+            with open(self.path(backend, query, per_page), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("fetched_at", 0) > self.ttl:
+            return None
+        return entry["results"]
+
+    def put(self, backend, query, per_page, results):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(backend, query, per_page)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"query": query, "backend": backend, "fetched_at": time.time(), "results": results}, f)
+        os.replace(tmp, path)
+
+    def evict(self):
+        """Delete expired entries; returns how many were removed."""
+        removed = 0
+        now = time.time()
+        for path in self.directory.glob("*.json") if self.directory.exists() else []:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    fetched_at = json.load(f).get("fetched_at", 0)
+            except (OSError, ValueError):
+                fetched_at = 0
+            if now - fetched_at > self.ttl:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+# ---------------------------------------------------------------------------
+# Ranking
+# ---------------------------------------------------------------------------
+
+def candidate(result, query, weight):
+    """Flatten one search result into a candidate row (None without an image URL)."""
+    urls = result.get("urls") or {}
+    match = PHOTO_URL_PATTERN.search(urls.get("raw") or urls.get("regular") or "")
+    if not match:
+        return None
+    user = result.get("user") or {}
+    return {
+        "photo_id": match.group(1),
+        "page_id": result.get("id"),
+        "photographer": user.get("name", ""),
+        "username": user.get("username", ""),
+        "width": result.get("width") or 0,
+        "height": result.get("height") or 0,
+        "likes": result.get("likes") or 0,
+        "description": result.get("alt_description") or result.get("description") or "",
+        "query": query,
+        "weight": weight,
+    }
+
+
+def score(row, terms, used_elsewhere):
+    """0..1: landmark words in the description, landscape, resolution, likes."""
+    text = row["description"].lower()
+    text_match = sum(term in text for term in terms) / len(terms) if terms else 0
+    landscape = 1.0 if row["width"] > row["height"] else 0.0
+    resolution = 1.0 if row["width"] >= 1920 else row["width"] / 1920
+    popularity = min(1.0, math.log10(row["likes"] + 1) / 3)
+    value = 0.45 * text_match + 0.2 * landscape + 0.15 * resolution + 0.2 * popularity
+    value *= row["weight"]
+    if row["photo_id"] in used_elsewhere:
+        value -= REUSED_PENALTY
+    return round(value, 3)
+
+
+def rank(slug, info, responses, used_by):
+    """Merge the responses for one location into candidates, best first."""
+    terms = [word for word in re.findall(r"[a-z]+", f"{info['landmark']} {slug}".lower()) if len(word) > 2]
+    used_elsewhere = {photo for photo, slugs in used_by.items() if slugs - {slug}}
+    best = {}
+    for query, weight in queries_for(info):
+        for result in responses.get(query, []):
+            row = candidate(result, query, weight)
+            if row is None:
+                continue
+            row["score"] = score(row, terms, used_elsewhere)
+            if row["photo_id"] not in best or row["score"] > best[row["photo_id"]]["score"]:
+                best[row["photo_id"]] = row
+    return sorted(best.values(), key=lambda row: row["score"], reverse=True)
+
+
+def queries_for(info):
+    return [(info["search"], 1.0)] + [(alt, ALT_SEARCH_WEIGHT) for alt in info.get("alt_searches", [])]
+
+
+# ---------------------------------------------------------------------------
+# Run
+# ---------------------------------------------------------------------------
+
+def search_all(backend, queries, cache, limiter, per_page=PER_PAGE, workers=SEARCH_WORKERS, refresh=False):
+    """Answer every query from the cache or the backend; returns (responses, errors, fetched).
+
+    `limiter` only spaces requests to backends that go over the network.
+    """
+    responses = {}
+    todo = []
+    for query in queries:
+        cached = None if refresh else cache.get(backend.name, query, per_page)
+        if cached is None:
+            todo.append(query)
+        else:
+            responses[query] = cached
+
+    def fetch(query):
+        if backend.rate_limited:
+            limiter.wait()
+        results = backend.search(query, per_page)
+        cache.put(backend.name, query, per_page, results)
+        return results
+
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {query: pool.submit(fetch, query) for query in todo}
+    for query, future in futures.items():
+        try:
+            responses[query] = future.result()
+        except Exception as e:
+            errors[query] = str(e)
+    return responses, errors, len(todo)
+
+
+def pick_distinct(ranked):
+    """Each location's best candidate not already picked for another location."""
+    picked = {}
+    taken = set()
+    for slug, rows in ranked.items():
+        row = next((row for row in rows if row["photo_id"] not in taken), None)
+        if row is not None:
+            picked[slug] = row
+            taken.add(row["photo_id"])
+    return picked
+
+
+def prefill_csv(csv_file, best):
+    """Fill REPLACE_ME rows of the image CSV in place; returns the filled slugs.
+
+    Comments, blank lines and rows that already have a photo are kept as they are.
+    """
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        lines = f.readlines()
+    filled = []
+    header = None
+    out = []
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            out.append(line)
+            continue
+        fields = next(csv.reader([line]))
+        if header is None:
+            header = fields
+            out.append(line)
+            continue
+        row = dict(zip(header, fields))
+        slug = row.get("location_slug", "")
+        top = best.get(slug)
+        if top is None or row.get("photo_id") != PLACEHOLDER:
+            out.append(line)
+            continue
+        row.update(photo_id=top["photo_id"], photographer=top["photographer"], photographer_username=top["username"])
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow([row.get(name, "") for name in header])
+        out.append(buffer.getvalue() if line.endswith("\n") else buffer.getvalue().rstrip("\n"))
+        filled.append(slug)
+    with open(csv_file, "w", encoding="utf-8", newline="") as f:
+        f.writelines(out)
+    return filled
+
+
+def print_table(slug, info, rows, top):
+    print(f"\n{slug}  ({info['landmark']})")
+    if not rows:
+        print("   no candidates")
+        return
+    print(f"   {'#':>2} {'score':>6}  {'photo_id':<28} {'size':>10} {'likes':>6}  photographer")
+    for number, row in enumerate(rows[:top], start=1):
+        size = f"{row['width']}x{row['height']}"
+        print(f"   {number:>2} {row['score']:>6.3f}  {row['photo_id']:<28} {size:>10} {row['likes']:>6}  "
+              f"{row['photographer']} (@{row['username']})")
+
+
+def make_backend(args):
+    if args.backend == "fixtures":
+        if not args.fixtures:
+            raise SearchError("--backend fixtures needs --fixtures DIR")
+        return FixtureBackend(args.fixtures)
+    access_key = os.environ.get("UNSPLASH_ACCESS_KEY")
+    if not access_key and args.api_base == API_BASE:
+        raise SearchError("set UNSPLASH_ACCESS_KEY (https://unsplash.com/developers) or use --api-base")
+    return UnsplashBackend(access_key, args.api_base)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rank Unsplash candidates for every landmark.")
+    parser.add_argument("slugs", nargs="*", help="location slugs (default: every LOCATION_LANDMARKS entry)")
+    parser.add_argument("--backend", choices=("unsplash", "fixtures"), default="unsplash")
+    parser.add_argument("--api-base", default=API_BASE, help="search API base URL (default: %(default)s)")
+    parser.add_argument("--fixtures", type=Path, help="fixture directory for --backend fixtures")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="max requests per second to the unsplash backend "
+                             "(default: %(default).4f, the demo tier's 50 an hour; 0 = unlimited)")
+    parser.add_argument("--workers", type=int, default=SEARCH_WORKERS, help="concurrent requests")
+    parser.add_argument("--per-page", type=int, default=PER_PAGE, help="results per query")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL_HOURS, help="cache lifetime in hours")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="cache directory (default: %(default)s)")
+    parser.add_argument("--refresh", action="store_true", help="ignore cached responses")
+    parser.add_argument("--top", type=int, default=5, help="candidates shown per location")
+    parser.add_argument("--json", type=Path, metavar="FILE", help="write every ranked candidate to FILE")
+    parser.add_argument("--prefill", type=Path, nargs="?", const=DEFAULT_CSV, metavar="CSV",
+                        help=f"fill REPLACE_ME rows with the best candidates (default CSV: {DEFAULT_CSV.name})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    unknown = [slug for slug in args.slugs if slug not in LOCATION_LANDMARKS]
+    if unknown:
+        print(f"[ERROR] not in LOCATION_LANDMARKS: {', '.join(unknown)}")
+        return 1
+    landmarks = {slug: LOCATION_LANDMARKS[slug] for slug in args.slugs or LOCATION_LANDMARKS}
+    try:
+        backend = make_backend(args)
+    except SearchError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    cache = SearchCache(args.cache_dir, args.ttl * 3600)
+    evicted = cache.evict()
+    queries = list(dict.fromkeys(query for info in landmarks.values() for query, _ in queries_for(info)))
+    start = time.perf_counter()
+    responses, errors, fetched = search_all(backend, queries, cache, RateLimiter(args.rate),
+                                            args.per_page, args.workers, args.refresh)
+    print(f"{len(queries)} queries for {len(landmarks)} locations: {len(queries) - fetched} cached, "
+          f"{fetched} sent to {backend.name}, {evicted} expired cache entries removed "
+          f"({time.perf_counter() - start:.1f}s)")
+    for query, error in errors.items():
+        print(f"[ERROR] {error}")
+
+    used_by = {}
+    for location in location_data.load_locations():
+        used_by.setdefault(hero_photo_id(location.data), set()).add(location.slug)
+    ranked = {slug: rank(slug, info, responses, used_by) for slug, info in landmarks.items()}
+    for slug, rows in ranked.items():
+        print_table(slug, landmarks[slug], rows, args.top)
+
+    if args.json:
+        args.json.write_text(json.dumps(ranked, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nWrote {args.json}")
+    if args.prefill:
+        filled = prefill_csv(args.prefill, pick_distinct(ranked))
+        print(f"\nPrefilled {len(filled)} rows in {args.prefill}; review them, then run "
+              f"python update_local_images.py update {args.prefill.name} --dry-run")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,22 @@ Local Landmark Image Updater
 Generates Unsplash search URLs and updates location JSON files with local imagery
 """
 
+import csv
 import json
 import os
-from pathlib import Path
-from typing import Dict, List
+import re
+from functools import partial
+from typing import Dict, List, Tuple
+
+import batch_edit
+import location_data
+from location_images import LOCALIZED_FIELDS
+
+# images.unsplash.com/photo-<id>: a 9-13 digit timestamp and 12 hex digits
+PHOTO_ID_PATTERN = re.compile(r"\d{9,13}-[0-9a-f]{12}")
+PHOTO_URL_PATTERN = re.compile(r"images\.unsplash\.com/photo-([\w-]+)")
+CSV_FIELDS = ("location_slug", "photo_id", "photographer", "photographer_username")
+PLACEHOLDER = "REPLACE_ME"
 
 # Location-to-landmark mapping
 LOCATION_LANDMARKS = {
@@ -449,70 +461,202 @@ def generate_unsplash_urls():
             print(f"  Alt:     https://unsplash.com/s/photos/{alt_search}")
 
 
+def set_hero_image(location, data, photo_id: str, photographer: str, photographer_username: str):
+    """Point a parsed location page's hero image at an Unsplash photo"""
+    # Get location info
+    city = location.city
+    state = location.state
+    landmark = LOCATION_LANDMARKS.get(location.slug, {}).get('landmark', city)
+
+    # Update image
+    new_image_url = f"https://images.unsplash.com/photo-{photo_id}?ixlib=rb-4.1.0&w=1920&q=80"
+    new_alt = f"{landmark} in {city}, {state} - Voice AI services for local businesses"
+    new_caption = f"Serving {city} businesses with cutting-edge Voice AI technology"
+
+    image = location_data.hero_image(data)
+    if image is None:
+        raise ValueError(f"no images in {location.path.name}")
+    # A localized hero's variants, size and placeholders belong to the old photo;
+    # drop them so the page uses the remote URL until location_images.py ingests it
+    for key in LOCALIZED_FIELDS:
+        image.pop(key, None)
+    image['url'] = new_image_url
+    image['alt'] = new_alt
+    image['caption'] = new_caption
+    image['credit'] = {
+        **image.get('credit', {}),
+        'photographer': photographer,
+        'unsplash_url': f"https://unsplash.com/@{photographer_username}",
+    }
+
+
+def photo_id(image):
+    """The Unsplash photo ID of an image dict, if it has one
+
+    A remote url wins over source_url, which only records what a localized
+    image was ingested from.
+    """
+    image = image or {}
+    for url in (image.get('url'), image.get('source_url')):
+        match = PHOTO_URL_PATTERN.search(url or '')
+        if match:
+            return match.group(1)
+    return None
+
+
+def hero_photo_id(data):
+    """The Unsplash photo ID of a parsed page's hero image, if it has one"""
+    return photo_id(location_data.hero_image(data))
+
+
+def edit_hero_image(path, text, updates):
+    """batch_edit edit function; `updates` maps slug -> (photo_id, photographer, username)
+
+    The detail is (slug, old photo ID, new photo ID).
+    """
+    data = json.loads(text)
+    location = location_data.parse_location(path, data)
+    old_photo_id = hero_photo_id(data)
+    set_hero_image(location, data, *updates[location.slug])
+    return location_data.dumps(data), (location.slug, old_photo_id, updates[location.slug][0])
+
+
+def apply_hero_updates(updates: Dict[str, tuple], dry_run: bool = False):
+    """Update every location in `updates` as one transaction; returns the updated slugs"""
+    locations = location_data.load_locations()
+    paths = []
+    for location_slug in updates:
+        location = locations.get(location_slug)
+        if location is None:
+            print(f"❌ File not found: {location_data.path_for_slug(location_slug)}")
+        else:
+            paths.append(location.path)
+
+    try:
+        result = batch_edit.run_batch(paths, partial(edit_hero_image, updates=updates),
+                                      validate=location_data.validate_text, dry_run=dry_run)
+    except batch_edit.BatchEditError as e:
+        print(f"❌ Error updating locations: {e}")
+        return []
+
+    if dry_run:
+        batch_edit.print_report(result, location_data.LOCATIONS_DIR, diff=True)
+    for edit in result.edits:
+        slug, old_photo_id, new_photo_id = edit.detail
+        if edit.changed:
+            print(f"✅ {'Would update' if dry_run else 'Updated'} {slug}: {old_photo_id} -> {new_photo_id}")
+        else:
+            print(f"➖ {slug}: already {new_photo_id}")
+    return [edit.detail[0] for edit in result.edits]
+
+
 def update_location_json(location_slug: str, photo_id: str, photographer: str, photographer_username: str):
     """Update a specific location JSON file with new image"""
-    json_path = Path(f"capture-client-site/src/data/locations/voice-ai-{location_slug}.json")
+    return bool(apply_hero_updates({location_slug: (photo_id, photographer, photographer_username)}))
+
+
+def normalize_photo_id(value: str):
+    """Accept a bare photo ID or a pasted images.unsplash.com URL"""
+    match = PHOTO_URL_PATTERN.search(value)
+    return match.group(1) if match else value
+
+
+def parse_image_csv(csv_file: str, locations=None) -> Tuple[Dict[str, tuple], List[str], Dict[str, int]]:
+    """Read and validate the whole image CSV before anything is written
+
+    Returns (updates, problems, counts): updates maps slug ->
+    (photo_id, photographer, username), problems lists every invalid row as
+    "line N: ...", and counts tallies comment, blank, placeholder and
+    duplicate rows. '#' lines and rows still holding REPLACE_ME are skipped.
+    """
+    locations = locations if locations is not None else location_data.load_locations()
+    updates = {}
+    first_line = {}
+    problems = []
+    counts = {'rows': 0, 'comments': 0, 'blank': 0, 'placeholders': 0, 'duplicates': 0}
+
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        lines = list(enumerate(f, start=1))
+    header = next(((number, line) for number, line in lines if line.strip() and not line.lstrip().startswith('#')), None)
+    if header is None:
+        return updates, [f"{csv_file}: no header row"], counts
+    fieldnames = next(csv.reader([header[1]]))
+    missing = [name for name in CSV_FIELDS if name not in fieldnames]
+    if missing:
+        return updates, [f"line {header[0]}: missing column(s) {', '.join(missing)}"], counts
+
+    for number, line in lines:
+        if number <= header[0]:
+            continue
+        if not line.strip():
+            counts['blank'] += 1
+            continue
+        if line.lstrip().startswith('#'):
+            counts['comments'] += 1
+            continue
+        counts['rows'] += 1
+        row = dict(zip(fieldnames, (value.strip() for value in next(csv.reader([line])))))
+        slug, photo_id, photographer, username = (row.get(name, '') for name in CSV_FIELDS)
+        if PLACEHOLDER in (slug, photo_id, photographer, username):
+            counts['placeholders'] += 1
+            continue
+        if not all((slug, photo_id, photographer, username)):
+            problems.append(f"line {number}: empty field(s) in {line.strip()!r}")
+            continue
+
+        location = locations.get(slug)
+        if location is None:
+            problems.append(f"line {number}: no location file for {slug!r}")
+            continue
+        photo_id = normalize_photo_id(photo_id)
+        if not PHOTO_ID_PATTERN.fullmatch(photo_id):
+            problems.append(f"line {number}: {photo_id!r} is not an images.unsplash.com photo ID "
+                            f"(like 1664575602276-acd073f104c1)")
+            continue
+
+        update = (photo_id, photographer, username.lstrip('@'))
+        if location.slug in updates:
+            if updates[location.slug] != update:
+                problems.append(f"line {number}: {location.slug} already set on line "
+                                f"{first_line[location.slug]} with a different photo")
+            else:
+                counts['duplicates'] += 1
+            continue
+        updates[location.slug] = update
+        first_line[location.slug] = number
+    return updates, problems, counts
 
-    if not json_path.exists():
-        print(f"❌ File not found: {json_path}")
-        return False
 
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Get location info
-        city = data['location']['city']
-        state = data['location']['state']
-        landmark = LOCATION_LANDMARKS.get(location_slug, {}).get('landmark', city)
-
-        # Update image
-        new_image_url = f"https://images.unsplash.com/photo-{photo_id}?ixlib=rb-4.1.0&w=1920&q=80"
-        new_alt = f"{landmark} in {city}, {state} - Voice AI services for local businesses"
-        new_caption = f"Serving {city} businesses with cutting-edge Voice AI technology"
-
-        data['images'][0]['url'] = new_image_url
-        data['images'][0]['alt'] = new_alt
-        data['images'][0]['caption'] = new_caption
-        data['images'][0]['credit']['photographer'] = photographer
-        data['images'][0]['credit']['unsplash_url'] = f"https://unsplash.com/@{photographer_username}"
-
-        # Write back
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-        print(f"✅ Updated {location_slug}")
-        return True
+def batch_update_from_csv(csv_file: str, dry_run: bool = False):
+    """Update multiple locations from a CSV file, all or nothing
 
-    except Exception as e:
-        print(f"❌ Error updating {location_slug}: {e}")
+    The whole CSV is validated first; any invalid row aborts before a file
+    is touched. Each location file is then read and written once.
+    """
+    # CSV format: location_slug,photo_id,photographer,photographer_username
+    updates, problems, counts = parse_image_csv(csv_file)
+
+    print("=" * 60)
+    print(f"CSV: {csv_file}")
+    print(f"   rows: {counts['rows']}   ready: {len(updates)}   placeholders: {counts['placeholders']}   "
+          f"duplicates: {counts['duplicates']}   comments: {counts['comments']}")
+    print("=" * 60)
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        print(f"\n❌ {len(problems)} invalid row(s); no files were changed")
         return False
+    if not updates:
+        print("Nothing to update (fill in the REPLACE_ME rows first)")
+        return True
 
+    updated = apply_hero_updates(updates, dry_run=dry_run)
+    success_count = len(updated)
+    fail_count = len(updates) - success_count
 
-def batch_update_from_csv(csv_file: str):
-    """Update multiple locations from a CSV file"""
-    # CSV format: location_slug,photo_id,photographer,photographer_username
-    import csv
-
-    success_count = 0
-    fail_count = 0
-
-    with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            result = update_location_json(
-                row['location_slug'],
-                row['photo_id'],
-                row['photographer'],
-                row['photographer_username']
-            )
-            if result:
-                success_count += 1
-            else:
-                fail_count += 1
-
-    print(f"\n✅ Successfully updated: {success_count}")
+    print(f"\n✅ Successfully {'checked' if dry_run else 'updated'}: {success_count}")
     print(f"❌ Failed: {fail_count}")
+    return fail_count == 0
 
 
 if __name__ == "__main__":
@@ -529,12 +673,23 @@ if __name__ == "__main__":
         print("4. Note photographer name and username")
         print("5. Create CSV: location_slug,photo_id,photographer,photographer_username")
         print("6. Run: python update_local_images.py update images.csv")
+        print("   (or: python update_local_images.py search --prefill, to fill the CSV from the Unsplash API)")
         print("=" * 80)
 
-    elif len(sys.argv) == 3 and sys.argv[1] == "update":
+    elif len(sys.argv) in (3, 4) and sys.argv[1] == "update" and sys.argv[3:] in ([], ["--dry-run"]):
         # Update from CSV
         csv_file = sys.argv[2]
-        batch_update_from_csv(csv_file)
+        sys.exit(0 if batch_update_from_csv(csv_file, dry_run=len(sys.argv) == 4) else 1)
+
+    elif len(sys.argv) >= 2 and sys.argv[1] == "search":
+        # Query Unsplash and rank candidates instead of searching by hand
+        import unsplash_search
+        sys.exit(unsplash_search.main(sys.argv[2:]))
+
+    elif len(sys.argv) >= 2 and sys.argv[1] == "report":
+        # Reconcile landmarks with pages, target areas and the CSV
+        import landmark_coverage
+        sys.exit(landmark_coverage.main(sys.argv[2:]))
 
     elif len(sys.argv) == 5:
         # Single update
@@ -548,4 +703,7 @@ if __name__ == "__main__":
         print("Usage:")
         print("  python update_local_images.py                    # Generate Unsplash URLs")
         print("  python update_local_images.py update CSV_FILE    # Batch update from CSV")
+        print("  python update_local_images.py update CSV_FILE --dry-run")
         print("  python update_local_images.py SLUG ID PHOTO USER # Single update")
+        print("  python update_local_images.py search [--prefill] # Ranked Unsplash candidates")
+        print("  python update_local_images.py report             # Landmark coverage report")